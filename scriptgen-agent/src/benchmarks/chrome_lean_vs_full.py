@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""Compare page-load time and memory of the lean and full Chrome capture profiles.
+
+For each profile, starts --sessions Chrome sessions one after another and
+captures --pages videos in each, recording per session its startup time,
+per page the page-load time (driver.get until the <video> element exists)
+and capture time, and the session's RSS (chromedriver plus every Chrome
+process, summed from /proc) after each capture. Sessions are quit before
+the next starts, so RSS is per session.
+
+Pages come from the local fixture server (fixture_server.py) playing a
+sample video (--video, or generated with ffmpeg), or from --url for real
+pages. Results are printed as JSON with lean/full ratios; the estimated
+sessions per GB is what decides how many concurrent captures fit on a host.
+
+Usage:
+    python src/benchmarks/chrome_lean_vs_full.py
+    python src/benchmarks/chrome_lean_vs_full.py --sessions 5 --pages 4 --url https://www.tiktok.com/@user/video/123
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path to import tools
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_server import generate_sample_video, run_fixture_server  # noqa: E402
+from tools.chrome_profile import CHROME_PROFILES, driver_rss  # noqa: E402
+from tools.tracing import percentile  # noqa: E402
+
+
+def run_profile(profile: str, urls: List[str], sessions: int, pages: int,
+                num_screenshots: int) -> Dict[str, Any]:
+    """Capture pages with one profile and summarize its timings and memory."""
+    from tools import TikTokVideoAnalyzer
+
+    analyzer = TikTokVideoAnalyzer(chrome_profile=profile, pool_size=1, cache_path=None)
+    startup, page_loads, captures, rss = [], [], [], []
+    failures = 0
+    try:
+        for session in range(sessions):
+            start = time.perf_counter()
+            try:
+                driver = analyzer._setup_driver()
+            except Exception as e:
+                return {"skipped": f"Chrome could not be started ({str(e).splitlines()[0]})"}
+            startup.append(time.perf_counter() - start)
+
+            try:
+                for page in range(pages):
+                    url = urls[(session * pages + page) % len(urls)]
+                    stats: Dict[str, Any] = {}
+                    start = time.perf_counter()
+                    frames = analyzer._capture_frames(driver, url, num_screenshots, stats=stats)
+                    captures.append(time.perf_counter() - start)
+                    if not frames or stats.get("page_load_seconds") is None:
+                        failures += 1
+                        continue
+                    page_loads.append(stats["page_load_seconds"])
+                    session_rss = driver_rss(driver)
+                    if session_rss is not None:
+                        rss.append(session_rss / 2 ** 20)
+            finally:
+                driver.quit()
+    finally:
+        analyzer.close()
+
+    result = {
+        "sessions": sessions,
+        "pages": sessions * pages,
+        "failed_pages": failures,
+        "startup_p50_seconds": round(percentile(startup, 0.5), 3),
+        "page_load_p50_seconds": round(percentile(page_loads, 0.5), 3),
+        "page_load_p95_seconds": round(percentile(page_loads, 0.95), 3),
+        "capture_p50_seconds": round(percentile(captures, 0.5), 3)
+    }
+    if rss:
+        result.update({
+            "rss_mean_mb": round(sum(rss) / len(rss), 1),
+            "rss_max_mb": round(max(rss), 1),
+            "sessions_per_gb": round(1024 / max(rss), 1)
+        })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--profiles", nargs="+", default=["full", "lean"], choices=CHROME_PROFILES)
+    parser.add_argument("--sessions", type=int, default=3, help="Chrome sessions per profile")
+    parser.add_argument("--pages", type=int, default=3, help="Videos captured per session")
+    parser.add_argument("--num-screenshots", type=int, default=3)
+    parser.add_argument("--url", action="append", dest="urls",
+                        help="Video page to capture (repeatable; default: local fixture pages)")
+    parser.add_argument("--video", help="Sample video for the fixture pages (default: generated with ffmpeg)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="scriptgen-chrome-")
+    fixtures = None
+    urls = args.urls
+    if not urls:
+        video: Optional[str] = args.video or generate_sample_video(work_dir)
+        if video is None:
+            print(json.dumps({"skipped": "ffmpeg could not generate a sample video; pass --video or --url"}))
+            return
+        fixtures = run_fixture_server(os.path.abspath(video))
+        urls = [f"http://127.0.0.1:{fixtures.server_port}/@creator/video/{index}" for index in range(10)]
+
+    # The analyzer writes screenshots under data/, relative to the working directory
+    os.chdir(work_dir)
+    try:
+        results: Dict[str, Any] = {profile: run_profile(profile, urls, args.sessions, args.pages,
+                                                        args.num_screenshots)
+                                   for profile in args.profiles}
+    finally:
+        if fixtures is not None:
+            fixtures.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    full, lean = results.get("full"), results.get("lean")
+    if full and lean and "skipped" not in full and "skipped" not in lean:
+        results["lean_vs_full"] = {metric: round(lean[metric] / full[metric], 3)
+                                   for metric in ("startup_p50_seconds", "page_load_p50_seconds",
+                                                  "page_load_p95_seconds", "capture_p50_seconds",
+                                                  "rss_mean_mb", "rss_max_mb")
+                                   if lean.get(metric) and full.get(metric)}
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
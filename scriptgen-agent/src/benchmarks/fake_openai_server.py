@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+"""Local fake of the OpenAI chat-completions endpoint.
+
+Answers POST .../chat/completions with canned script concepts or, for vision
+requests, one analysis per image. It enforces a requests-per-minute quota
+with 429 + Retry-After responses like the real API, and can inject random
+rate-limit and server errors and latency, to exercise the shared rate
+limiter and retries offline. Streaming requests get server-sent events,
+one small chunk of content at a time. Requests carrying CrewAI's agent
+format instructions are answered with a "Final Answer:", so crews can run
+against it too.
+
+Usage:
+    python src/benchmarks/fake_openai_server.py --port 8765 --rpm 60 --error-rate 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python src/main.py ...
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+SCRIPT_CONCEPTS = [
+    {
+        "title": "Morning Routine Upgrade",
+        "format": "Day-in-the-life montage",
+        "hook": "\"I changed one thing in my morning and everything got easier\"",
+        "shots": ["0:00-0:03: Close-up of alarm going off",
+                  "0:04-0:10: Creator using the product at the sink"],
+        "text_overlays": ["\"POV: your mornings finally work\""],
+        "music": "Upbeat lo-fi track",
+        "caption": "One small change, big difference #morningroutine #ad"
+    },
+    {
+        "title": "Honest Review",
+        "format": "Talking head with B-roll",
+        "hook": "\"I was paid to try this, here's what I actually think\"",
+        "shots": ["0:00-0:05: Creator holding the product to camera"],
+        "text_overlays": ["\"Day 1 vs Day 30\""],
+        "music": "Trending acoustic sound",
+        "caption": "The honest verdict #review #ad"
+    }
+]
+
+
+def render_concepts(concepts: List[Dict[str, Any]], heading: str = "# Concept {number}: {title}") -> str:
+    """Render concepts as the markdown outline the text output mode asks for."""
+    sections = []
+    for number, concept in enumerate(concepts, 1):
+        lines = [heading.format(number=number, title=concept["title"]),
+                 f"Title: {concept['title']}",
+                 f"Format: {concept['format']}",
+                 f"Hook: {concept['hook']}",
+                 "Shot-by-shot breakdown:"]
+        lines.extend(f"- {shot}" for shot in concept["shots"])
+        lines.append("Text overlays:")
+        lines.extend(f"- {overlay}" for overlay in concept["text_overlays"])
+        lines.append(f"Music: {concept['music']}")
+        lines.append(f"Caption: {concept['caption']}")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections) + "\n"
+
+
+SCRIPT_RESPONSE = render_concepts(SCRIPT_CONCEPTS)
+
+# CrewAI agents are prompted to end their turn with this marker
+AGENT_FINAL_ANSWER = "Final Answer:"
+
+# Characters of content sent per streamed chunk (roughly a few tokens)
+STREAM_CHUNK_CHARS = 12
+
+
+class FakeOpenAI:
+    """Quota and failure-injection state shared by all request handlers."""
+
+    def __init__(self, rpm: int = 0, error_rate: float = 0.0, latency: float = 0.0,
+                 retry_after: float = 1.0, chunk_latency: float = 0.0, seed: Optional[int] = None):
+        self.rpm = rpm
+        self.error_rate = error_rate
+        self.latency = latency
+        self.chunk_latency = chunk_latency
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.window: deque = deque()
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "completed": 0, "rate_limited": 0, "server_errors": 0,
+                      "prompt_tokens": 0, "completion_tokens": 0}
+
+    def admit(self) -> Optional[int]:
+        """Return an error status for the next request, or None to serve it."""
+        with self.lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            while self.window and now - self.window[0] >= 60:
+                self.window.popleft()
+
+            if self.rpm and len(self.window) >= self.rpm:
+                self.stats["rate_limited"] += 1
+                return 429
+            if self.random.random() < self.error_rate:
+                status = self.random.choice((429, 500, 503))
+                self.stats["rate_limited" if status == 429 else "server_errors"] += 1
+                return status
+
+            self.window.append(now)
+            self.stats["completed"] += 1
+            return None
+
+    def completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a chat-completions response for a request."""
+        images = 0
+        prompt_chars = 0
+        for message in request["messages"]:
+            content = message.get("content") or ""
+            if isinstance(content, list):
+                images += sum(1 for part in content if part.get("type") == "image_url")
+                prompt_chars += sum(len(part.get("text", "")) for part in content)
+            else:
+                prompt_chars += len(content)
+        agent_turn = any(AGENT_FINAL_ANSWER in message.get("content", "")
+                         for message in request["messages"] if isinstance(message.get("content"), str))
+
+        response_format = (request.get("response_format") or {}).get("type")
+        if agent_turn:
+            content = f"Thought: I now can give a great answer\n{AGENT_FINAL_ANSWER} {SCRIPT_RESPONSE}"
+        elif images and response_format == "json_object":
+            content = json.dumps({"frames": [
+                {"frame": i + 1, "analysis": f"Frame {i + 1}: creator centered, bright lighting."}
+                for i in range(images)]})
+        elif response_format == "json_schema":
+            content = json.dumps({"concepts": SCRIPT_CONCEPTS})
+        elif images:
+            content = "Creator centered in frame, bright natural lighting, bold caption at the top."
+        else:
+            content = SCRIPT_RESPONSE
+
+        prompt_tokens = prompt_chars // 4 + images * 85
+        completion_tokens = len(content) // 4
+        with self.lock:
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+        return {
+            "id": f"chatcmpl-fake-{self.random.getrandbits(32):08x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        }
+
+
+def make_handler(fake: FakeOpenAI) -> type:
+    """Create a request handler class bound to the fake's state."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def send_json(self, status: int, body: Dict[str, Any],
+                      headers: Optional[Dict[str, str]] = None) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self) -> None:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            if not self.path.endswith("/chat/completions"):
+                self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+
+            if fake.latency:
+                time.sleep(fake.latency)
+
+            status = fake.admit()
+            if status == 429:
+                self.send_json(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                               {"Retry-After": str(fake.retry_after)})
+            elif status is not None:
+                self.send_json(status, {"error": {"message": "Server error", "type": "server_error"}})
+            elif request.get("stream"):
+                self.send_stream(fake.completion(request),
+                                 (request.get("stream_options") or {}).get("include_usage", False))
+            else:
+                self.send_json(200, fake.completion(request))
+
+        def send_stream(self, completion: Dict[str, Any], include_usage: bool = False) -> None:
+            """Send a completion as server-sent events, a few characters per chunk.
+
+            With include_usage, a last chunk without choices carries the usage.
+            """
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def event(data: str) -> None:
+                payload = f"data: {data}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+                self.wfile.flush()
+
+            content = completion["choices"][0]["message"]["content"]
+            chunk = {key: completion[key] for key in ("id", "created", "model")}
+            chunk["object"] = "chat.completion.chunk"
+            for offset in range(0, len(content), STREAM_CHUNK_CHARS):
+                if fake.chunk_latency:
+                    time.sleep(fake.chunk_latency)
+                delta = {"content": content[offset:offset + STREAM_CHUNK_CHARS]}
+                event(json.dumps({**chunk, "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": None}]}))
+            event(json.dumps({**chunk, "choices": [
+                {"index": 0, "delta": {}, "finish_reason": "stop"}]}))
+            if include_usage:
+                event(json.dumps({**chunk, "choices": [], "usage": completion["usage"]}))
+            event("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def run_server(host: str = "127.0.0.1", port: int = 0, **options: Any) -> ThreadingHTTPServer:
+    """Start the fake endpoint in a background thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        **options: FakeOpenAI options (rpm, error_rate, latency, retry_after,
+            chunk_latency, seed)
+
+    Returns:
+        The running server; its base URL is http://host:server.server_port/v1
+        and its FakeOpenAI state is server.fake
+    """
+    fake = FakeOpenAI(**options)
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    server.fake = fake
+    threading.Thread(target=server.serve_forever, name="fake-openai", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute before 429s (0: unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed at random")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--chunk-latency", type=float, default=0.0,
+                        help="Seconds between streamed chunks")
+    args = parser.parse_args()
+
+    server = run_server(args.host, args.port, rpm=args.rpm, error_rate=args.error_rate,
+                        latency=args.latency, retry_after=args.retry_after,
+                        chunk_latency=args.chunk_latency)
+    print(f"Fake OpenAI endpoint at http://{args.host}:{server.server_port}/v1", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(server.fake.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
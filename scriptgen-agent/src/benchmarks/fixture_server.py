@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""Local stand-in for TikTok video pages, for offline capture benchmarks.
+
+Serves a minimal mobile video page at any /@<creator>/video/<id> path, with a
+<video> element pointing at one sample media file. Both capture backends
+work against it: Selenium loads the page and seeks the video, and the direct
+backend finds the media URL in the page and downloads it (byte ranges are
+supported, as Chrome requests them when seeking). The sample video is
+generated with ffmpeg's test source unless one is given.
+
+Usage:
+    python src/benchmarks/fixture_server.py --port 8766
+    python src/benchmarks/fixture_server.py --video my_sample.mp4
+"""
+import os
+import re
+import sys
+import shutil
+import argparse
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+VIDEO_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Fixture video {video_id}</title>
+</head>
+<body style="margin:0;background:#000">
+<video src="/media/{media_name}" muted playsinline preload="auto" style="width:100%;display:block"></video>
+</body>
+</html>
+"""
+
+# Encoders tried in order when generating the sample video, with the file extension each produces
+SAMPLE_ENCODERS = [
+    (".mp4", ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-movflags", "+faststart"]),
+    (".webm", ["-c:v", "libvpx-vp9", "-b:v", "500k"]),
+    (".webm", ["-c:v", "libvpx", "-b:v", "500k"])
+]
+
+MEDIA_TYPES = {".mp4": "video/mp4", ".m4v": "video/mp4", ".mov": "video/quicktime", ".webm": "video/webm"}
+
+RANGE_HEADER = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def generate_sample_video(directory: str,
+                          duration: float = 15.0,
+                          size: str = "360x640",
+                          ffmpeg_path: str = "ffmpeg") -> Optional[str]:
+    """Render a test-pattern video with ffmpeg.
+
+    The test pattern changes every frame, so screenshots at different
+    timestamps are distinct and survive frame deduplication.
+
+    Args:
+        directory: Directory the video is written to
+        duration: Length in seconds
+        size: Frame size as WIDTHxHEIGHT (portrait, like TikTok)
+        ffmpeg_path: Path to the ffmpeg binary
+
+    Returns:
+        Path of the video, or None if ffmpeg is missing or no encoder worked
+    """
+    if not shutil.which(ffmpeg_path):
+        return None
+
+    for extension, codec in SAMPLE_ENCODERS:
+        path = os.path.join(directory, f"sample{extension}")
+        result = subprocess.run(
+            [ffmpeg_path, "-v", "error", "-y", "-f", "lavfi",
+             "-i", f"testsrc2=duration={duration}:size={size}:rate=30", *codec, path],
+            capture_output=True)
+        if result.returncode == 0 and os.path.getsize(path) > 0:
+            return path
+    return None
+
+
+def make_handler(media_path: Optional[str]) -> type:
+    """Create a request handler class serving pages for one media file."""
+    media_name = os.path.basename(media_path) if media_path else "sample.mp4"
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _send_media(self) -> None:
+            if not media_path:
+                self._send(404, b"No sample video", "text/plain")
+                return
+
+            size = os.path.getsize(media_path)
+            start, end = 0, size - 1
+            match = RANGE_HEADER.fullmatch(self.headers.get("Range", "").strip())
+            if match and (match.group(1) or match.group(2)):
+                if match.group(1):
+                    start = int(match.group(1))
+                    end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                else:
+                    start = max(size - int(match.group(2)), 0)
+                if start > end:
+                    self._send(416, b"", "text/plain", {"Content-Range": f"bytes */{size}"})
+                    return
+
+            with open(media_path, "rb") as f:
+                f.seek(start)
+                body = f.read(end - start + 1)
+            headers = {"Accept-Ranges": "bytes"}
+            status = 200
+            if match:
+                status = 206
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            content_type = MEDIA_TYPES.get(os.path.splitext(media_path)[1], "application/octet-stream")
+            self._send(status, body, content_type, headers)
+
+        def do_GET(self) -> None:
+            path = self.path.split("?")[0]
+            if path.startswith("/media/"):
+                self._send_media()
+            elif "/video/" in path:
+                page = VIDEO_PAGE.format(video_id=path.rsplit("/", 1)[-1], media_name=media_name)
+                self._send(200, page.encode("utf-8"), "text/html; charset=utf-8")
+            else:
+                self._send(404, b"Not found", "text/plain")
+
+        do_HEAD = do_GET
+
+    return Handler
+
+
+def run_fixture_server(media_path: Optional[str], host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the fixture server in a background thread.
+
+    Args:
+        media_path: Sample video served to every page (None serves pages whose
+            video cannot load)
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(media_path))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--video", help="Sample video to serve (default: generate one with ffmpeg)")
+    parser.add_argument("--work-dir", default="data/fixtures", help="Where the generated video is written")
+    args = parser.parse_args()
+
+    media_path = args.video
+    if not media_path:
+        os.makedirs(args.work_dir, exist_ok=True)
+        media_path = generate_sample_video(args.work_dir)
+        if media_path is None:
+            print("ffmpeg could not generate a sample video; pass --video", file=sys.stderr)
+            sys.exit(1)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(media_path))
+    print(f"Serving fixture pages on http://{args.host}:{args.port}/@creator/video/1 ({media_path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Check import time and heavy imports of the CLI and tool modules.
+
+Each module is imported in a fresh interpreter under ``python -X importtime``
+and its cumulative import time is parsed from the report (the minimum over
+--repeat runs, to cut noise). A module fails the check if it exceeds its
+time budget or imports a module it must leave to first use:
+
+- main: none of crewai, agentops, LangChain, Selenium, PIL, openai or pymongo;
+  subcommands import what they need
+- the tools: none of Selenium, PIL, openai or pymongo until a tool calls them
+
+Results are printed as JSON and the exit status is 1 if any check fails, so
+the script can gate CI.
+
+Usage:
+    python src/benchmarks/import_time.py
+    python src/benchmarks/import_time.py --scale 2 --repeat 5
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+from typing import Any, Dict, List, Tuple
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_TOOL_DEPENDENCIES = ["selenium", "PIL", "openai", "pymongo", "bson"]
+
+# Module -> (budget in milliseconds, top-level modules it must not import)
+BUDGETS: Dict[str, Tuple[float, List[str]]] = {
+    "main": (50.0, ["crewai", "agentops", "agentstack", "langchain", "langchain_core"]
+             + HEAVY_TOOL_DEPENDENCIES),
+    "tools": (50.0, ["langchain", "langchain_core"] + HEAVY_TOOL_DEPENDENCIES),
+    "tools.script_generator": (1500.0, HEAVY_TOOL_DEPENDENCIES),
+    "tools.tiktok_analyzer": (1500.0, HEAVY_TOOL_DEPENDENCIES),
+    "tools.mongodb_client": (1500.0, HEAVY_TOOL_DEPENDENCIES),
+}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_report(module: str) -> List[Tuple[int, int, int, str]]:
+    """Import a module in a fresh interpreter and parse its -X importtime report.
+
+    Returns:
+        (self microseconds, cumulative microseconds, nesting depth, module name)
+        for every module imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(
+            filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")]))})
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1]}")
+
+    report = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            report.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return report
+
+
+def module_subtree(report: List[Tuple[int, int, int, str]], module: str) -> List[Tuple[int, int, int, str]]:
+    """Return the report entries of a top-level import, ending with the module itself.
+
+    A module is reported after everything it imports, so its subtree is the
+    run of nested entries just before its own top-level line. Modules loaded
+    at interpreter startup (site, encodings) fall outside it.
+    """
+    end = max(index for index, entry in enumerate(report) if entry[3] == module and entry[2] == 0)
+    start = end
+    while start > 0 and report[start - 1][2] > 0:
+        start -= 1
+    return report[start:end + 1]
+
+
+def check(module: str, budget_ms: float, forbidden: List[str], repeat: int) -> Dict[str, Any]:
+    """Measure one module against its budget and forbidden imports."""
+    best_ms = None
+    subtree: List[Tuple[int, int, int, str]] = []
+    for _ in range(repeat):
+        subtree = module_subtree(import_report(module), module)
+        total_ms = subtree[-1][1] / 1000
+        best_ms = total_ms if best_ms is None else min(best_ms, total_ms)
+
+    imported = {name.split(".")[0] for _, _, _, name in subtree}
+    slowest = sorted((entry for entry in subtree if entry[2] == 1),
+                     key=lambda entry: entry[1], reverse=True)[:5]
+    violations = sorted(name for name in forbidden if name in imported)
+    return {
+        "import_ms": round(best_ms, 1),
+        "budget_ms": budget_ms,
+        "heavy_imports": violations,
+        "slowest_imports_ms": {name: round(cumulative / 1000, 1)
+                               for _, cumulative, _, name in slowest},
+        "passed": best_ms <= budget_ms and not violations
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS),
+                        help="Modules to check (default: all budgeted modules)")
+    parser.add_argument("--repeat", type=int, default=3, help="Imports per module; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every time budget, e.g. for slow CI machines")
+    args = parser.parse_args()
+
+    results = {}
+    for module in args.modules:
+        budget_ms, forbidden = BUDGETS.get(module, (float("inf"), []))
+        try:
+            results[module] = check(module, budget_ms * args.scale, forbidden, args.repeat)
+        except RuntimeError as e:
+            results[module] = {"error": str(e), "passed": False}
+
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if all(result["passed"] for result in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""Benchmark server-side top-video ranking against fetching every video.
+
+Seeds a synthetic videos collection (10k videos per creator by default),
+then times, per lead:
+
+- naive: fetch all of a lead's videos and rank/average them in Python
+- aggregate: MongoDBClient.aggregate_video_stats (one server-side $facet pipeline)
+
+Usage:
+    python src/benchmarks/mongodb_top_videos.py --uri mongodb://localhost:27017
+    python src/benchmarks/mongodb_top_videos.py --mongomock
+
+Results are printed as JSON. The benchmark database is dropped afterwards.
+mongomock emulates aggregation in Python, so only numbers from a real mongod
+are meaningful; --mongomock is for checking the harness itself.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from typing import Any, Dict, List
+
+# Add parent directory to path to import tools
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from tools.mongodb_client import MongoDBClient, get_mongo_client  # noqa: E402
+
+
+def seed(client: MongoDBClient, num_leads: int, videos_per_lead: int) -> List[str]:
+    """Insert synthetic leads and videos, returning the lead IDs."""
+    database = client.get_database()
+    lead_ids = []
+    rng = random.Random(42)
+
+    for i in range(num_leads):
+        lead_id = database.leads.insert_one({
+            "nickName": f"creator_{i}",
+            "bio": "Synthetic benchmark creator",
+            "totalFollowers": rng.randint(1000, 1000000),
+            "tags": ["benchmark"]
+        }).inserted_id
+        lead_ids.append(str(lead_id))
+
+        batch = []
+        for j in range(videos_per_lead):
+            plays = int(rng.paretovariate(1.2) * 1000)
+            batch.append({
+                "leadId": lead_id,
+                "text": f"Video {j} caption with a few #hashtags #benchmark",
+                "playCount": plays,
+                "diggCount": int(plays * rng.uniform(0.01, 0.2)),
+                "commentCount": int(plays * rng.uniform(0.001, 0.02)),
+                "shareCount": int(plays * rng.uniform(0.001, 0.01)),
+                "webVideoUrl": f"https://www.tiktok.com/@creator_{i}/video/{j}",
+                # Fields a real scrape carries that the generator never reads
+                "authorMeta": {"name": f"creator_{i}", "signature": "x" * 200},
+                "musicMeta": {"musicName": "original sound", "playUrl": "https://example.com/a.mp3"},
+                "hashtags": [{"name": "benchmark", "title": "", "cover": ""}] * 5
+            })
+            if len(batch) == 1000:
+                database.videos.insert_many(batch)
+                batch = []
+        if batch:
+            database.videos.insert_many(batch)
+
+    client.ensure_indexes()
+    return lead_ids
+
+
+def naive_stats(client: MongoDBClient, lead_id: str, top_k: int) -> Dict[str, Any]:
+    """Fetch every video of a lead and compute top videos and averages in Python."""
+    videos = list(client.get_database().videos.find({"leadId": ObjectId(lead_id)}))
+
+    top_videos = sorted(videos, key=lambda video: video.get("playCount", 0), reverse=True)[:top_k]
+    total_views = 0
+    total_likes = 0
+    for video in videos:
+        total_views += video.get("playCount", 0)
+        total_likes += video.get("diggCount", 0)
+
+    return {
+        "high_performing_videos": top_videos,
+        "performance_metrics": {
+            "avg_views": total_views / len(videos) if videos else 0,
+            "avg_likes": total_likes / len(videos) if videos else 0
+        }
+    }
+
+
+def time_runs(fn: Any, lead_ids: List[str], repeat: int) -> Dict[str, float]:
+    """Time fn(lead_id) over all leads, repeat times, and summarize latencies in ms."""
+    latencies = []
+    for _ in range(repeat):
+        for lead_id in lead_ids:
+            start = time.perf_counter()
+            fn(lead_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "runs": len(latencies),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--uri", default=os.environ.get("MONGODB_URI", ""),
+                        help="MongoDB connection string (default: MONGODB_URI)")
+    parser.add_argument("--mongomock", action="store_true",
+                        help="Use an in-process mongomock server instead of --uri")
+    parser.add_argument("--database", default="scriptgen_benchmark")
+    parser.add_argument("--leads", type=int, default=3)
+    parser.add_argument("--videos-per-lead", type=int, default=10000)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        mongo = mongomock.MongoClient()
+    elif args.uri:
+        mongo = get_mongo_client(args.uri)
+    else:
+        parser.error("--uri (or MONGODB_URI) is required unless --mongomock is given")
+
+    client = MongoDBClient(database_name=args.database, top_k=args.top_k, client=mongo)
+    mongo.drop_database(args.database)
+
+    try:
+        start = time.perf_counter()
+        lead_ids = seed(client, args.leads, args.videos_per_lead)
+        seed_seconds = time.perf_counter() - start
+
+        naive = time_runs(lambda lead_id: naive_stats(client, lead_id, args.top_k),
+                          lead_ids, args.repeat)
+        aggregate = time_runs(lambda lead_id: client.aggregate_video_stats(lead_id),
+                              lead_ids, args.repeat)
+
+        print(json.dumps({
+            "backend": "mongomock" if args.mongomock else "mongod",
+            "leads": args.leads,
+            "videos_per_lead": args.videos_per_lead,
+            "top_k": args.top_k,
+            "seed_seconds": round(seed_seconds, 2),
+            "naive": naive,
+            "aggregate": aggregate,
+            "speedup_p50": round(naive["p50_ms"] / aggregate["p50_ms"], 2) if aggregate["p50_ms"] else None
+        }, indent=2))
+
+    finally:
+        mongo.drop_database(args.database)
+
+
+if __name__ == "__main__":
+    main()
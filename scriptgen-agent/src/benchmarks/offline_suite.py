@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+"""Run the full script-generation path offline on recorded fixtures.
+
+Every dependency is replaced by a local fixture, so results are comparable
+between commits on any Linux box:
+
+- MongoDB: a mongomock database seeded with --leads leads, cycled from the
+  recorded leads (data/recorded_leads.json) under fresh IDs
+- TikTok: fixture_server.py pages, each with a <video> of one sample video
+  (--video, or generated with ffmpeg)
+- OpenAI: fake_openai_server.py with --llm-latency seconds per request
+
+Modes:
+
+- analyzer: TikTokVideoAnalyzer.analyze_videos on each lead's top videos
+- generator: ScriptGenerator on each lead with its recorded analyses
+- pipeline: ScriptPipeline (fetch, analyze, generate) per lead
+- crew: the hierarchical crew per lead, with the same tools through the
+  tool registry; skipped when crewai is not installed
+
+--capture picks how the analyzer gets frames: "selenium" (headless Chrome
+on the fixture pages), "direct" (ffmpeg download and decode) or "frames"
+(synthetic in-memory frames, for machines without Chrome or ffmpeg; the
+dedup, preprocessing and vision steps still run). "auto" uses the first
+one available.
+
+Each mode runs in a fresh interpreter so peak RSS is its own. The report
+gives, per mode, throughput, p50/p95/max lead latency, peak RSS of the
+process and of the largest child process (Chrome, ffmpeg), LLM requests and
+token counts, as JSON. With --baseline, ratios against an earlier report
+are added. The rate limiter is effectively disabled unless
+OPENAI_RATE_LIMITS is set, so the numbers measure the code, not the quota.
+
+Usage:
+    python src/benchmarks/offline_suite.py --leads 20 --output results.json
+    python src/benchmarks/offline_suite.py --modes analyzer pipeline --capture frames
+    python src/benchmarks/offline_suite.py --baseline results.json --llm-latency 0.5
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path to import tools
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_openai_server import run_server  # noqa: E402
+from fixture_server import generate_sample_video, run_fixture_server  # noqa: E402
+from pipeline_vs_crew import DEFAULT_INPUTS, PRODUCT_INFO, load_records  # noqa: E402
+from tools.chrome_profile import CHROME_PROFILES  # noqa: E402
+from tools.tracing import percentile  # noqa: E402
+
+MODES = ("analyzer", "generator", "pipeline", "crew")
+CAPTURES = ("auto", "selenium", "direct", "frames")
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+# Quotas high enough that the shared rate limiter never waits, unless
+# OPENAI_RATE_LIMITS is set to benchmark under a real account's quota
+UNTHROTTLED_LIMITS = "gpt-4o=100000:1000000000,gpt-4o-mini=100000:1000000000"
+
+# Size of the synthetic frames used by the "frames" capture (a phone screenshot)
+FRAME_SIZE = (393, 852)
+
+
+def resolve_capture(capture: str, video: Optional[str]) -> str:
+    """Pick the capture for "auto": Selenium, then direct, then synthetic frames."""
+    if capture != "auto":
+        return capture
+    has_video = bool(video) or bool(shutil.which("ffmpeg"))
+    if has_video and any(shutil.which(binary) for binary in CHROME_BINARIES):
+        return "selenium"
+    if has_video and shutil.which("ffmpeg") and shutil.which("ffprobe"):
+        return "direct"
+    return "frames"
+
+
+def synthetic_frame(seed: str, index: int) -> bytes:
+    """Render a distinct PNG frame: a random grid of color blocks seeded by video and index."""
+    import io
+    from PIL import Image
+
+    rng = random.Random(f"{seed}:{index}")
+    grid = Image.new("RGB", (8, 16))
+    grid.putdata([tuple(rng.randrange(256) for _ in range(3)) for _ in range(8 * 16)])
+    buffer = io.BytesIO()
+    grid.resize(FRAME_SIZE, Image.NEAREST).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_analyzer(capture: str, pool_size: int, chrome_profile: str = "full") -> Any:
+    """Build a TikTokVideoAnalyzer for a capture, without caches so every run does the work."""
+    from tools import TikTokVideoAnalyzer
+
+    if capture != "frames":
+        return TikTokVideoAnalyzer(pool_size=pool_size, backend=capture, cache_path=None,
+                                   chrome_profile=chrome_profile)
+
+    class SyntheticFrameAnalyzer(TikTokVideoAnalyzer):
+        """Analyzer whose capture step returns synthetic frames instead of opening the page."""
+
+        def _capture_video(self, video_url: str, num_screenshots: int = 5, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+            frames = [synthetic_frame(video_url, index) for index in range(num_screenshots)]
+            return {
+                "frames": frames,
+                "screenshot_refs": [self._screenshot_ref(frame) for frame in frames],
+                "capture_metadata": {"backend": "synthetic"},
+                "dedup": None,
+                "driver_session": None
+            }
+
+    return SyntheticFrameAnalyzer(pool_size=pool_size, cache_path=None)
+
+
+def seed_dataset(records: List[Dict[str, Any]], num_leads: int, fixture_url: str) -> Tuple[Any, List[Dict[str, Any]]]:
+    """Seed a mongomock database with num_leads leads cycled from the records.
+
+    Video URLs point at the fixture server, and each lead keeps its record's
+    recorded analyses, keyed by the new URLs.
+
+    Returns:
+        The MongoDBClient and one {"lead", "videos", "analyses"} entry per lead
+    """
+    import mongomock
+    from bson import ObjectId
+    from tools import MongoDBClient
+
+    client = MongoDBClient(client=mongomock.MongoClient(), database_name="offline_benchmark")
+    database = client.get_database()
+    leads = []
+    for index in range(num_leads):
+        record = records[index % len(records)]
+        lead_id = ObjectId()
+        handle = f"creator{index}"
+        videos, analyses = [], {}
+        for number, video in enumerate(record["videos"]):
+            url = f"{fixture_url}/@{handle}/video/{index}{number:03d}"
+            recorded = record["video_analyses"].get(video.get("webVideoUrl"), [])
+            video = {key: value for key, value in video.items() if key != "_id"}
+            videos.append({**video, "webVideoUrl": url, "leadId": lead_id})
+            analyses[url] = recorded
+
+        database.leads.insert_one({**record["lead"], "_id": lead_id})
+        database.videos.insert_many([dict(video) for video in videos])
+        leads.append({"lead": {**record["lead"], "_id": lead_id, "id": str(lead_id)},
+                      "videos": videos, "analyses": analyses})
+    return client, leads
+
+
+def measure(fake: Any, leads: List[Dict[str, Any]], run_lead: Callable[[Dict[str, Any]], Any],
+            concurrency: int) -> Dict[str, Any]:
+    """Run every lead, concurrency at a time, and summarize latency, throughput and tokens."""
+    def timed(entry: Dict[str, Any]) -> Tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            result = run_lead(entry)
+            failed = isinstance(result, dict) and "error" in result
+        except Exception as e:
+            print(f"Error benchmarking lead {entry['lead']['id']}: {str(e)}", file=sys.stderr)
+            failed = True
+        return time.perf_counter() - start, failed
+
+    before = dict(fake.stats)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        outcomes = list(executor.map(timed, leads))
+    elapsed = time.perf_counter() - start
+
+    latencies = [seconds for seconds, _ in outcomes]
+    prompt_tokens = fake.stats["prompt_tokens"] - before["prompt_tokens"]
+    completion_tokens = fake.stats["completion_tokens"] - before["completion_tokens"]
+    return {
+        "leads": len(leads),
+        "errors": sum(1 for _, failed in outcomes if failed),
+        "wall_seconds": round(elapsed, 3),
+        "throughput_leads_per_minute": round(60 * len(leads) / elapsed, 2) if elapsed else None,
+        "latency_p50_seconds": round(percentile(latencies, 0.5), 3),
+        "latency_p95_seconds": round(percentile(latencies, 0.95), 3),
+        "latency_max_seconds": round(max(latencies), 3) if latencies else 0.0,
+        "llm_requests": fake.stats["requests"] - before["requests"],
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "tokens_per_lead": round((prompt_tokens + completion_tokens) / len(leads), 1) if leads else 0.0
+    }
+
+
+def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one mode against fresh fixtures in this process and return its measurements."""
+    work_dir = tempfile.mkdtemp(prefix="scriptgen-benchmark-")
+    # Tools write caches and screenshots under data/, relative to the working directory
+    os.chdir(work_dir)
+
+    server = run_server(latency=args.llm_latency)
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    # The tools read OPENAI_BASE_URL; CrewAI's LLM client reads OPENAI_API_BASE
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "fake")
+    os.environ.setdefault("OPENAI_RATE_LIMITS", UNTHROTTLED_LIMITS)
+
+    capture = resolve_capture(args.capture, args.video)
+    video = args.video
+    if capture in ("selenium", "direct") and not video:
+        video = generate_sample_video(work_dir)
+        if video is None:
+            return {"skipped": "ffmpeg could not generate a sample video; pass --video"}
+    fixtures = run_fixture_server(video)
+    fixture_url = f"http://127.0.0.1:{fixtures.server_port}"
+
+    from tools import ScriptGenerator
+    from tools.script_generator import product_requirements_from_info
+
+    client, leads = seed_dataset(load_records(args.inputs), args.leads, fixture_url)
+    product_requirements = product_requirements_from_info(PRODUCT_INFO)
+    result: Dict[str, Any] = {"capture": capture} if mode != "generator" else {}
+    analyzer = None
+    try:
+        if mode == "analyzer":
+            analyzer = make_analyzer(capture, args.videos_per_lead, args.chrome_profile)
+
+            def run_lead(entry: Dict[str, Any]) -> Any:
+                urls = [video["webVideoUrl"] for video in entry["videos"][:args.videos_per_lead]]
+                analysis = analyzer.analyze_videos(urls, args.num_screenshots, max_workers=len(urls))
+                return {"error": "video analysis failed"} if analysis.get("failed") else analysis
+
+        elif mode == "generator":
+            generator = ScriptGenerator()
+
+            def run_lead(entry: Dict[str, Any]) -> Any:
+                videos = entry["videos"][:args.videos_per_lead]
+                analyses = [analysis for video in videos for analysis in entry["analyses"][video["webVideoUrl"]]]
+                concepts = generator.generate(
+                    entry["lead"], videos, analyses, product_requirements)
+                return {"error": concepts[0]["error"]} if concepts and "error" in concepts[0] else concepts
+
+        elif mode == "pipeline":
+            from pipeline import ScriptPipeline
+            analyzer = make_analyzer(capture, args.videos_per_lead, args.chrome_profile)
+            pipeline = ScriptPipeline(PRODUCT_INFO, videos_per_lead=args.videos_per_lead,
+                                      num_screenshots=args.num_screenshots, mongodb_client=client,
+                                      video_analyzer=analyzer, script_generator=ScriptGenerator())
+
+            def run_lead(entry: Dict[str, Any]) -> Any:
+                return pipeline.run(entry["lead"]["id"])
+
+        else:
+            try:
+                from crew import TestCrew
+            except ImportError as e:
+                return {"skipped": f"crewai is not installed ({str(e)})"}
+            from tools.rate_limiter import set_agent_crews
+            from tools.registry import register_tool
+            analyzer = make_analyzer(capture, args.videos_per_lead, args.chrome_profile)
+            register_tool("tiktok_video_analyzer", analyzer)
+            register_tool("mongodb_client", client)
+            # One crew per lead in flight, so they split the agents' quota
+            set_agent_crews(args.concurrency)
+
+            def run_lead(entry: Dict[str, Any]) -> Any:
+                lead_id = entry["lead"]["id"]
+                return TestCrew().crew().kickoff(inputs={
+                    "query": f"Generate video script concepts for creator with lead ID {lead_id} "
+                             f"and product '{PRODUCT_INFO['name']}'",
+                    "lead_data": {"id": lead_id},
+                    "product_info": PRODUCT_INFO
+                })
+
+        result.update(measure(server.fake, leads, run_lead, args.concurrency))
+
+    finally:
+        # Closing the analyzer quits Chrome, so its RSS is counted with the reaped children
+        if analyzer is not None:
+            analyzer.close()
+        from tools.registry import close_tools
+        close_tools()
+        fixtures.shutdown()
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # ru_maxrss is in kilobytes on Linux; for children it is the largest reaped process
+    result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    if analyzer is not None and capture in ("selenium", "direct"):
+        result["children_peak_rss_mb"] = round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+    return result
+
+
+def run_isolated(mode: str, argv: List[str]) -> Dict[str, Any]:
+    """Run one mode in a fresh interpreter and return its measurements."""
+    process = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode, *argv],
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        lines = process.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit status {process.returncode}"}
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Return current/baseline ratios of the main metrics for modes present in both reports."""
+    metrics = ("throughput_leads_per_minute", "latency_p50_seconds", "latency_p95_seconds",
+               "peak_rss_mb", "tokens_per_lead")
+    ratios = {}
+    for mode, result in results.items():
+        previous = baseline.get("modes", {}).get(mode)
+        if not isinstance(previous, dict) or "leads" not in result or "leads" not in previous:
+            continue
+        ratios[mode] = {metric: round(result[metric] / previous[metric], 3)
+                        for metric in metrics if result.get(metric) and previous.get(metric)}
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--leads", type=int, default=10, help="Leads run per mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="Leads in flight at once")
+    parser.add_argument("--inputs", default=DEFAULT_INPUTS, help="Recorded leads JSON file")
+    parser.add_argument("--capture", default="auto", choices=CAPTURES)
+    parser.add_argument("--video", help="Sample video served by the fixture pages (default: generated with ffmpeg)")
+    parser.add_argument("--chrome-profile", default="full", choices=CHROME_PROFILES,
+                        help="Chrome profile of the selenium capture")
+    parser.add_argument("--videos-per-lead", type=int, default=3)
+    parser.add_argument("--num-screenshots", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.2,
+                        help="Seconds the fake endpoint takes per LLM request")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.video:
+        args.video = os.path.abspath(args.video)
+    args.inputs = os.path.abspath(args.inputs)
+
+    if args.child:
+        print(json.dumps(run_mode(args.child, args)))
+        return
+
+    argv = ["--leads", str(args.leads), "--concurrency", str(args.concurrency),
+            "--inputs", args.inputs, "--capture", args.capture,
+            "--chrome-profile", args.chrome_profile,
+            "--videos-per-lead", str(args.videos_per_lead),
+            "--num-screenshots", str(args.num_screenshots),
+            "--llm-latency", str(args.llm_latency)]
+    if args.video:
+        argv.extend(["--video", args.video])
+
+    report: Dict[str, Any] = {
+        "config": {key: getattr(args, key) for key in
+                   ("leads", "concurrency", "capture", "chrome_profile", "videos_per_lead",
+                    "num_screenshots", "llm_latency")},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "modes": {mode: run_isolated(mode, argv) for mode in args.modes}
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["vs_baseline"] = compare(report["modes"], json.load(f))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
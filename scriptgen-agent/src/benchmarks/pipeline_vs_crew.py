@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""Compare the fast-path script pipeline with the hierarchical crew per lead.
+
+Both modes run offline on a fixed set of recorded leads
+(data/recorded_leads.json by default): each record holds a lead document,
+its videos and the screenshot analyses recorded for each video URL.
+
+- pipeline: ScriptPipeline over a mongomock database seeded with the
+  recorded leads and videos, replaying the recorded analyses instead of
+  opening a browser
+- hierarchical: TestCrew().crew().kickoff() for the same leads, skipped
+  when crewai is not installed
+
+Every LLM request goes to the local fake OpenAI endpoint, which adds a fixed
+latency per request and counts requests and (estimated) tokens, so latency
+and token cost per lead are comparable between the modes. The fake answers
+every crew agent turn with a final answer and never delegates, so the
+hierarchical numbers are a lower bound on a real run.
+
+Usage:
+    python src/benchmarks/pipeline_vs_crew.py
+    python src/benchmarks/pipeline_vs_crew.py --inputs my_leads.json --llm-latency 1.5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import Any, Callable, Dict, List
+
+# Add parent directory to path to import tools
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bson import ObjectId  # noqa: E402
+from fake_openai_server import run_server  # noqa: E402
+
+DEFAULT_INPUTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "recorded_leads.json")
+
+PRODUCT_INFO = {
+    "name": "StyleBoost Accessory Set",
+    "description": "A versatile set of fashion accessories that transform any outfit",
+    "goals": "Increase brand awareness and drive product interest",
+    "target_audience": "18-34 year old fashion-forward consumers",
+    "key_messages": "1. StyleBoost is unique and high-quality\n2. It enhances personal style\n3. It's versatile and easy to use"
+}
+
+
+class RecordedVideoAnalyzer:
+    """Stands in for TikTokVideoAnalyzer, returning recorded screenshot analyses."""
+
+    def __init__(self, analyses: Dict[str, List[str]], latency: float = 0.0):
+        self.analyses = analyses
+        self.latency = latency
+
+    def analyze_videos(self, video_urls: List[str], num_screenshots: int = 5,
+                       max_workers: int = 1) -> Dict[str, Any]:
+        # Videos are analyzed in parallel, so a batch takes about one video's time
+        if self.latency:
+            time.sleep(self.latency)
+        return {"results": [
+            {"video_url": url, "screenshot_analyses": self.analyses.get(url, [])[:num_screenshots]}
+            for url in video_urls]}
+
+    def close(self) -> None:
+        pass
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Load recorded leads: [{"lead": {...}, "videos": [...], "video_analyses": {url: [...]}}]."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def measure(fake: Any, lead_ids: List[str], run_lead: Callable[[str], Any]) -> Dict[str, Any]:
+    """Run each lead in turn and summarize latency, requests and tokens per lead."""
+    per_lead = []
+    for lead_id in lead_ids:
+        before = dict(fake.stats)
+        start = time.perf_counter()
+        run_lead(lead_id)
+        elapsed = time.perf_counter() - start
+        per_lead.append({
+            "seconds": elapsed,
+            "requests": fake.stats["requests"] - before["requests"],
+            "tokens": (fake.stats["prompt_tokens"] + fake.stats["completion_tokens"]
+                       - before["prompt_tokens"] - before["completion_tokens"])
+        })
+
+    return {
+        "leads": len(per_lead),
+        "mean_seconds": round(statistics.mean(lead["seconds"] for lead in per_lead), 3),
+        "mean_llm_requests": round(statistics.mean(lead["requests"] for lead in per_lead), 2),
+        "mean_tokens": round(statistics.mean(lead["tokens"] for lead in per_lead), 1)
+    }
+
+
+def run_pipeline(records: List[Dict[str, Any]], fake: Any, analysis_latency: float) -> Dict[str, Any]:
+    """Benchmark ScriptPipeline on the recorded leads."""
+    import mongomock
+    from pipeline import ScriptPipeline
+    from tools import MongoDBClient
+
+    client = MongoDBClient(client=mongomock.MongoClient(), database_name="pipeline_benchmark")
+    database = client.get_database()
+    analyses: Dict[str, List[str]] = {}
+    for record in records:
+        lead_id = ObjectId(record["lead"]["_id"])
+        database.leads.insert_one({**record["lead"], "_id": lead_id})
+        database.videos.insert_many([{**video, "leadId": lead_id} for video in record["videos"]])
+        analyses.update(record["video_analyses"])
+
+    pipeline = ScriptPipeline(
+        PRODUCT_INFO,
+        mongodb_client=client,
+        video_analyzer=RecordedVideoAnalyzer(analyses, analysis_latency)
+    )
+    try:
+        return measure(fake, [record["lead"]["_id"] for record in records], pipeline.run)
+    finally:
+        pipeline.close()
+
+
+def run_hierarchical(records: List[Dict[str, Any]], fake: Any) -> Dict[str, Any]:
+    """Benchmark the hierarchical crew on the recorded leads."""
+    try:
+        from crew import TestCrew
+    except ImportError as e:
+        return {"skipped": f"crewai is not installed ({str(e)})"}
+
+    leads = {record["lead"]["_id"]: record["lead"] for record in records}
+
+    def kickoff(lead_id: str) -> Any:
+        lead = {**leads[lead_id], "id": lead_id}
+        return TestCrew().crew().kickoff(inputs={
+            "query": f"Generate video script concepts for creator with lead ID {lead_id} "
+                     f"and product '{PRODUCT_INFO['name']}'",
+            "lead_data": lead,
+            "product_info": PRODUCT_INFO
+        })
+
+    return measure(fake, list(leads), kickoff)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--inputs", default=DEFAULT_INPUTS, help="Recorded leads JSON file")
+    parser.add_argument("--llm-latency", type=float, default=0.5,
+                        help="Seconds the fake endpoint takes per LLM request")
+    parser.add_argument("--analysis-latency", type=float, default=0.0,
+                        help="Seconds the replayed video analysis takes per lead")
+    parser.add_argument("--modes", nargs="+", default=["pipeline", "hierarchical"],
+                        choices=["pipeline", "hierarchical"])
+    args = parser.parse_args()
+
+    server = run_server(latency=args.llm_latency)
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    # The tools read OPENAI_BASE_URL; CrewAI's LLM client reads OPENAI_API_BASE
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "fake")
+
+    records = load_records(args.inputs)
+    results: Dict[str, Any] = {"inputs": args.inputs, "llm_latency": args.llm_latency}
+    if "pipeline" in args.modes:
+        results["pipeline"] = run_pipeline(records, server.fake, args.analysis_latency)
+    if "hierarchical" in args.modes:
+        results["hierarchical"] = run_hierarchical(records, server.fake)
+
+    pipeline, hierarchical = results.get("pipeline"), results.get("hierarchical")
+    if pipeline and hierarchical and "skipped" not in hierarchical:
+        results["speedup"] = round(hierarchical["mean_seconds"] / pipeline["mean_seconds"], 2)
+        results["token_ratio"] = round(hierarchical["mean_tokens"] / pipeline["mean_tokens"], 2)
+
+    server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""Measure prompt tokens and cacheable prefix before and after the template compiler.
+
+Renders the script-generation prompt for two creators in the same campaign
+with the legacy layout (per-creator data first, static instructions last,
+indented f-strings) and with the compiled templates (static instructions
+first, product before creator, whitespace stripped). Reports for each:
+
+- prompt tokens (tiktoken if installed, otherwise a characters/4 estimate)
+- the prefix shared by both creators' prompts, which provider-side prompt
+  caching can reuse (OpenAI caches prefixes of 1024+ tokens)
+- mean render time
+
+The legacy builder below is copied from the pre-template ScriptGenerator,
+re-indented by one level; the original carried 4 more spaces per line, so
+its numbers are a lower bound.
+
+Usage:
+    python src/benchmarks/prompt_tokens.py
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict, List
+
+# Add parent directory to path to import tools
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.prompt_templates import count_tokens, has_tokenizer  # noqa: E402
+from tools.script_generator import SCRIPT_PROMPT_VERSION, ScriptGenerator  # noqa: E402
+
+PRODUCT = {
+    "product_name": "StyleBoost",
+    "product_description": "A versatile fashion accessory that transforms any outfit",
+    "campaign_goals": "Increase brand awareness and drive product interest",
+    "target_audience": "18-34 year old fashion-forward consumers",
+    "key_messages": "1. StyleBoost is unique and high-quality\n2. It enhances personal style\n3. It's versatile and easy to use"
+}
+
+
+def sample_lead(index: int) -> Dict[str, Any]:
+    """Return lead data, videos and analyses for a synthetic creator."""
+    lead = {
+        "nickName": f"creator_{index}",
+        "bio": f"Daily outfit ideas and styling tips #{index}",
+        "totalFollowers": 50000 + index * 1000,
+        "totalEngagementRate": 4.2,
+        "averageViews": 75000,
+        "averageLikes": 15000,
+        "averageComments": 300,
+        "averageShares": 120,
+        "tags": ["fashion", "style", "ootd"]
+    }
+    videos = [{
+        "text": f"Outfit idea {i} for creator {index} #ootd #style",
+        "playCount": 100000 - i * 5000,
+        "diggCount": 20000 - i * 1000,
+        "commentCount": 400,
+        "shareCount": 150,
+        "webVideoUrl": f"https://www.tiktok.com/@creator_{index}/video/{i}"
+    } for i in range(3)]
+    analyses = [
+        f"Frame {i + 1}: creator {index} centered in a bright bedroom, warm lighting, "
+        "bold white caption at the top, mirror selfie framing, accessories in focus."
+        for i in range(5)]
+    return {"lead_data": lead, "high_performing_videos": videos, "video_analyses": analyses,
+            "product_requirements": PRODUCT}
+
+
+def legacy_format_videos(videos: List[Dict[str, Any]]) -> str:
+    """The pre-template video formatting: += concatenation of indented f-strings."""
+    formatted = ""
+
+    for i, video in enumerate(videos):
+        formatted += f"""
+        ### Video {i+1}
+        - Caption: {video.get("text", "")}
+        - Views: {video.get("playCount", 0)}
+        - Likes: {video.get("diggCount", 0)}
+        - Comments: {video.get("commentCount", 0)}
+        - Shares: {video.get("shareCount", 0)}
+        - URL: {video.get("webVideoUrl", "")}
+        """
+
+    return formatted
+
+
+def legacy_format_analyses(analyses: List[str]) -> str:
+    """The pre-template analysis formatting."""
+    formatted = ""
+
+    for i, analysis in enumerate(analyses):
+        formatted += f"""
+        ### Screenshot Analysis {i+1}
+        {analysis}
+        
+        """
+
+    return formatted
+
+
+def legacy_messages(lead_data: Dict[str, Any],
+                    high_performing_videos: List[Dict[str, Any]],
+                    video_analyses: List[str],
+                    product_requirements: Dict[str, Any]) -> List[Dict[str, str]]:
+    """The pre-template prompt: per-creator data first, static instructions last."""
+    creator_name = lead_data.get("nickName", "")
+    prompt = f"""
+    # Video Script Concept Generation
+    
+    ## Creator Information
+    - Creator: {creator_name}
+    - Bio: {lead_data.get("bio", "")}
+    - Total Followers: {lead_data.get("totalFollowers", "")}
+    - Engagement Rate: {lead_data.get("totalEngagementRate", "")}%
+    
+    ## Performance Metrics
+    - Average Views: {lead_data.get("averageViews", 0)}
+    - Average Likes: {lead_data.get("averageLikes", 0)}
+    - Average Comments: {lead_data.get("averageComments", 0)}
+    - Average Shares: {lead_data.get("averageShares", 0)}
+    - Tags/Categories: {', '.join(lead_data.get("tags", []))}
+    
+    ## High-Performing Videos
+    {legacy_format_videos(high_performing_videos)}
+    
+    ## Video Style Analysis
+    {legacy_format_analyses(video_analyses)}
+    
+    ## Product/Campaign Information
+    - Product Name: {product_requirements.get("product_name", "")}
+    - Product Description: {product_requirements.get("product_description", "")}
+    - Campaign Goals: {product_requirements.get("campaign_goals", "")}
+    - Target Audience: {product_requirements.get("target_audience", "")}
+    - Key Messages: {product_requirements.get("key_messages", "")}
+    
+    ## Your Task
+    Based on the creator's high-performing content, visual style analysis, and the product information, generate 3 detailed script concepts for TikTok videos.
+    
+    For each concept, provide:
+    1. A title and format description
+    2. A strong hook (first 3 seconds)
+    3. A shot-by-shot breakdown with timing
+    4. Suggested text overlays and their placement
+    5. Music/audio recommendations
+    6. A caption strategy with hashtags
+    
+    Make sure each concept:
+    - Matches the creator's authentic style
+    - Leverages their high-performing content patterns
+    - Naturally integrates the product
+    - Has a strong hook and narrative arc
+    - Includes specific visual details based on the screenshot analysis
+    
+    Format each concept as a structured outline with clear sections.
+    """
+
+    return [
+        {"role": "system", "content": "You are an expert TikTok content strategist and script developer for influencer marketing campaigns."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def flatten(messages: List[Dict[str, str]]) -> str:
+    """Concatenate messages in order, as the provider sees the prompt prefix."""
+    return "".join(f"<{message['role']}>{message['content']}" for message in messages)
+
+
+def common_prefix(a: str, b: str) -> str:
+    return os.path.commonprefix([a, b])
+
+
+def measure(build: Any, repeat: int) -> Dict[str, Any]:
+    """Measure one prompt layout for two creators of the same campaign."""
+    first, second = sample_lead(1), sample_lead(2)
+    first_messages, second_messages = build(**first), build(**second)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build(**first)
+    render_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    prompt = flatten(first_messages)
+    prefix = common_prefix(prompt, flatten(second_messages))
+    tokens = count_tokens(prompt)
+    prefix_tokens = count_tokens(prefix)
+    return {
+        "prompt_tokens": tokens,
+        "prompt_chars": len(prompt),
+        "shared_prefix_tokens": prefix_tokens,
+        "shared_prefix_share": round(prefix_tokens / tokens, 3) if tokens else 0.0,
+        "mean_render_ms": round(render_ms, 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    generator = ScriptGenerator(output_mode="text")
+
+    def compiled_messages(**inputs: Any) -> List[Dict[str, str]]:
+        return generator._completion_request(**inputs)["messages"]
+
+    before = measure(legacy_messages, args.repeat)
+    after = measure(compiled_messages, args.repeat)
+    print(json.dumps({
+        "prompt_version": SCRIPT_PROMPT_VERSION,
+        "token_counter": "tiktoken" if has_tokenizer() else "estimate (characters / 4)",
+        "before": before,
+        "after": after,
+        "tokens_saved": before["prompt_tokens"] - after["prompt_tokens"]
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""Compare parse-failure rate and parse time of the script generator's output modes.
+
+Offline (default), a corpus of responses is parsed in both modes:
+
+- text: the markdown outline the prompt asks for, plus formatting drift
+  seen from models (other heading styles, bold section labels)
+- json_schema: structured output, plus a response cut off at max_tokens
+
+Each parse is compared with the concepts the response was rendered from.
+Results are reported per variant and per mode: exact-match rate, per-field
+accuracy, the generator's self-detected failure rate and mean parse time.
+Variants are weighted equally, so aggregate rates describe this corpus, not
+production traffic.
+
+With --live N, N real generations per mode are run against the configured
+endpoint (e.g. the fake server via OPENAI_BASE_URL) and the generator's
+parse_report() is printed.
+
+Usage:
+    python src/benchmarks/script_parsing.py --repeat 200
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python src/benchmarks/script_parsing.py --live 20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import Any, Dict, List, Tuple
+
+# Add parent directory to path to import tools
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_openai_server import SCRIPT_CONCEPTS, render_concepts  # noqa: E402
+from tools.script_generator import CONCEPT_FIELDS, OUTPUT_MODES, ScriptGenerator  # noqa: E402
+
+
+def corpus() -> Dict[str, List[Tuple[str, str]]]:
+    """Return (variant, response) samples for each output mode."""
+    structured = json.dumps({"concepts": SCRIPT_CONCEPTS})
+    bold_labels = render_concepts(SCRIPT_CONCEPTS)
+    for label in ("Title", "Format", "Hook", "Music", "Caption"):
+        bold_labels = bold_labels.replace(f"{label}:", f"**{label}:**")
+
+    return {
+        "text": [
+            ("h1_concept_heading", render_concepts(SCRIPT_CONCEPTS)),
+            ("h3_concept_heading", render_concepts(SCRIPT_CONCEPTS, "### Concept {number}: {title}")),
+            ("bold_concept_heading", render_concepts(SCRIPT_CONCEPTS, "**Concept {number}: {title}**")),
+            ("numbered_heading", render_concepts(SCRIPT_CONCEPTS, "{number}. {title}")),
+            ("bold_section_labels", bold_labels),
+        ],
+        "json_schema": [
+            ("compact", structured),
+            ("pretty_printed", json.dumps({"concepts": SCRIPT_CONCEPTS}, indent=2)),
+            ("truncated_at_max_tokens", structured[:len(structured) * 2 // 3]),
+        ]
+    }
+
+
+def field_accuracy(concepts: List[Dict[str, Any]]) -> float:
+    """Fraction of expected concept fields parsed exactly."""
+    matched = 0
+    for index, expected in enumerate(SCRIPT_CONCEPTS):
+        actual = concepts[index] if index < len(concepts) else {}
+        matched += sum(1 for field in CONCEPT_FIELDS if actual.get(field) == expected[field])
+    return matched / (len(SCRIPT_CONCEPTS) * len(CONCEPT_FIELDS))
+
+
+def run_corpus(repeat: int) -> Dict[str, Any]:
+    """Parse every corpus sample ``repeat`` times in its mode and summarize."""
+    results: Dict[str, Any] = {}
+    for mode, samples in corpus().items():
+        generator = ScriptGenerator(output_mode=mode)
+        variants = {}
+        for variant, response in samples:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                concepts = generator._parse_response(response, mode)
+                timings.append((time.perf_counter() - start) * 1000)
+            variants[variant] = {
+                "exact_match": concepts == SCRIPT_CONCEPTS,
+                "field_accuracy": round(field_accuracy(concepts), 3),
+                "concepts_parsed": len(concepts),
+                "mean_parse_ms": round(statistics.mean(timings), 4)
+            }
+
+        report = generator.parse_report()[mode]
+        results[mode] = {
+            "variants": variants,
+            "exact_match_rate": round(
+                sum(v["exact_match"] for v in variants.values()) / len(variants), 3),
+            "mean_field_accuracy": round(
+                statistics.mean(v["field_accuracy"] for v in variants.values()), 3),
+            "self_detected_failure_rate": report["failure_rate"],
+            "fallback_rate": round(report["fallbacks"] / report["parses"], 4),
+            "mean_parse_ms": report["mean_parse_ms"]
+        }
+    return results
+
+
+def run_live(count: int) -> Dict[str, Any]:
+    """Generate ``count`` times per output mode and return each generator's parse report."""
+    results = {}
+    for mode in OUTPUT_MODES:
+        generator = ScriptGenerator(output_mode=mode)
+        start = time.perf_counter()
+        for _ in range(count):
+            generator.generate({"nickName": "benchmark"}, [], [], {})
+        results[mode] = {**generator.parse_report()[mode],
+                         "elapsed_seconds": round(time.perf_counter() - start, 2)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=100,
+                        help="Parses per corpus sample")
+    parser.add_argument("--live", type=int, default=0,
+                        help="Also run this many live generations per mode")
+    args = parser.parse_args()
+
+    results = {"corpus": run_corpus(args.repeat)}
+    if args.live:
+        results["live"] = run_live(args.live)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
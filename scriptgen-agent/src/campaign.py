@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+from pipeline import ScriptPipeline
+from tools import MongoDBClient, ScriptGenerator, TikTokVideoAnalyzer
+
+# Load environment variables
+load_dotenv()
+
+
+class StartRateLimiter:
+    """Spaces out the start of work items to at most ``per_minute`` per minute."""
+
+    def __init__(self, per_minute: float):
+        """Initialize the limiter.
+
+        Args:
+            per_minute: Maximum number of starts per minute (0 disables the limit)
+        """
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next start slot."""
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+
+        if start > now:
+            time.sleep(start - now)
+
+
+class Campaign:
+    """Generates script concepts for many leads against one product brief."""
+
+    def __init__(self,
+                 product_info: Dict[str, Any],
+                 max_concurrency: int = 8,
+                 leads_per_minute: float = 0,
+                 videos_per_lead: int = 3,
+                 num_screenshots: int = 5,
+                 mongodb_client: Optional[MongoDBClient] = None,
+                 video_analyzer: Optional[TikTokVideoAnalyzer] = None,
+                 script_generator: Optional[ScriptGenerator] = None):
+        """Initialize the campaign runner.
+
+        Args:
+            product_info: Product brief in the inputs.yaml format
+            max_concurrency: Maximum number of leads processed at once
+            leads_per_minute: Global limit on leads started per minute (0 disables it)
+            videos_per_lead: Number of top videos analyzed per lead
+            num_screenshots: Number of screenshots captured per video
+            mongodb_client: MongoDB tool to use (default: a new MongoDBClient)
+            video_analyzer: Video analyzer to use (default: one with a driver pool
+                sized for max_concurrency)
+            script_generator: Script generator to use (default: a new ScriptGenerator)
+        """
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = StartRateLimiter(leads_per_minute)
+        self.pipeline = ScriptPipeline(
+            product_info,
+            videos_per_lead=videos_per_lead,
+            num_screenshots=num_screenshots,
+            mongodb_client=mongodb_client,
+            video_analyzer=video_analyzer or TikTokVideoAnalyzer(pool_size=max_concurrency),
+            script_generator=script_generator
+        )
+        self.mongodb_client = self.pipeline.mongodb_client
+        self.video_analyzer = self.pipeline.video_analyzer
+        self.script_generator = self.pipeline.script_generator
+
+    def process_lead(self, lead: Dict[str, Any]) -> Dict[str, Any]:
+        """Wait for a start slot, then run the script pipeline for a lead.
+
+        Args:
+            lead: Lead document as returned by MongoDBClient.fetch_leads
+
+        Returns:
+            Dictionary with the lead ID, script concepts and timings
+        """
+        self.rate_limiter.wait()
+        return self.pipeline.process_lead(lead)
+
+    def run(self, lead_ids: List[str], output_path: str) -> Dict[str, Any]:
+        """Process all leads concurrently, streaming one JSON line per lead.
+
+        Lead documents are prefetched with a single $in query. Each line of the
+        output is written and flushed as soon as its lead finishes, so partial
+        results survive an interrupted run.
+
+        Args:
+            lead_ids: The leads' _id values
+            output_path: Path of the JSONL output file
+
+        Returns:
+            Run summary with success/failure counts and throughput in leads per minute
+        """
+        start = time.monotonic()
+        leads = self.mongodb_client.fetch_leads(lead_ids)
+        write_lock = threading.Lock()
+        counts = {"succeeded": 0, "failed": 0}
+
+        with open(output_path, "w") as output:
+            def write(record: Dict[str, Any]) -> None:
+                with write_lock:
+                    output.write(json.dumps(record, default=str) + "\n")
+                    output.flush()
+                    counts["failed" if "error" in record else "succeeded"] += 1
+
+            def process(lead_id: str) -> None:
+                # fetch_leads keys leads by str(_id), which is lowercase hex for ObjectIds
+                lead = leads.get(self.mongodb_client.normalize_lead_id(lead_id))
+                if lead is None:
+                    write({"lead_id": lead_id, "error": f"Lead {lead_id} not found"})
+                    return
+                try:
+                    write(self.process_lead(lead))
+                except Exception as e:
+                    print(f"Error processing lead {lead_id}: {str(e)}")
+                    write({"lead_id": lead_id, "error": str(e)})
+
+            with ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                    thread_name_prefix="campaign") as executor:
+                list(executor.map(process, lead_ids))
+
+        elapsed = time.monotonic() - start
+        return {
+            "leads": len(lead_ids),
+            **counts,
+            "elapsed_seconds": round(elapsed, 2),
+            "leads_per_minute": round(len(lead_ids) / elapsed * 60, 2) if elapsed else 0.0,
+            "output_path": output_path
+        }
+
+
+def read_lead_ids(path: str) -> List[str]:
+    """Read lead IDs from a file with one ID per line, ignoring blanks and # comments."""
+    with open(path) as f:
+        return [line.strip() for line in f
+                if line.strip() and not line.strip().startswith("#")]
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run a campaign from the command line and print its summary."""
+    parser = argparse.ArgumentParser(
+        description="Generate script concepts for a list of leads and one product brief.")
+    parser.add_argument("lead_ids_file", help="File with one lead ID per line")
+    parser.add_argument("output", help="JSONL file receiving one result per lead")
+    parser.add_argument("--product-file",
+                        help="JSON file with the product brief (default: product_info from inputs.yaml)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--leads-per-minute", type=float, default=0)
+    parser.add_argument("--videos-per-lead", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.product_file:
+        with open(args.product_file) as f:
+            product_info = json.load(f)
+    else:
+        import agentstack
+        product_info = agentstack.get_inputs()["product_info"]
+
+    campaign = Campaign(
+        product_info,
+        max_concurrency=args.concurrency,
+        leads_per_minute=args.leads_per_minute,
+        videos_per_lead=args.videos_per_lead
+    )
+    try:
+        summary = campaign.run(read_lead_ids(args.lead_ids_file), args.output)
+    finally:
+        campaign.pipeline.close()
+
+    print(json.dumps(summary, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
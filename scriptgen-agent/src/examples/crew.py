@@ -1,6 +1,5 @@
-from tools.script_generator import ScriptGenerator
-from tools.mongodb_client import MongoDBClient
-from tools.tiktok_analyzer import TikTokVideoAnalyzer
+from tools.rate_limiter import agent_max_rpm
+from tools.registry import get_tools
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 import agentstack
@@ -75,24 +74,29 @@ class TestCrew():
     def script_generator(self) -> Agent:
         return Agent(
             config=self.agents_config['script_generator'],
-            tools=[
-                TikTokVideoAnalyzer(),
-                MongoDBClient(),
-                ScriptGenerator()
-            ],
+            # Shared per process, so rebuilding the agent reuses the tools' pooled resources
+            tools=get_tools([
+                "tiktok_video_analyzer",
+                "mongodb_client",
+                "script_generator"
+            ]),
             verbose=True,
         )
 
     @crew
     def crew(self) -> Crew:
         """Creates the Test crew"""
+        manager = self.manager()
         # Filter out the manager from the agents list
         agents_without_manager = [
-            a for a in self.agents if a.role != self.manager().role]
+            a for a in self.agents if a.role != manager.role]
         return Crew(
             agents=agents_without_manager,
             tasks=self.tasks,
             process=Process.hierarchical,
-            manager_agent=self.manager(),
+            manager_agent=manager,
+            # CrewAI counts the agents' requests apart from the tools' limiter, so the
+            # agents get a share of the quota and the tools' limiter keeps the rest
+            max_rpm=agent_max_rpm(self.agents_config['manager'].get('llm', 'gpt-4o')),
             verbose=True,
         )
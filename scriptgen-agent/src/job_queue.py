@@ -0,0 +1,239 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Job states: queued -> running -> done | failed (or back to queued for a retry)
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+class SQLiteJobQueue:
+    """Durable job queue on SQLite, shared by any number of worker processes.
+
+    Jobs are claimed in FIFO order inside an IMMEDIATE transaction, so two
+    workers never claim the same job. Each claim takes a lease; a job whose
+    lease expires without a result (its worker crashed or was killed) is put
+    back in the queue by requeue_expired.
+
+    ``attempts`` counts claims and only ever grows: it fences each claim, so
+    a stale attempt can never settle the job. ``charged_attempts`` counts the
+    attempts held against ``max_attempts``; a released claim is refunded there.
+    """
+
+    def __init__(self, path: str):
+        """Open the queue, creating the database file if needed.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'queued', result TEXT, error TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL DEFAULT 1, "
+            "worker_id TEXT, created_at REAL NOT NULL, started_at REAL, "
+            "finished_at REAL, lease_expires_at REAL, "
+            "charged_attempts INTEGER NOT NULL DEFAULT 0)")
+        self._add_charged_attempts()
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status_id ON jobs (status, id)")
+
+    def _add_charged_attempts(self) -> None:
+        """Add the charged_attempts column to a queue created without it."""
+        # Other workers may open the same old queue at once, so check inside the write lock
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "charged_attempts" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE jobs ADD COLUMN charged_attempts INTEGER NOT NULL DEFAULT 0")
+                # Older queues charged every claim
+                self._conn.execute("UPDATE jobs SET charged_attempts = attempts")
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, payload: Dict[str, Any], max_attempts: int = 1) -> int:
+        """Add a job to the queue.
+
+        Args:
+            payload: JSON-serializable job input
+            max_attempts: Times the job is tried before it is marked failed
+
+        Returns:
+            The job ID
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (payload, max_attempts, created_at) VALUES (?, ?, ?)",
+                (json.dumps(payload), max_attempts, time.time()))
+            return cursor.lastrowid
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Claim the oldest queued job.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            lease_seconds: How long the claim holds before the job may be requeued
+
+        Returns:
+            The claimed job, or None if the queue is empty
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    "charged_attempts = charged_attempts + 1, worker_id = ?, started_at = ?, lease_expires_at = ? WHERE id = ?",
+                    (worker_id, now, now + lease_seconds, row["id"]))
+                job = self._conn.execute(
+                    "SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._to_dict(job)
+
+    def complete(self, job_id: int, attempt: int, result: Any) -> bool:
+        """Store the result of a running job.
+
+        Args:
+            job_id: The job ID
+            attempt: The attempt number returned by claim; results of an
+                attempt that was already timed out or requeued are dropped
+            result: JSON-serializable result
+
+        Returns:
+            True if the result was stored (never once the queue is closed)
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?, "
+                "lease_expires_at = NULL WHERE id = ? AND status = 'running' AND attempts = ?",
+                (json.dumps(result, default=str), time.time(), job_id, attempt))
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: int, attempt: int, error: str) -> Optional[str]:
+        """Record a failed attempt, requeueing the job if it has attempts left.
+
+        Args:
+            job_id: The job ID
+            attempt: The attempt number returned by claim
+            error: Error message
+
+        Returns:
+            The job's new status ("queued" or "failed"), or None if the attempt
+            was no longer current or the queue is closed
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN charged_attempts < max_attempts "
+                "THEN 'queued' ELSE 'failed' END, error = ?, finished_at = ?, "
+                "lease_expires_at = NULL WHERE id = ? AND status = 'running' AND attempts = ?",
+                (error, time.time(), job_id, attempt))
+            if cursor.rowcount != 1:
+                return None
+            return self._conn.execute(
+                "SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()["status"]
+
+    def release(self, job_id: int, attempt: int) -> bool:
+        """Put a running job back in the queue without charging the attempt.
+
+        The attempt number stays used, so the released attempt can no longer
+        settle the job even after it is claimed again.
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', charged_attempts = charged_attempts - 1, "
+                "worker_id = NULL, "
+                "lease_expires_at = NULL WHERE id = ? AND status = 'running' AND attempts = ?",
+                (job_id, attempt))
+            return cursor.rowcount == 1
+
+    def requeue_expired(self) -> int:
+        """Requeue running jobs whose lease has expired.
+
+        The expired attempt counts, so a job that keeps crashing its worker is
+        eventually marked failed instead of being retried forever.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN charged_attempts < max_attempts "
+                "THEN 'queued' ELSE 'failed' END, error = 'Lease expired', worker_id = NULL, "
+                "lease_expires_at = NULL WHERE status = 'running' AND lease_expires_at < ?",
+                (time.time(),))
+            return cursor.rowcount
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Return a job with its payload and result decoded, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return the most recent jobs, optionally filtered by status."""
+        query = "SELECT * FROM jobs"
+        params: List[Any] = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def close(self) -> None:
+        """Close the database connection.
+
+        Job threads abandoned by an aborted worker may still settle their jobs;
+        complete, fail and release become no-ops once the queue is closed.
+        """
+        with self._lock:
+            self._closed = True
+            self._conn.close()
@@ -1,18 +1,63 @@
 #!/usr/bin/env python
+import os
 import sys
-from crew import TestCrew
-import agentstack
-import agentops
 
-agentops.init(default_tags=agentstack.get_tags())
+# The crew, tools and telemetry are imported inside the subcommands that use
+# them, so picking a subcommand (or printing --help) does not pay for all of them
+
+TELEMETRY_ENABLED_VALUES = ("1", "true", "yes", "on")
+
+
+def _init_telemetry():
+    """Start AgentOps tracing if SCRIPTGEN_TELEMETRY is set; tracing is off by default."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if os.environ.get("SCRIPTGEN_TELEMETRY", "").strip().lower() not in TELEMETRY_ENABLED_VALUES:
+        return
+    import agentstack
+    import agentops
+    agentops.init(default_tags=agentstack.get_tags())
+
+
+def _crew():
+    """Build the crew for a subcommand, starting telemetry first if enabled."""
+    _init_telemetry()
+    from crew import TestCrew
+    return TestCrew().crew()
+
+
+def _inputs():
+    import agentstack
+    return agentstack.get_inputs()
 
-instance = TestCrew().crew()
 
 def run():
     """
     Run the agent.
     """
-    instance.kickoff(inputs=agentstack.get_inputs())
+    crew = _crew()
+    from tools.tracing import span
+    with span("crew.kickoff"):
+        crew.kickoff(inputs=_inputs())
+
+
+def pipeline():
+    """
+    Generate script concepts for one lead as a fixed pipeline, without the manager agent.
+    """
+    _init_telemetry()
+    from pipeline import main as run_pipeline
+    run_pipeline(sys.argv[1:])
+
+
+def worker():
+    """
+    Run the resident worker, or enqueue and inspect its jobs.
+    """
+    _init_telemetry()
+    from worker import main as run_worker
+    run_worker(sys.argv[1:])
 
 
 def train():
@@ -20,10 +65,10 @@ def train():
     Train the crew for a given number of iterations.
     """
     try:
-        instance.train(
+        _crew().train(
             n_iterations=int(sys.argv[1]), 
             filename=sys.argv[2], 
-            inputs=agentstack.get_inputs(), 
+            inputs=_inputs(), 
         )
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
@@ -34,24 +79,81 @@ def replay():
     Replay the crew execution from a specific task.
     """
     try:
-        instance.replay(task_id=sys.argv[1])
+        _crew().replay(task_id=sys.argv[1])
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
 
 
+def campaign():
+    """
+    Generate script concepts for a list of leads and one product brief.
+    """
+    _init_telemetry()
+    from campaign import main as run_campaign
+    run_campaign(sys.argv[1:])
+
+
+def report():
+    """
+    Summarize per-stage latency, bytes and tokens from a trace file.
+    """
+    from trace_report import main as run_report
+    run_report(sys.argv[1:])
+
+
 def test():
     """
     Test the crew execution and returns the results.
     """
     try:
-        instance.test(
+        _crew().test(
             n_iterations=int(sys.argv[1]), 
             openai_model_name=sys.argv[2], 
-            inputs=agentstack.get_inputs(), 
+            inputs=_inputs(), 
         )
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
 
 
+COMMANDS = {
+    "run": run,
+    "pipeline": pipeline,
+    "campaign": campaign,
+    "worker": worker,
+    "report": report,
+    "train": train,
+    "replay": replay,
+    "test": test
+}
+
+
+def usage():
+    """
+    Return the command-line help text.
+    """
+    lines = ["usage: main.py [command] [args...]", "", "commands (default: run):"]
+    for name, command in COMMANDS.items():
+        lines.append(f"  {name:<10}{command.__doc__.strip().splitlines()[0]}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Dispatch to a subcommand, passing it the remaining arguments in sys.argv.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        return run()
+    if argv[0] in ("-h", "--help"):
+        print(usage())
+        return None
+    if argv[0] not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        sys.exit(2)
+
+    sys.argv = [sys.argv[0]] + argv[1:]
+    return COMMANDS[argv[0]]()
+
+
 if __name__ == '__main__':
-    run()
\ No newline at end of file
+    main()
\ No newline at end of file
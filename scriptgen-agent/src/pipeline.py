@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+from tools import MongoDBClient, ScriptGenerator, TikTokVideoAnalyzer
+from tools.script_generator import product_requirements_from_info
+from tools.tracing import current_span, traced
+
+# Load environment variables
+load_dotenv()
+
+# Lead fields the script prompt reads averages from, per aggregated metric
+METRIC_LEAD_FIELDS = {
+    "avg_views": "averageViews",
+    "avg_likes": "averageLikes",
+    "avg_comments": "averageComments",
+    "avg_shares": "averageShares"
+}
+
+
+def lead_with_metrics(lead: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a lead with its average fields replaced by computed metrics.
+
+    Args:
+        lead: Lead document as returned by MongoDBClient.fetch_lead or fetch_leads
+        metrics: performance_metrics from MongoDBClient.fetch_video_stats
+
+    Returns:
+        The lead with averageViews, averageLikes, averageComments and averageShares
+        taken from the metrics where they are known
+    """
+    lead = dict(lead)
+    for metric, field in METRIC_LEAD_FIELDS.items():
+        if metrics.get(metric) is not None:
+            lead[field] = round(metrics[metric])
+    return lead
+
+
+class ScriptPipeline:
+    """Generates script concepts for a lead without the hierarchical crew.
+
+    The MongoDB fetch, video analysis and script generation run as fixed
+    steps, so the only LLM calls are the vision and generation requests
+    themselves, with no manager, triage or fact-checking turns in between.
+    """
+
+    def __init__(self,
+                 product_info: Dict[str, Any],
+                 videos_per_lead: int = 3,
+                 num_screenshots: int = 5,
+                 mongodb_client: Optional[MongoDBClient] = None,
+                 video_analyzer: Optional[TikTokVideoAnalyzer] = None,
+                 script_generator: Optional[ScriptGenerator] = None):
+        """Initialize the pipeline.
+
+        Args:
+            product_info: Product brief in the inputs.yaml format
+            videos_per_lead: Number of top videos analyzed per lead
+            num_screenshots: Number of screenshots captured per video
+            mongodb_client: MongoDB tool to use (default: a new MongoDBClient)
+            video_analyzer: Video analyzer to use (default: one with a driver pool
+                sized for videos_per_lead, so a lead's videos are analyzed in parallel)
+            script_generator: Script generator to use (default: a new ScriptGenerator)
+        """
+        self.product_requirements = product_requirements_from_info(product_info)
+        self.videos_per_lead = videos_per_lead
+        self.num_screenshots = num_screenshots
+        self.mongodb_client = mongodb_client or MongoDBClient()
+        self.video_analyzer = video_analyzer or TikTokVideoAnalyzer(pool_size=videos_per_lead)
+        self.script_generator = script_generator or ScriptGenerator()
+
+    @traced("pipeline.lead")
+    def process_lead(self,
+                     lead: Dict[str, Any],
+                     product_requirements: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Analyze a fetched lead's top videos and generate script concepts for it.
+
+        Args:
+            lead: Lead document as returned by MongoDBClient.fetch_lead or fetch_leads
+            product_requirements: Product requirements overriding the pipeline's
+                (see product_requirements_from_info)
+
+        Returns:
+            Dictionary with the lead ID, script concepts, performance metrics and
+            per-step timings, or an "error" key if every video analysis or the
+            script generation failed
+        """
+        start = time.monotonic()
+
+        lead_data = self.mongodb_client.fetch_video_stats(lead, top_k=self.videos_per_lead)
+        videos = lead_data["high_performing_videos"]
+        fetched = time.monotonic()
+
+        video_urls = [video["webVideoUrl"] for video in videos if video.get("webVideoUrl")]
+        video_analyses: List[str] = []
+        videos_failed = 0
+        if video_urls:
+            analysis = self.video_analyzer.analyze_videos(
+                video_urls, self.num_screenshots, max_workers=len(video_urls))
+            for result in analysis["results"]:
+                # A failed capture or vision call leaves no usable analysis
+                if "error" in result or "analysis_error" in result:
+                    videos_failed += 1
+                    continue
+                video_analyses.extend(result.get("screenshot_analyses", []))
+        analyzed = time.monotonic()
+        current_span().set(lead_id=lead["id"], videos=len(video_urls), videos_failed=videos_failed)
+
+        result = {
+            "lead_id": lead["id"],
+            "performance_metrics": lead_data["performance_metrics"],
+            "videos_analyzed": len(video_urls) - videos_failed,
+            "videos_failed": videos_failed,
+            "timings": {
+                "fetch_seconds": round(fetched - start, 3),
+                "analysis_seconds": round(analyzed - fetched, 3)
+            }
+        }
+        if video_urls and videos_failed == len(video_urls):
+            # Concepts generated without any analysis would not reflect the creator's videos
+            result["error"] = f"All {videos_failed} video analyses failed"
+            result["elapsed_seconds"] = round(analyzed - start, 3)
+            return result
+
+        # Prompt with the averages computed over the lead's videos, not the stored ones
+        script_concepts = self.script_generator.generate(
+            lead_with_metrics(lead, lead_data["performance_metrics"]),
+            videos,
+            video_analyses,
+            product_requirements or self.product_requirements
+        )
+        generated = time.monotonic()
+        result["timings"]["generation_seconds"] = round(generated - analyzed, 3)
+        result["elapsed_seconds"] = round(generated - start, 3)
+
+        # The generator reports failures as a single concept carrying an "error" key
+        generation_error = next(
+            (concept["error"] for concept in script_concepts if "error" in concept), None)
+        if generation_error is not None:
+            result["error"] = f"Script generation failed: {generation_error}"
+            return result
+
+        result["script_concepts"] = script_concepts
+        return result
+
+    @traced("pipeline.run")
+    def run(self,
+            lead_id: str,
+            collection: str = "leads",
+            product_requirements: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch a lead by ID and generate script concepts for it.
+
+        Args:
+            lead_id: The lead's _id
+            collection: The leads collection
+            product_requirements: Product requirements overriding the pipeline's
+
+        Returns:
+            The process_lead result, or an "error" key if the lead does not exist
+            or could not be processed
+        """
+        start = time.monotonic()
+        lead = self.mongodb_client.fetch_lead(lead_id, collection)
+        if lead is None:
+            return {"lead_id": lead_id, "error": f"Lead {lead_id} not found"}
+
+        result = self.process_lead(lead, product_requirements)
+        result["elapsed_seconds"] = round(time.monotonic() - start, 3)
+        return result
+
+    def close(self) -> None:
+        """Release the analyzer's browser sessions and the tools' caches."""
+        self.video_analyzer.close()
+        self.script_generator.close()
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the pipeline for one lead from the command line and print the result."""
+    parser = argparse.ArgumentParser(
+        description="Generate script concepts for one lead without the hierarchical crew.")
+    parser.add_argument("lead_id", nargs="?",
+                        help="Lead _id (default: lead_data.id from inputs.yaml)")
+    parser.add_argument("--product-file",
+                        help="JSON file with the product brief (default: product_info from inputs.yaml)")
+    parser.add_argument("--videos-per-lead", type=int, default=3)
+    parser.add_argument("--num-screenshots", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    inputs: Dict[str, Any] = {}
+    if not args.lead_id or not args.product_file:
+        import agentstack
+        inputs = agentstack.get_inputs()
+
+    if args.product_file:
+        with open(args.product_file) as f:
+            product_info = json.load(f)
+    else:
+        product_info = inputs["product_info"]
+
+    pipeline = ScriptPipeline(
+        product_info,
+        videos_per_lead=args.videos_per_lead,
+        num_screenshots=args.num_screenshots
+    )
+    try:
+        result = pipeline.run(args.lead_id or inputs["lead_data"]["id"])
+    finally:
+        pipeline.close()
+
+    print(json.dumps(result, indent=2, default=str))
+    return result
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
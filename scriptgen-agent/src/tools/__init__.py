@@ -1,6 +1,27 @@
-from .tiktok_analyzer import TikTokVideoAnalyzer
-from .mongodb_client import MongoDBClient
-from .script_generator import ScriptGenerator
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Tools are imported on first access, so importing the package (or a light
+# submodule such as tools.cache) does not pull in LangChain, Selenium or PIL
+_TOOL_MODULES = {
+    "TikTokVideoAnalyzer": ".tiktok_analyzer",
+    "MongoDBClient": ".mongodb_client",
+    "ScriptGenerator": ".script_generator"
+}
+
+if TYPE_CHECKING:
+    from .tiktok_analyzer import TikTokVideoAnalyzer
+    from .mongodb_client import MongoDBClient
+    from .script_generator import ScriptGenerator
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _TOOL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_TOOL_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "TikTokVideoAnalyzer",
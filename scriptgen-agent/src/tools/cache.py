@@ -0,0 +1,128 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts.
+
+    Dictionaries are serialized with sorted keys, so logically equal inputs map
+    to the same key regardless of ordering.
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding of the parts
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """Persistent key/value cache on SQLite with TTL and LRU size bounds.
+
+    Values are stored as JSON. Entries older than ``ttl_seconds`` are treated
+    as misses, and once more than ``max_entries`` are stored the least
+    recently used ones are evicted.
+    """
+
+    def __init__(self,
+                 path: str,
+                 ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 10000):
+        """Initialize the cache, creating the database file if needed.
+
+        Args:
+            path: Path of the SQLite database file
+            ttl_seconds: Lifetime of an entry in seconds (None disables expiry)
+            max_entries: Maximum number of entries kept (0 disables the bound)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss or expired entry."""
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._stats["misses"] += 1
+                self._stats["evictions"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._stats["hits"] += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value, evicting least recently used entries."""
+        now = time.time()
+        encoded = json.dumps(value)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)", (key, encoded, now, now))
+            self._stats["writes"] += 1
+
+            if self.max_entries:
+                excess = self._conn.execute(
+                    "SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM cache WHERE key IN ("
+                        "SELECT key FROM cache ORDER BY accessed_at LIMIT ?)", (excess,))
+                    self._stats["evictions"] += excess
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._conn.execute(
+                "SELECT COUNT(*) FROM cache").fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,153 @@
+import os
+from typing import Any, Dict, List, Optional
+
+from .frame_extractor import MOBILE_USER_AGENT
+
+# "lean" trims caches, trackers and fonts a frame capture does not need; "full" is a stock headless Chrome
+CHROME_PROFILES = ("lean", "full")
+
+BASE_ARGUMENTS = [
+    "--headless",
+    "--no-sandbox",
+    "--mute-audio",
+    "--window-size=393,852",  # Mobile size for TikTok
+    f"user-agent={MOBILE_USER_AGENT}"
+]
+
+# Requests the lean profile blocks through the DevTools protocol: fonts, and ad,
+# analytics and telemetry hosts. Images still load, since sleep captures
+# screenshot the whole page, as do the page's own scripts and the video.
+BLOCKED_URL_PATTERNS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*doubleclick.net*", "*googlesyndication.com*", "*google-analytics.com*",
+    "*googletagmanager.com*", "*connect.facebook.net*", "*analytics.tiktok.com*",
+    "*mon.tiktokv.com*", "*mcs.tiktokv.com*", "*log.tiktokv.com*"
+]
+
+# Background work a capture session never needs
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--aggressive-cache-discard",
+    "--disk-cache-size=1048576",
+    "--renderer-process-limit=2"
+]
+
+# Free space /dev/shm needs for Chrome to use it instead of /tmp
+MIN_DEV_SHM_BYTES = 512 * 1024 * 1024
+
+
+def dev_shm_usable(min_bytes: int = MIN_DEV_SHM_BYTES) -> bool:
+    """Return whether /dev/shm has room for Chrome's shared memory.
+
+    Docker gives containers a 64 MB /dev/shm, on which Chrome crashes, which is
+    why --disable-dev-shm-usage is common; it moves shared memory to /tmp on
+    disk, so it is only worth paying where /dev/shm is too small.
+    """
+    try:
+        stats = os.statvfs("/dev/shm")
+    except OSError:
+        return False
+    return stats.f_bavail * stats.f_frsize >= min_bytes
+
+
+def chrome_arguments(profile: str = "full", js_heap_mb: int = 512) -> List[str]:
+    """Return the Chrome command-line arguments of a capture profile.
+
+    Args:
+        profile: "lean" or "full"
+        js_heap_mb: V8 heap cap per renderer in the lean profile, in megabytes (0 disables)
+
+    Returns:
+        Chrome arguments
+    """
+    if profile not in CHROME_PROFILES:
+        raise ValueError(f"Unknown Chrome profile: {profile}")
+
+    if profile == "full":
+        return BASE_ARGUMENTS + ["--disable-dev-shm-usage"]
+
+    arguments = BASE_ARGUMENTS + LEAN_ARGUMENTS
+    if not dev_shm_usable():
+        arguments.append("--disable-dev-shm-usage")
+    if js_heap_mb:
+        arguments.append(f"--js-flags=--max-old-space-size={js_heap_mb}")
+    return arguments
+
+
+def page_load_strategy(profile: str) -> str:
+    """Return the WebDriver page load strategy of a capture profile.
+
+    The lean profile returns from driver.get() at DOMContentLoaded ("eager");
+    the capture waits for the <video> element itself, so nothing else on the
+    page needs to finish loading.
+    """
+    return "eager" if profile == "lean" else "normal"
+
+
+def block_urls(driver: Any, patterns: List[str]) -> None:
+    """Block requests matching URL patterns for the lifetime of a Chrome session.
+
+    Args:
+        driver: The Chrome webdriver
+        patterns: URL patterns with * wildcards
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """Return the resident memory of a process and all its descendants, in bytes.
+
+    Reads /proc, so it works on Linux only; Chrome's browser, GPU and renderer
+    processes are all descendants of chromedriver. Pages shared between the
+    processes are counted once per process, so the total is an upper bound.
+
+    Args:
+        pid: Root process ID
+
+    Returns:
+        Total RSS in bytes, or None if /proc is unavailable
+    """
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The parent PID follows the parenthesized command name
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        pending.extend(children.get(current, []))
+    return total
+
+
+def driver_rss(driver: Any) -> Optional[int]:
+    """Return the resident memory of a webdriver session (chromedriver and Chrome), in bytes."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return None
+    return process_tree_rss(process.pid)
@@ -0,0 +1,268 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class DriverLease:
+    """A single lease of a pooled WebDriver session."""
+
+    def __init__(self, driver: Any, wait_seconds: float, use_count: int):
+        """Initialize the lease.
+
+        Args:
+            driver: The leased webdriver
+            wait_seconds: Time spent waiting for the lease
+            use_count: How many times the session has been leased, including this one
+        """
+        self.driver = driver
+        self.wait_seconds = wait_seconds
+        self.use_count = use_count
+        self.healthy = True
+
+    def mark_broken(self) -> None:
+        """Flag the session so it is discarded instead of returned to the pool."""
+        self.healthy = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return lease metrics suitable for result metadata."""
+        return {
+            "lease_wait_seconds": round(self.wait_seconds, 4),
+            "session_uses": self.use_count,
+            "session_reused": self.use_count > 1
+        }
+
+
+class _PooledSession:
+    """Bookkeeping for one live WebDriver session."""
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.leased_at: Optional[float] = None
+        self.quit = False
+
+
+class DriverPool:
+    """Bounded pool of warm WebDriver sessions.
+
+    Sessions are created lazily by ``factory`` up to ``max_size``, health-checked
+    before each lease, and recycled after ``max_uses`` leases or when they crash.
+    All sessions are shut down at process exit.
+    """
+
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 max_size: int = 2,
+                 max_uses: int = 50,
+                 lease_timeout: float = 120.0):
+        """Initialize the pool.
+
+        Args:
+            factory: Callable that starts a new webdriver session
+            max_size: Maximum number of concurrent sessions
+            max_uses: Number of leases after which a session is recycled (0 disables)
+            lease_timeout: Seconds to wait for a free session before giving up
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self._factory = factory
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+
+        self._idle: List[_PooledSession] = []
+        self._leased: List[_PooledSession] = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "leases": 0,
+            "reused_leases": 0,
+            "sessions_created": 0,
+            "sessions_recycled": 0,
+            "sessions_discarded": 0,
+            "sessions_killed": 0,
+            "total_lease_wait_seconds": 0.0,
+            "max_lease_wait_seconds": 0.0
+        }
+
+        atexit.register(self.close)
+
+    def _quit(self, session: _PooledSession) -> None:
+        """Shut down a session, ignoring errors from an already-dead browser."""
+        if session.quit:
+            return
+        session.quit = True
+        try:
+            session.driver.quit()
+        except Exception as e:
+            print(f"Error shutting down webdriver session: {str(e)}")
+
+    def _is_healthy(self, session: _PooledSession) -> bool:
+        """Check that the browser behind a session still responds."""
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _retire(self, session: _PooledSession, stat: str) -> None:
+        """Quit a session and free its slot in the pool."""
+        self._quit(session)
+        with self._cond:
+            self._live -= 1
+            self._stats[stat] += 1
+            self._cond.notify()
+
+    def _acquire(self) -> _PooledSession:
+        """Take an idle session or start a new one, waiting for a free slot."""
+        deadline = time.monotonic() + self.lease_timeout
+
+        while True:
+            session = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    if self._idle:
+                        session = self._idle.pop()
+                        break
+                    if self._live < self.max_size:
+                        self._live += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No webdriver session available after {self.lease_timeout}s")
+                    self._cond.wait(remaining)
+
+            if session is None:
+                try:
+                    session = _PooledSession(self._factory())
+                except Exception:
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats["sessions_created"] += 1
+                return session
+
+            if self._is_healthy(session):
+                return session
+
+            # Idle session died (e.g. Chrome crashed); replace it
+            self._retire(session, "sessions_discarded")
+
+    def _release(self, session: _PooledSession, healthy: bool) -> None:
+        """Return a session to the pool, or retire it if broken or worn out."""
+        with self._cond:
+            self._leased.remove(session)
+            session.leased_at = None
+
+        if not healthy or session.quit:
+            self._retire(session, "sessions_discarded")
+            return
+
+        if self.max_uses and session.uses >= self.max_uses:
+            self._retire(session, "sessions_recycled")
+            return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append(session)
+                self._cond.notify()
+                return
+
+        self._retire(session, "sessions_recycled")
+
+    @contextmanager
+    def lease(self) -> Iterator[DriverLease]:
+        """Lease a warm session for the duration of a ``with`` block.
+
+        Yields:
+            A DriverLease wrapping the webdriver and its lease metrics
+        """
+        start = time.monotonic()
+        session = self._acquire()
+        wait_seconds = time.monotonic() - start
+        session.uses += 1
+
+        with self._cond:
+            session.leased_at = time.monotonic()
+            self._leased.append(session)
+            self._stats["leases"] += 1
+            if session.uses > 1:
+                self._stats["reused_leases"] += 1
+            self._stats["total_lease_wait_seconds"] += wait_seconds
+            self._stats["max_lease_wait_seconds"] = max(
+                self._stats["max_lease_wait_seconds"], wait_seconds)
+
+        lease = DriverLease(session.driver, wait_seconds, session.uses)
+        try:
+            yield lease
+        except Exception:
+            lease.mark_broken()
+            raise
+        finally:
+            self._release(session, lease.healthy)
+
+    def quit_stuck_sessions(self, max_lease_seconds: float) -> int:
+        """Shut down sessions leased for longer than ``max_lease_seconds``.
+
+        A browser hung on a page blocks its lease holder indefinitely. Quitting
+        it from another thread makes the holder's pending WebDriver call fail,
+        so the lease is released and the session discarded.
+
+        Args:
+            max_lease_seconds: Lease age beyond which a session counts as stuck
+
+        Returns:
+            Number of sessions shut down
+        """
+        now = time.monotonic()
+        with self._cond:
+            stuck = [session for session in self._leased
+                     if not session.quit and now - session.leased_at > max_lease_seconds]
+            self._stats["sessions_killed"] += len(stuck)
+
+        for session in stuck:
+            self._quit(session)
+        return len(stuck)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool counters, including average lease wait time."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["live_sessions"] = self._live
+            stats["idle_sessions"] = len(self._idle)
+            stats["leased_sessions"] = len(self._leased)
+        stats["avg_lease_wait_seconds"] = (
+            stats["total_lease_wait_seconds"] / stats["leases"] if stats["leases"] else 0.0)
+        return stats
+
+    def close(self) -> None:
+        """Shut down all idle sessions and refuse new leases.
+
+        Sessions still leased are shut down when they are released.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        # Drop the exit hook so a closed pool can be garbage collected
+        atexit.unregister(self.close)
+
+        for session in idle:
+            self._retire(session, "sessions_recycled")
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
@@ -0,0 +1,68 @@
+import io
+from typing import Any, Dict, List, Tuple
+
+
+def dhash(image_bytes: bytes, hash_size: int = 8) -> int:
+    """Compute the difference hash of an image.
+
+    The image is reduced to a (hash_size + 1) x hash_size grayscale thumbnail
+    and each bit records whether a pixel is brighter than its right neighbour,
+    so near-identical frames get hashes a few bits apart.
+
+    Args:
+        image_bytes: Encoded image (PNG, JPEG, ...)
+        hash_size: Hash width and height; the hash has hash_size ** 2 bits
+
+    Returns:
+        The hash as an integer
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        pixels = list(image.convert("L").resize(
+            (hash_size + 1, hash_size), Image.BILINEAR).getdata())
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def dedupe_frames(frames: List[bytes],
+                  max_distance: int = 5) -> Tuple[List[int], List[Dict[str, Any]]]:
+    """Drop frames that look nearly the same as an earlier kept frame.
+
+    Args:
+        frames: Encoded frames in capture order
+        max_distance: Frames whose hash is within this many bits of a kept
+            frame are treated as duplicates
+
+    Returns:
+        Indices of the kept frames, and one record per skipped frame with its
+        index, the index of the kept frame it duplicates, and the hash distance
+    """
+    kept: List[Tuple[int, int]] = []
+    skipped = []
+
+    for index, frame in enumerate(frames):
+        frame_hash = dhash(frame)
+        match = min(((hamming_distance(frame_hash, kept_hash), kept_index)
+                     for kept_index, kept_hash in kept), default=None)
+
+        if match is not None and match[0] <= max_distance:
+            skipped.append({
+                "index": index,
+                "duplicate_of": match[1],
+                "distance": match[0]
+            })
+        else:
+            kept.append((index, frame_hash))
+
+    return [index for index, _ in kept], skipped
@@ -0,0 +1,220 @@
+import html
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MOBILE_USER_AGENT = "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1"
+
+MEDIA_EXTENSIONS = (".mp4", ".m4v", ".mov", ".webm")
+
+# Media URL locations in a TikTok page, most reliable first
+MEDIA_URL_PATTERNS = [
+    re.compile(r'"playAddr"\s*:\s*"([^"]+)"'),
+    re.compile(r'"downloadAddr"\s*:\s*"([^"]+)"'),
+    re.compile(r'<video[^>]+src="([^"]+)"'),
+    re.compile(r'<source[^>]+src="([^"]+)"'),
+]
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _unescape(value: str) -> str:
+    """Undo the JSON (\\u002F) and HTML (&amp;) escaping of URLs embedded in a page."""
+    try:
+        value = json.loads(f'"{value}"')
+    except ValueError:
+        pass
+    return html.unescape(value)
+
+
+class DirectCaptureError(Exception):
+    """Raised when a video cannot be captured without a browser."""
+
+
+def get_http_session(pool_size: int = 10) -> requests.Session:
+    """Return the process-wide pooled HTTP session used for media downloads.
+
+    Args:
+        pool_size: Maximum number of keep-alive connections per host
+
+    Returns:
+        A shared requests session
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size,
+                                  pool_maxsize=pool_size, max_retries=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": MOBILE_USER_AGENT})
+            _session = session
+        return _session
+
+
+class DirectFrameExtractor:
+    """Capture video frames by downloading the media file and decoding it locally.
+
+    The media URL is resolved once from the video page, the file is downloaded
+    through a pooled requests session, and frames are decoded with ffmpeg at
+    exact timestamps, without starting a browser.
+    """
+
+    def __init__(self,
+                 work_dir: Path,
+                 ffmpeg_path: str = "ffmpeg",
+                 ffprobe_path: str = "ffprobe",
+                 timeout: float = 30.0):
+        """Initialize the extractor.
+
+        Args:
+            work_dir: Directory for temporary media downloads
+            ffmpeg_path: Path to the ffmpeg binary
+            ffprobe_path: Path to the ffprobe binary
+            timeout: Timeout in seconds for each HTTP request and decoder run
+        """
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
+        self.timeout = timeout
+
+    def resolve_media_url(self, video_url: str) -> str:
+        """Resolve the URL of the media file behind a video page.
+
+        URLs that already point at a media file are returned unchanged.
+
+        Args:
+            video_url: The URL of the TikTok video page or media file
+
+        Returns:
+            The media file URL
+        """
+        if urlparse(video_url).path.lower().endswith(MEDIA_EXTENSIONS):
+            return video_url
+
+        try:
+            response = get_http_session().get(video_url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise DirectCaptureError(f"Failed to fetch video page: {str(e)}")
+
+        for pattern in MEDIA_URL_PATTERNS:
+            match = pattern.search(response.text)
+            if match:
+                return requests.compat.urljoin(video_url, _unescape(match.group(1)))
+
+        raise DirectCaptureError("No media URL found in video page")
+
+    def download(self, media_url: str, referer: Optional[str] = None) -> Path:
+        """Download a media file to a temporary path in the work directory.
+
+        Args:
+            media_url: The media file URL
+            referer: Page URL sent as Referer, which TikTok's CDN requires
+
+        Returns:
+            Path of the downloaded file; the caller is responsible for removing it
+        """
+        headers = {"Referer": referer} if referer else {}
+        fd, path = tempfile.mkstemp(suffix=".mp4", dir=self.work_dir)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with get_http_session().get(media_url, headers=headers,
+                                            stream=True, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(chunk_size=256 * 1024):
+                        f.write(chunk)
+        except (requests.RequestException, OSError) as e:
+            os.unlink(path)
+            raise DirectCaptureError(f"Failed to download media: {str(e)}")
+
+        return Path(path)
+
+    def probe_duration(self, media_path: Path) -> float:
+        """Return the duration of a media file in seconds, or 0 if unknown."""
+        try:
+            output = subprocess.run(
+                [self.ffprobe_path, "-v", "error",
+                 "-show_entries", "format=duration",
+                 "-of", "default=noprint_wrappers=1:nokey=1",
+                 str(media_path)],
+                capture_output=True, check=True, timeout=self.timeout
+            ).stdout
+            return float(output.strip() or 0)
+        except (OSError, ValueError, subprocess.SubprocessError):
+            return 0
+
+    def extract_frame(self, media_path: Path, timestamp: float) -> bytes:
+        """Decode a single frame at an exact timestamp.
+
+        Args:
+            media_path: Path of the media file
+            timestamp: Position of the frame, in seconds
+
+        Returns:
+            PNG bytes of the frame
+        """
+        try:
+            frame = subprocess.run(
+                [self.ffmpeg_path, "-v", "error",
+                 "-ss", f"{timestamp:.3f}", "-i", str(media_path),
+                 "-frames:v", "1", "-f", "image2pipe", "-c:v", "png", "-"],
+                capture_output=True, check=True, timeout=self.timeout
+            ).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            raise DirectCaptureError(f"Failed to decode frame at {timestamp:.3f}s: {str(e)}")
+
+        if not frame:
+            raise DirectCaptureError(f"No frame decoded at {timestamp:.3f}s")
+        return frame
+
+    def capture(self,
+                video_url: str,
+                timestamps_for: Callable[[float], List[float]],
+                media_url: Optional[str] = None,
+                stats: Optional[Dict[str, Any]] = None) -> List[bytes]:
+        """Download a video and decode frames from it.
+
+        Args:
+            video_url: The URL of the TikTok video
+            timestamps_for: Callable mapping the video duration to frame timestamps
+            media_url: Media file URL, skipping page resolution when given
+            stats: Optional dictionary filled with download metadata
+
+        Returns:
+            List of PNG frames, one per timestamp
+        """
+        media_url = media_url or self.resolve_media_url(video_url)
+        media_path = self.download(media_url, referer=video_url)
+
+        try:
+            duration = self.probe_duration(media_path)
+            timestamps = timestamps_for(duration)
+            frames = [self.extract_frame(media_path, t) for t in timestamps]
+
+            if stats is not None:
+                stats.update({
+                    "media_url": media_url,
+                    "media_bytes": media_path.stat().st_size,
+                    "video_duration": duration,
+                    "timestamps": [round(t, 3) for t in timestamps]
+                })
+
+            return frames
+
+        finally:
+            media_path.unlink(missing_ok=True)
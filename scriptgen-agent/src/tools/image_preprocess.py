@@ -0,0 +1,57 @@
+import base64
+import io
+from typing import Tuple
+
+# Pillow format name and MIME type for each supported output format
+IMAGE_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+}
+
+
+def preprocess_image(image_bytes: bytes,
+                     max_edge: int = 768,
+                     image_format: str = "jpeg",
+                     quality: int = 80) -> Tuple[bytes, str]:
+    """Downscale and re-encode an image for upload to a vision model.
+
+    Args:
+        image_bytes: Encoded source image
+        max_edge: Maximum width or height in pixels (0 keeps the original size)
+        image_format: "jpeg", "webp" or "png"
+        quality: Encoder quality for lossy formats (1-100)
+
+    Returns:
+        The re-encoded image bytes and their MIME type
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    pil_format, mime_type = IMAGE_FORMATS[image_format]
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        source_mime_type = Image.MIME.get(image.format, mime_type)
+        resized = bool(max_edge) and max(image.size) > max_edge
+        if resized:
+            image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        if pil_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+
+        output = io.BytesIO()
+        if pil_format == "PNG":
+            image.save(output, format=pil_format, optimize=True)
+        else:
+            image.save(output, format=pil_format, quality=quality)
+
+    # Small or flat images can grow when re-encoded; send the original then
+    if not resized and output.tell() >= len(image_bytes):
+        return image_bytes, source_mime_type
+    return output.getvalue(), mime_type
+
+
+def to_data_url(image_bytes: bytes, mime_type: str) -> str:
+    """Encode image bytes as a base64 data URL."""
+    return f"data:{mime_type};base64,{base64.b64encode(image_bytes).decode('utf-8')}"
@@ -0,0 +1,456 @@
+import os
+import json
+import threading
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+from langchain.tools import BaseTool
+
+from .tracing import current_span, traced
+
+# pymongo is imported when the first client is created or lead ID converted
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+# pymongo.ASCENDING / pymongo.DESCENDING, without importing pymongo up front
+ASCENDING = 1
+DESCENDING = -1
+
+# Lead fields read by ScriptGenerator.generate
+LEAD_PROJECTION = {
+    "nickName": 1,
+    "bio": 1,
+    "totalFollowers": 1,
+    "totalEngagementRate": 1,
+    "averageViews": 1,
+    "averageLikes": 1,
+    "averageComments": 1,
+    "averageShares": 1,
+    "tags": 1
+}
+
+# Video fields read by ScriptGenerator._format_videos
+VIDEO_PROJECTION = {
+    "_id": 0,
+    "text": 1,
+    "playCount": 1,
+    "diggCount": 1,
+    "commentCount": 1,
+    "shareCount": 1,
+    "webVideoUrl": 1
+}
+
+# Sort field for each ranking of a lead's top videos
+RANK_FIELDS = {
+    "playCount": "playCount",
+    "diggCount": "diggCount",
+    "engagement": "engagementScore"
+}
+
+# Connection pool settings for the process-wide client
+POOL_OPTIONS = {
+    "maxPoolSize": 50,
+    "minPoolSize": 2,
+    "maxIdleTimeMS": 300000,
+    "waitQueueTimeoutMS": 10000,
+    "serverSelectionTimeoutMS": 5000,
+    "connectTimeoutMS": 5000,
+    "retryReads": True
+}
+
+_clients: Dict[str, "MongoClient"] = {}
+_clients_lock = threading.Lock()
+
+
+def get_mongo_client(mongodb_uri: str) -> "MongoClient":
+    """Return the process-wide MongoClient for a connection string.
+
+    MongoClient is thread-safe and owns a connection pool, so one instance is
+    shared by every tool and thread in the process.
+
+    Args:
+        mongodb_uri: MongoDB connection string
+
+    Returns:
+        The shared MongoClient
+    """
+    with _clients_lock:
+        client = _clients.get(mongodb_uri)
+        if client is None:
+            from pymongo import MongoClient
+            client = MongoClient(mongodb_uri, **POOL_OPTIONS)
+            _clients[mongodb_uri] = client
+        return client
+
+
+class MongoDBClient(BaseTool):
+    """Tool for fetching lead data and top-performing videos from MongoDB."""
+
+    name: str = "mongodb_client"
+    description: str = """
+    Fetches and processes lead data from MongoDB.
+    Input should be a JSON string containing:
+    - lead_id: The MongoDB ObjectId of the lead to fetch
+    - collection: The MongoDB collection to query (default: 'leads')
+    - top_k: Number of high-performing videos to return (default: 5)
+    - rank_by: "playCount", "diggCount" or "engagement" (default: 'playCount')
+    - query_mode: "aggregate" to compute metrics on the server or "find" (default: 'aggregate')
+    """
+    mongodb_uri: str = ""
+    database_name: str = ""
+    videos_collection: str = "videos"
+    video_lead_field: str = "leadId"
+    top_k: int = 5
+    rank_by: str = "playCount"
+    query_mode: str = "aggregate"
+    min_engagement_views: int = 1000
+    client: Optional[Any] = None
+
+    def __init__(self,
+                 mongodb_uri: Optional[str] = None,
+                 database_name: Optional[str] = None,
+                 videos_collection: str = "videos",
+                 video_lead_field: str = "leadId",
+                 top_k: int = 5,
+                 rank_by: str = "playCount",
+                 query_mode: str = "aggregate",
+                 min_engagement_views: int = 1000,
+                 client: Optional[Any] = None):
+        """Initialize the MongoDB client tool.
+
+        Args:
+            mongodb_uri: MongoDB connection string (default: the MONGODB_URI environment variable)
+            database_name: Database holding the leads (default: MONGODB_DATABASE, then
+                the database named in the connection string)
+            videos_collection: Collection holding one document per video
+            video_lead_field: Field of a video document referencing its lead's _id
+            top_k: Default number of high-performing videos to return
+            rank_by: Default ranking of top videos: "playCount", "diggCount" or
+                "engagement" ((likes + comments + shares) / views)
+            query_mode: "aggregate" to compute per-lead averages and top videos with an
+                aggregation pipeline, or "find" to read averages stored on the lead
+            min_engagement_views: Views a video needs to be ranked by engagement, so
+                barely watched videos with a few interactions do not outrank viral ones
+            client: A ready MongoClient (or mongomock client) to use instead of the shared one
+        """
+        super().__init__()
+        self.mongodb_uri = mongodb_uri or os.environ.get("MONGODB_URI", "")
+        self.database_name = database_name or os.environ.get("MONGODB_DATABASE", "")
+        self.videos_collection = videos_collection
+        self.video_lead_field = video_lead_field
+        self.top_k = top_k
+        self.rank_by = rank_by
+        self.query_mode = query_mode
+        self.min_engagement_views = min_engagement_views
+        self.client = client
+
+    def get_database(self) -> Any:
+        """Return the database handle, connecting through the shared pool."""
+        client = self.client
+        if client is None:
+            if not self.mongodb_uri:
+                raise ValueError("MongoDB connection string is required")
+            client = get_mongo_client(self.mongodb_uri)
+
+        if self.database_name:
+            return client[self.database_name]
+        return client.get_default_database()
+
+    @staticmethod
+    def _lead_key(lead_id: str) -> Any:
+        """Return the _id value for a lead ID, converting valid ObjectId strings."""
+        from bson import ObjectId
+        if isinstance(lead_id, str):
+            lead_id = lead_id.strip()
+        return ObjectId(lead_id) if ObjectId.is_valid(lead_id) else lead_id
+
+    @classmethod
+    def normalize_lead_id(cls, lead_id: str) -> str:
+        """Return a lead ID in the form fetched leads report it (lowercase hex for ObjectIds)."""
+        return str(cls._lead_key(lead_id))
+
+    def recommended_indexes(self, collection: str = "leads") -> Dict[str, List[Dict[str, Any]]]:
+        """Return the indexes the tool's queries rely on, per collection.
+
+        Leads are fetched by _id, which is always indexed. Videos are filtered by
+        lead and sorted by a metric, so compound indexes on (lead, metric) serve
+        the top-K queries without an in-memory sort. The playCount index also
+        carries the other counters, so per-lead averages are computed from the
+        index alone (a covered query) without loading video documents.
+
+        Args:
+            collection: The leads collection
+
+        Returns:
+            Mapping of collection name to index specifications
+        """
+        return {
+            collection: [],
+            self.videos_collection: [
+                {"keys": [(self.video_lead_field, ASCENDING), ("playCount", DESCENDING),
+                          ("diggCount", ASCENDING), ("commentCount", ASCENDING),
+                          ("shareCount", ASCENDING)],
+                 "name": f"{self.video_lead_field}_1_playCount_-1_counters"},
+                {"keys": [(self.video_lead_field, ASCENDING), ("diggCount", DESCENDING)],
+                 "name": f"{self.video_lead_field}_1_diggCount_-1"}
+            ]
+        }
+
+    def ensure_indexes(self, collection: str = "leads") -> List[str]:
+        """Create the recommended indexes if they do not exist.
+
+        Args:
+            collection: The leads collection
+
+        Returns:
+            Names of the indexes ensured
+        """
+        database = self.get_database()
+        names = []
+        for collection_name, indexes in self.recommended_indexes(collection).items():
+            for index in indexes:
+                names.append(database[collection_name].create_index(
+                    index["keys"], name=index["name"]))
+        return names
+
+    @traced("mongo.fetch_lead")
+    def fetch_lead(self, lead_id: str, collection: str = "leads") -> Optional[Dict[str, Any]]:
+        """Fetch the fields of a lead used for script generation.
+
+        Args:
+            lead_id: The lead's _id
+            collection: The leads collection
+
+        Returns:
+            The lead document with its _id as an "id" string, or None if not found
+        """
+        lead = self.get_database()[collection].find_one(
+            {"_id": self._lead_key(lead_id)}, LEAD_PROJECTION)
+        if lead is None:
+            return None
+
+        lead["id"] = str(lead.pop("_id"))
+        return lead
+
+    @traced("mongo.fetch_leads")
+    def fetch_leads(self, lead_ids: List[str], collection: str = "leads") -> Dict[str, Dict[str, Any]]:
+        """Fetch many leads in a single $in query.
+
+        Args:
+            lead_ids: The leads' _id values
+            collection: The leads collection
+
+        Returns:
+            Mapping of lead ID to lead document; missing leads are omitted
+        """
+        leads = {}
+        cursor = self.get_database()[collection].find(
+            {"_id": {"$in": [self._lead_key(lead_id) for lead_id in lead_ids]}}, LEAD_PROJECTION)
+
+        for lead in cursor:
+            lead["id"] = str(lead.pop("_id"))
+            leads[lead["id"]] = lead
+        current_span().set(documents=len(leads))
+        return leads
+
+    @traced("mongo.top_videos")
+    def fetch_top_videos(self, lead_id: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Fetch a lead's most viewed videos.
+
+        Args:
+            lead_id: The lead's _id
+            top_k: Number of videos to return (default: the tool's top_k)
+
+        Returns:
+            Video documents restricted to the fields used for script generation
+        """
+        cursor = self.get_database()[self.videos_collection].find(
+            {self.video_lead_field: self._lead_key(lead_id)}, VIDEO_PROJECTION
+        ).sort("playCount", DESCENDING).limit(top_k or self.top_k)
+        videos = list(cursor)
+        current_span().set(documents=len(videos))
+        return videos
+
+    def _top_videos_stages(self, top_k: int, rank_by: str) -> List[Dict[str, Any]]:
+        """Build the aggregation stages ranking a lead's matched videos on the server.
+
+        Args:
+            top_k: Number of videos to return
+            rank_by: "playCount", "diggCount" or "engagement"
+
+        Returns:
+            The aggregation stages
+        """
+        if rank_by not in RANK_FIELDS:
+            raise ValueError(f"Unknown ranking: {rank_by}")
+
+        stages = []
+        projection = dict(VIDEO_PROJECTION)
+
+        if rank_by == "engagement":
+            # A ratio over a handful of views is noise; only rank videos with enough reach
+            stages.append({"$match": {"playCount": {"$gte": self.min_engagement_views}}})
+            # Computed per video, so this ranking sorts in memory on the server
+            stages.append({"$addFields": {"engagementScore": {"$divide": [
+                {"$add": [{"$ifNull": ["$diggCount", 0]},
+                          {"$ifNull": ["$commentCount", 0]},
+                          {"$ifNull": ["$shareCount", 0]}]},
+                {"$max": [{"$ifNull": ["$playCount", 0]}, 1]}
+            ]}}})
+            projection["engagementScore"] = 1
+
+        stages.extend([
+            {"$sort": {RANK_FIELDS[rank_by]: DESCENDING}},
+            {"$limit": top_k},
+            {"$project": projection}
+        ])
+        return stages
+
+    def _video_stats_pipeline(self, lead_id: str, top_k: int, rank_by: str) -> List[Dict[str, Any]]:
+        """Build the pipeline computing a lead's top videos and average metrics in one pass.
+
+        The lead's videos are matched once and fed to both branches of a
+        $facet, so the server answers with a single document.
+
+        Args:
+            lead_id: The lead's _id
+            top_k: Number of videos to return
+            rank_by: "playCount", "diggCount" or "engagement"
+
+        Returns:
+            The aggregation pipeline
+        """
+        return [
+            {"$match": {self.video_lead_field: self._lead_key(lead_id)}},
+            {"$facet": {
+                "top_videos": self._top_videos_stages(top_k, rank_by),
+                "metrics": [
+                    {"$group": {
+                        "_id": None,
+                        "avg_views": {"$avg": "$playCount"},
+                        "avg_likes": {"$avg": "$diggCount"},
+                        "avg_comments": {"$avg": "$commentCount"},
+                        "avg_shares": {"$avg": "$shareCount"},
+                        "video_count": {"$sum": 1}
+                    }},
+                    {"$project": {"_id": 0}}
+                ]
+            }}
+        ]
+
+    @traced("mongo.video_stats")
+    def aggregate_video_stats(self,
+                              lead_id: str,
+                              top_k: Optional[int] = None,
+                              rank_by: Optional[str] = None) -> Dict[str, Any]:
+        """Compute a lead's top videos and average metrics on the server.
+
+        Args:
+            lead_id: The lead's _id
+            top_k: Number of videos to return (default: the tool's top_k)
+            rank_by: Ranking of the top videos (default: the tool's rank_by)
+
+        Returns:
+            Dictionary with high_performing_videos and performance_metrics
+        """
+        videos = self.get_database()[self.videos_collection]
+
+        stats = next(iter(videos.aggregate(self._video_stats_pipeline(
+            lead_id, top_k or self.top_k, rank_by or self.rank_by))), {})
+        top_videos = stats.get("top_videos", [])
+        metrics = next(iter(stats.get("metrics", [])), None) or {
+            "avg_views": 0, "avg_likes": 0, "avg_comments": 0, "avg_shares": 0, "video_count": 0}
+        current_span().set(documents=len(top_videos))
+
+        return {
+            "high_performing_videos": top_videos,
+            "performance_metrics": metrics
+        }
+
+    def fetch_video_stats(self,
+                          lead: Dict[str, Any],
+                          top_k: Optional[int] = None,
+                          rank_by: Optional[str] = None,
+                          query_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch the high-performing videos and performance metrics of a fetched lead.
+
+        Args:
+            lead: Lead document as returned by fetch_lead or fetch_leads
+            top_k: Number of high-performing videos to return
+            rank_by: Ranking of the top videos in "aggregate" mode (default: the tool's rank_by)
+            query_mode: "aggregate" or "find" (default: the tool's query_mode)
+
+        Both modes report the same performance_metrics keys. "aggregate" mode
+        computes them from the lead's videos; "find" mode reads the averages
+        precomputed on the lead document and reports video_count as None,
+        since it does not scan the lead's videos.
+
+        Returns:
+            Dictionary with lead_data, high_performing_videos and performance_metrics
+        """
+        if (query_mode or self.query_mode) == "aggregate":
+            return {"lead_data": lead, **self.aggregate_video_stats(lead["id"], top_k, rank_by)}
+
+        return {
+            "lead_data": lead,
+            "high_performing_videos": self.fetch_top_videos(lead["id"], top_k),
+            "performance_metrics": {
+                "avg_views": lead.get("averageViews", 0),
+                "avg_likes": lead.get("averageLikes", 0),
+                "avg_comments": lead.get("averageComments", 0),
+                "avg_shares": lead.get("averageShares", 0),
+                "video_count": None
+            }
+        }
+
+    def fetch_lead_data(self,
+                        lead_id: str,
+                        collection: str = "leads",
+                        top_k: Optional[int] = None,
+                        rank_by: Optional[str] = None,
+                        query_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch a lead, its high-performing videos and performance metrics.
+
+        Args:
+            lead_id: The lead's _id
+            collection: The leads collection
+            top_k: Number of high-performing videos to return
+            rank_by: Ranking of the top videos in "aggregate" mode (default: the tool's rank_by)
+            query_mode: "aggregate" or "find" (default: the tool's query_mode)
+
+        Returns:
+            Dictionary with lead_data, high_performing_videos and performance_metrics,
+            or an "error" key if the lead does not exist
+        """
+        lead = self.fetch_lead(lead_id, collection)
+        if lead is None:
+            return {"error": f"Lead {lead_id} not found"}
+
+        return self.fetch_video_stats(lead, top_k, rank_by, query_mode)
+
+    def _run(self, input_str: str) -> str:
+        """Run the MongoDB client tool.
+
+        Args:
+            input_str: JSON string containing lead_id and optionally collection, top_k,
+                rank_by and query_mode
+
+        Returns:
+            JSON string containing lead data and analytics
+        """
+        try:
+            # Parse input
+            input_json = json.loads(input_str)
+            lead_id = input_json.get("lead_id")
+
+            if not lead_id:
+                return json.dumps({"error": "Lead ID is required"})
+
+            return json.dumps(self.fetch_lead_data(
+                lead_id,
+                input_json.get("collection", "leads"),
+                input_json.get("top_k"),
+                input_json.get("rank_by"),
+                input_json.get("query_mode")
+            ), default=str)
+
+        except Exception as e:
+            return json.dumps({"error": str(e)})
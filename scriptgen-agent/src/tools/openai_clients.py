@@ -0,0 +1,272 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from .rate_limiter import acall_with_retry, call_with_retry, get_rate_limiter
+from .tracing import Span, end_span, span, start_span
+
+# Connection pool shared by all OpenAI requests of one client
+MAX_CONNECTIONS = 64
+KEEPALIVE_EXPIRY = 60.0
+REQUEST_TIMEOUT = 600.0
+CONNECT_TIMEOUT = 10.0
+
+# Rough token costs used to reserve rate-limit budget before a request is sent
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = {"low": 85, "high": 765, "auto": 765}
+
+_client: Optional[Any] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def _http_options() -> Dict[str, Any]:
+    """Connection pool and timeout options for the clients' httpx transport."""
+    # httpx and openai are imported on first use to keep CLI startup fast
+    import httpx
+
+    return {
+        "limits": httpx.Limits(max_connections=MAX_CONNECTIONS,
+                               max_keepalive_connections=MAX_CONNECTIONS,
+                               keepalive_expiry=KEEPALIVE_EXPIRY),
+        "timeout": httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+    }
+
+
+def get_openai_client() -> Any:
+    """Return the process-wide synchronous OpenAI client.
+
+    The client is thread-safe and keeps its HTTPS connections alive, so every
+    tool and thread reuses one connection pool instead of paying a TLS
+    handshake per request.
+
+    Returns:
+        The shared OpenAI client
+    """
+    global _client
+
+    with _clients_lock:
+        if _client is None:
+            import httpx
+            from openai import OpenAI
+            # Retries are handled by the shared rate limiter instead of the SDK
+            _client = OpenAI(max_retries=0, http_client=httpx.Client(**_http_options()))
+        return _client
+
+
+def get_async_openai_client() -> Any:
+    """Return the shared AsyncOpenAI client for the running event loop.
+
+    Async connections belong to the event loop that opened them, so one
+    long-lived client is kept per loop. Must be called from a coroutine.
+
+    Returns:
+        The shared AsyncOpenAI client
+    """
+    loop = asyncio.get_running_loop()
+
+    with _clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(max_retries=0, http_client=httpx.AsyncClient(**_http_options()))
+            _async_clients[loop] = client
+        return client
+
+
+def estimate_tokens(request: Dict[str, Any]) -> int:
+    """Estimate the tokens a chat-completions request counts against the quota.
+
+    Args:
+        request: Keyword arguments for chat.completions.create
+
+    Returns:
+        Estimated prompt tokens plus the maximum completion tokens
+    """
+    tokens = request.get("max_tokens") or 0
+    for message in request.get("messages", []):
+        content = message.get("content") or ""
+        if isinstance(content, str):
+            tokens += len(content) // CHARS_PER_TOKEN
+            continue
+        for part in content:
+            if part.get("type") == "image_url":
+                tokens += IMAGE_TOKENS.get(part["image_url"].get("detail", "auto"), 765)
+            else:
+                tokens += len(part.get("text", "")) // CHARS_PER_TOKEN
+    return tokens
+
+
+def request_bytes(request: Dict[str, Any]) -> int:
+    """Return the size of a request's message text and inline images, in bytes."""
+    size = 0
+    for message in request.get("messages", []):
+        content = message.get("content") or ""
+        if isinstance(content, str):
+            size += len(content.encode("utf-8"))
+            continue
+        for part in content:
+            if part.get("type") == "image_url":
+                size += len(part["image_url"].get("url", ""))
+            else:
+                size += len(part.get("text", "").encode("utf-8"))
+    return size
+
+
+def _stream_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Ask a streamed request to end with a chunk carrying its token usage."""
+    return {**request, "stream_options": {**(request.get("stream_options") or {}), "include_usage": True}}
+
+
+class _TracedStream:
+    """Streamed chat completion that keeps its span open until the stream ends.
+
+    The usage chunk sent last is added to the span and corrects the
+    limiter's token reservation once the stream is exhausted or closed.
+    """
+
+    def __init__(self, stream: Any, current: Span, model: str, estimated_tokens: int):
+        self._stream = stream
+        self._span = current
+        self._model = model
+        self._estimated_tokens = estimated_tokens
+        self._usage_chunk: Optional[Any] = None
+        self._finished = False
+
+    def _record(self, chunk: Any) -> Any:
+        if getattr(chunk, "usage", None) is not None:
+            self._usage_chunk = chunk
+        return chunk
+
+    def _finish(self, error: Optional[BaseException] = None) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        if self._usage_chunk is not None:
+            self._span.record_usage(self._usage_chunk)
+            actual = getattr(self._usage_chunk.usage, "total_tokens", None)
+            if actual is not None:
+                get_rate_limiter(self._model).reconcile(self._estimated_tokens, actual)
+        end_span(self._span, error)
+
+    def __iter__(self) -> "_TracedStream":
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return self._record(next(self._stream))
+        except StopIteration:
+            self.close()
+            raise
+        except BaseException as e:
+            self._finish(e)
+            raise
+
+    def close(self) -> None:
+        """Close the HTTP stream and finish the span."""
+        try:
+            self._stream.close()
+        finally:
+            self._finish()
+
+    def __enter__(self) -> "_TracedStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class _AsyncTracedStream(_TracedStream):
+    """Async variant of _TracedStream for AsyncOpenAI streams."""
+
+    def __aiter__(self) -> "_AsyncTracedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return self._record(await self._stream.__anext__())
+        except StopAsyncIteration:
+            await self.close()
+            raise
+        except BaseException as e:
+            self._finish(e)
+            raise
+
+    async def close(self) -> None:
+        """Close the HTTP stream and finish the span."""
+        try:
+            await self._stream.close()
+        finally:
+            self._finish()
+
+    async def __aenter__(self) -> "_AsyncTracedStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+def chat_completion(request: Dict[str, Any], stage: str = "llm.request") -> Any:
+    """Create a chat completion through the model's rate limiter, with retries.
+
+    The call is traced as a span named after the stage, recording the request
+    size and the token usage reported by the API. Streamed requests return a
+    stream that keeps the span open until it is exhausted or closed, and
+    reconciles the limiter with the usage reported in its last chunk.
+
+    Args:
+        request: Keyword arguments for chat.completions.create
+        stage: Span name, e.g. "vision.request"
+
+    Returns:
+        The chat-completions response, or the chunk stream for streamed requests
+    """
+    if request.get("stream"):
+        request = _stream_request(request)
+        estimated_tokens = estimate_tokens(request)
+        current = start_span(stage, model=request["model"], bytes=request_bytes(request), stream=True)
+        try:
+            stream = call_with_retry(
+                request["model"],
+                lambda: get_openai_client().chat.completions.create(**request),
+                estimated_tokens)
+        except BaseException as e:
+            end_span(current, e)
+            raise
+        return _TracedStream(stream, current, request["model"], estimated_tokens)
+
+    with span(stage, model=request["model"], bytes=request_bytes(request), stream=False) as current:
+        response = call_with_retry(
+            request["model"],
+            lambda: get_openai_client().chat.completions.create(**request),
+            estimate_tokens(request))
+        current.record_usage(response)
+        return response
+
+
+async def achat_completion(request: Dict[str, Any], stage: str = "llm.request") -> Any:
+    """Async variant of chat_completion using the event loop's AsyncOpenAI client."""
+    client = get_async_openai_client()
+    if request.get("stream"):
+        request = _stream_request(request)
+        estimated_tokens = estimate_tokens(request)
+        current = start_span(stage, model=request["model"], bytes=request_bytes(request), stream=True)
+        try:
+            stream = await acall_with_retry(
+                request["model"],
+                lambda: client.chat.completions.create(**request),
+                estimated_tokens)
+        except BaseException as e:
+            end_span(current, e)
+            raise
+        return _AsyncTracedStream(stream, current, request["model"], estimated_tokens)
+
+    with span(stage, model=request["model"], bytes=request_bytes(request), stream=False) as current:
+        response = await acall_with_retry(
+            request["model"],
+            lambda: client.chat.completions.create(**request),
+            estimate_tokens(request))
+        current.record_usage(response)
+        return response
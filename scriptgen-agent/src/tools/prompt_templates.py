@@ -0,0 +1,128 @@
+import hashlib
+import string
+import textwrap
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Fallback when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+
+def normalize_whitespace(text: str) -> str:
+    """Dedent a template, strip trailing spaces and collapse runs of blank lines.
+
+    Args:
+        text: Template text, typically an indented triple-quoted string
+
+    Returns:
+        The text with no leading/trailing blank lines and at most one blank
+        line between paragraphs
+    """
+    lines = [line.rstrip() for line in textwrap.dedent(text).strip().split("\n")]
+    normalized = []
+    for line in lines:
+        if line or (normalized and normalized[-1]):
+            normalized.append(line)
+    return "\n".join(normalized)
+
+
+class PromptTemplate:
+    """A prompt template compiled once into literal text and placeholders.
+
+    The template is normalized with normalize_whitespace and parsed with
+    str.format syntax at construction, so rendering is a single join over
+    precomputed segments. Its version hash changes whenever the text changes,
+    so caches of model output can key on it.
+    """
+
+    def __init__(self, name: str, template: str):
+        """Compile a template.
+
+        Args:
+            name: Template name, included in the version hash
+            template: Template text with {field} placeholders ({{ and }} escape braces)
+        """
+        self.name = name
+        self.text = normalize_whitespace(template)
+        self.segments: List[Tuple[str, Optional[str]]] = [
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(self.text)]
+        self.fields = [field for _, field in self.segments if field is not None]
+        self.version = hashlib.sha256(
+            f"{name}\0{self.text}".encode("utf-8")).hexdigest()[:12]
+
+    @property
+    def static_prefix(self) -> str:
+        """Literal text before the first placeholder, identical in every render."""
+        return self.segments[0][0] if self.segments else ""
+
+    def render(self, **values: Any) -> str:
+        """Render the template, stripping surrounding whitespace from each value.
+
+        Args:
+            **values: A value for every placeholder
+
+        Returns:
+            The rendered prompt
+        """
+        parts = []
+        for literal, field in self.segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]).strip())
+        return "".join(parts)
+
+    def render_many(self, items: Iterable[Dict[str, Any]], separator: str = "\n\n") -> str:
+        """Render the template once per item and join the results."""
+        return separator.join(self.render(**item) for item in items)
+
+
+def prompt_version(*templates: PromptTemplate) -> str:
+    """Combine the versions of several templates into one hash."""
+    return hashlib.sha256(
+        "".join(template.version for template in templates).encode("utf-8")).hexdigest()[:12]
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> Any:
+    """Return the tiktoken encoding of a model, or None if it is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # The encoding files are downloaded on first use, which fails offline
+        print(f"Error loading tiktoken encoding, estimating tokens: {str(e)}")
+        return None
+
+
+def has_tokenizer(model: str = "gpt-4o") -> bool:
+    """Return True if count_tokens uses tiktoken rather than an estimate."""
+    return _encoding(model) is not None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count the tokens of a text with tiktoken, or estimate them without it.
+
+    Args:
+        text: Text to measure
+        model: Model whose tokenizer is used
+
+    Returns:
+        Number of tokens
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: List[Dict[str, Any]], model: str = "gpt-4o") -> int:
+    """Count the text tokens of chat messages, ignoring per-message overhead."""
+    return sum(count_tokens(message["content"], model)
+               for message in messages if isinstance(message.get("content"), str))
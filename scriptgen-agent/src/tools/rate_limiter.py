@@ -0,0 +1,375 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Requests and tokens per minute assumed for each model when not configured.
+# Override with OPENAI_RATE_LIMITS="gpt-4o=5000:800000,gpt-4o-mini=5000:4000000".
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (500, 30000),
+    "gpt-4o-mini": (500, 200000),
+}
+FALLBACK_LIMITS = (500, 30000)
+
+# HTTP statuses worth retrying: timeouts, lock conflicts, rate limits and server errors
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+MAX_RETRIES = 6
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# Share of a model's request quota given to CrewAI agents when a crew is built.
+# Override with OPENAI_AGENT_RPM_SHARE=0.3.
+AGENT_RPM_SHARE = 0.5
+
+
+class _Bucket:
+    """Token bucket refilled continuously up to one minute's allowance."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+
+    def resize(self, per_minute: float) -> None:
+        """Change the allowance, keeping at most a full bucket."""
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = min(self.level, self.capacity)
+
+    def refill(self, elapsed: float) -> None:
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is available now)."""
+        # A single request larger than the bucket only has to wait for a full bucket
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for one model.
+
+    Callers reserve one request and an estimate of its tokens before each API
+    call, blocking (or awaiting) until both buckets allow it. Once the response
+    arrives the estimate is corrected with the actual usage. A rate-limit
+    response pauses every caller of the model for its Retry-After interval.
+    Thread-safe, and usable from threads and event loops at the same time.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request quota of the model
+            tokens_per_minute: Token quota of the model
+        """
+        self.requests = _Bucket(requests_per_minute)
+        self.tokens = _Bucket(tokens_per_minute)
+        self.request_quota = float(requests_per_minute)
+        self.agent_requests_per_minute = 0
+        self._paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "tokens": 0, "wait_seconds": 0.0,
+                       "retries": 0, "rate_limited": 0, "failures": 0}
+
+    def _reserve(self, tokens: int) -> float:
+        """Take one request and ``tokens`` tokens if available, else return the wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.requests.refill(now - self._updated)
+            self.tokens.refill(now - self._updated)
+            self._updated = now
+
+            wait = max(self._paused_until - now,
+                       self.requests.wait_for(1),
+                       self.tokens.wait_for(tokens))
+            if wait > 0:
+                return wait
+
+            self.requests.level -= 1
+            self.tokens.level -= tokens
+            self._stats["requests"] += 1
+            self._stats["tokens"] += tokens
+            return 0.0
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request of ``tokens`` estimated tokens may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        while True:
+            wait = self._reserve(tokens)
+            if not wait:
+                break
+            time.sleep(wait)
+        return self._waited(start)
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Await until a request of ``tokens`` estimated tokens may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        while True:
+            wait = self._reserve(tokens)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        return self._waited(start)
+
+    def _waited(self, start: float) -> float:
+        waited = time.monotonic() - start
+        with self._lock:
+            self._stats["wait_seconds"] += waited
+        return waited
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Correct a reservation once the actual token usage is known."""
+        with self._lock:
+            self.tokens.level += estimated - actual
+            self._stats["tokens"] += actual - estimated
+
+    def reserve_for_agents(self, share: float) -> int:
+        """Set aside part of the request quota for callers outside the limiter.
+
+        CrewAI agents count their own requests against max_rpm and never pass
+        through this limiter, so the tools are left the rest of the quota and
+        both together stay under it. Repeated calls replace the reservation.
+
+        Args:
+            share: Fraction of the request quota reserved, between 0 and 1
+
+        Returns:
+            Requests per minute reserved (at least 1)
+        """
+        with self._lock:
+            reserved = max(1, int(self.request_quota * share))
+            self.requests.resize(max(1.0, self.request_quota - reserved))
+            self.agent_requests_per_minute = reserved
+            return reserved
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for ``seconds``, e.g. after a rate-limit response."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def record(self, key: str) -> None:
+        """Count a retry, rate-limit response or final failure."""
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, token, wait and retry counters."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        stats["requests_per_minute"] = self.requests.capacity
+        stats["agent_requests_per_minute"] = self.agent_requests_per_minute
+        stats["tokens_per_minute"] = self.tokens.capacity
+        return stats
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+# Crews that may run at once in this process; each one's max_rpm is an equal
+# part of the agents' share, since CrewAI enforces max_rpm per crew
+_agent_crews = 1
+
+
+def _configured_limits() -> Dict[str, Tuple[float, float]]:
+    """Parse OPENAI_RATE_LIMITS ("model=rpm:tpm,...") over the defaults."""
+    limits = dict(DEFAULT_LIMITS)
+    for entry in os.environ.get("OPENAI_RATE_LIMITS", "").split(","):
+        if "=" not in entry:
+            continue
+        model, quota = entry.split("=", 1)
+        rpm, _, tpm = quota.partition(":")
+        limits[model.strip()] = (float(rpm), float(tpm or FALLBACK_LIMITS[1]))
+    return limits
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """Return the process-wide limiter for a model.
+
+    Args:
+        model: Model name, e.g. "gpt-4o"
+
+    Returns:
+        The shared RateLimiter, created from the configured quota on first use
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limiter = RateLimiter(*_configured_limits().get(model, FALLBACK_LIMITS))
+            _limiters[model] = limiter
+        return limiter
+
+
+def configure_rate_limit(model: str, requests_per_minute: float, tokens_per_minute: float) -> RateLimiter:
+    """Replace a model's limiter with one using the given quota."""
+    with _limiters_lock:
+        _limiters[model] = RateLimiter(requests_per_minute, tokens_per_minute)
+        return _limiters[model]
+
+
+def set_agent_crews(crews: int) -> None:
+    """Set how many crews may run at once in this process.
+
+    Processes that kick off several crews concurrently (one per job or lead)
+    call this before building them, so agent_max_rpm splits the agents' share
+    between the crews instead of giving each one all of it.
+
+    Args:
+        crews: Maximum number of crews running at the same time
+    """
+    global _agent_crews
+    _agent_crews = max(1, int(crews))
+
+
+def agent_max_rpm(model: str) -> int:
+    """Reserve the agents' share of a model's request quota and return one crew's max_rpm.
+
+    The share is OPENAI_AGENT_RPM_SHARE, or AGENT_RPM_SHARE if unset; the
+    model's shared limiter keeps the remainder for the tools. The share is
+    divided between the crews allowed by set_agent_crews, so all of the
+    process's crews together stay within it.
+
+    Args:
+        model: Model name the agents use, e.g. "gpt-4o"
+
+    Returns:
+        Requests per minute for the crew's max_rpm (at least 1)
+    """
+    share = float(os.environ.get("OPENAI_AGENT_RPM_SHARE") or AGENT_RPM_SHARE)
+    reserved = get_rate_limiter(model).reserve_for_agents(min(max(share, 0.0), 1.0))
+    return max(1, reserved // _agent_crews)
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the stats of every limiter, keyed by model."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {model: limiter.stats() for model, limiter in limiters.items()}
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Return the server-requested delay of an API error, if it sent one."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return True for rate limits, timeouts, connection failures and server errors."""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRY_STATUSES
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        from openai import APIConnectionError
+    except ImportError:
+        return False
+    # Also covers APITimeoutError
+    return isinstance(error, APIConnectionError)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff with full jitter, or the server's Retry-After when given.
+
+    MAX_DELAY caps the exponential term only; a Retry-After beyond it is
+    honored in full, since retrying earlier just draws another 429.
+    """
+    if retry_after is not None:
+        # Spread out the callers released together when the server's window reopens
+        return retry_after + random.uniform(0, BASE_DELAY)
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+
+
+def _actual_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage is not None else None
+
+
+def _on_error(limiter: RateLimiter, error: Exception, attempt: int, max_retries: int) -> float:
+    """Return the delay before retrying ``error``, or re-raise it."""
+    if not is_retryable(error) or attempt >= max_retries:
+        limiter.record("failures")
+        raise error
+
+    retry_after = retry_after_seconds(error)
+    delay = backoff_delay(attempt, retry_after)
+    if getattr(error, "status_code", None) == 429:
+        limiter.record("rate_limited")
+        # The quota is shared, so every caller of the model has to back off
+        limiter.pause(delay)
+    limiter.record("retries")
+    print(f"LLM request failed ({str(error)}), retrying in {delay:.1f}s")
+    return delay
+
+
+def call_with_retry(model: str,
+                    call: Callable[[], Any],
+                    estimated_tokens: int = 0,
+                    max_retries: int = MAX_RETRIES) -> Any:
+    """Send an API request through the model's limiter, retrying transient failures.
+
+    Args:
+        model: Model name selecting the shared limiter
+        call: Function sending the request and returning the response
+        estimated_tokens: Prompt plus maximum completion tokens of the request
+        max_retries: Retries before the last error is raised
+
+    Returns:
+        The API response
+    """
+    limiter = get_rate_limiter(model)
+    attempt = 0
+    while True:
+        limiter.acquire(estimated_tokens)
+        try:
+            response = call()
+        except Exception as e:
+            time.sleep(_on_error(limiter, e, attempt, max_retries))
+            attempt += 1
+            continue
+
+        actual = _actual_tokens(response)
+        if actual is not None:
+            limiter.reconcile(estimated_tokens, actual)
+        return response
+
+
+async def acall_with_retry(model: str,
+                           call: Callable[[], Awaitable[Any]],
+                           estimated_tokens: int = 0,
+                           max_retries: int = MAX_RETRIES) -> Any:
+    """Async variant of call_with_retry for coroutine-returning calls."""
+    limiter = get_rate_limiter(model)
+    attempt = 0
+    while True:
+        await limiter.aacquire(estimated_tokens)
+        try:
+            response = await call()
+        except Exception as e:
+            await asyncio.sleep(_on_error(limiter, e, attempt, max_retries))
+            attempt += 1
+            continue
+
+        actual = _actual_tokens(response)
+        if actual is not None:
+            limiter.reconcile(estimated_tokens, actual)
+        return response
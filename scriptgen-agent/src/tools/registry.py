@@ -0,0 +1,168 @@
+import os
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain.tools import BaseTool
+
+# "live" uses the real tools; "mock" answers every call with canned data,
+# for running the crew without MongoDB, Chrome or vision requests
+TOOL_MODES = ("live", "mock")
+
+# Canned responses of the mock tools, in each live tool's output format
+MOCK_RESPONSES: Dict[str, Dict[str, Any]] = {
+    "tiktok_video_analyzer": {
+        "screenshot_analyses": [
+            "The video shows a creator demonstrating a product with bright lighting and colorful background.",
+            "Close-up shot of product with on-screen text describing features."
+        ],
+        "screenshots": ["path/to/screenshot1.png", "path/to/screenshot2.png"]
+    },
+    "mongodb_client": {
+        "lead_data": {
+            "id": "67d109795a08effb5160dcf0",
+            "nickName": "CreativeTikToker",
+            "bio": "Creating awesome content daily!",
+            "totalFollowers": 50000
+        },
+        "high_performing_videos": [
+            {"text": "My best outfit of the day!",
+                "playCount": 100000, "diggCount": 20000}
+        ],
+        "performance_metrics": {
+            "avg_views": 75000,
+            "avg_likes": 15000
+        }
+    },
+    "script_generator": {
+        "script_concepts": [
+            {
+                "title": "Day-to-Night Transformation with StyleBoost",
+                "format": "Before/After Transformation",
+                "hook": "Ever feel stuck with the same outfit all day? Watch this!",
+                "shots": [
+                    "0:00-0:03: Creator looking frustrated at outfit in mirror",
+                    "0:04-0:08: Creator shows StyleBoost accessories",
+                    "0:09-0:15: Quick transformation with accessories"
+                ],
+                "text_overlays": [
+                    "POV: When you have meetings AND dinner plans",
+                    "StyleBoost - One outfit, endless possibilities"
+                ],
+                "music": "Upbeat transformation music",
+                "caption": "One outfit, endless possibilities with @StyleBoost! #fashionhack #styletips"
+            }
+        ]
+    }
+}
+
+
+def _tool_class(name: str) -> type:
+    """Import and return the live tool class registered under a tool name."""
+    if name == "tiktok_video_analyzer":
+        from .tiktok_analyzer import TikTokVideoAnalyzer
+        return TikTokVideoAnalyzer
+    if name == "mongodb_client":
+        from .mongodb_client import MongoDBClient
+        return MongoDBClient
+    if name == "script_generator":
+        from .script_generator import ScriptGenerator
+        return ScriptGenerator
+    raise ValueError(f"Unknown tool: {name}")
+
+
+class MockTool(BaseTool):
+    """Stand-in for a live tool that returns a canned response.
+
+    It carries the live tool's name and description, so agents see the same
+    tool in both modes.
+    """
+
+    name: str = ""
+    description: str = ""
+    response: str = ""
+
+    def __init__(self, name: str, response: Dict[str, Any]):
+        """Initialize the mock tool.
+
+        Args:
+            name: Name of the live tool being mocked
+            response: Response returned for every call
+        """
+        tool_class = _tool_class(name)
+        super().__init__()
+        self.name = name
+        self.description = tool_class.model_fields["description"].default
+        self.response = json.dumps(response)
+
+    def _run(self, input_str: str) -> str:
+        """Return the canned response, whatever the input."""
+        return self.response
+
+    async def _arun(self, input_str: str) -> str:
+        """Return the canned response, whatever the input."""
+        return self.response
+
+
+_tools: Dict[Tuple[str, str], BaseTool] = {}
+_tools_lock = threading.Lock()
+
+
+def tool_mode() -> str:
+    """Return the configured tool mode: the SCRIPTGEN_TOOL_MODE environment variable, or "live"."""
+    mode = os.environ.get("SCRIPTGEN_TOOL_MODE", "live").strip().lower()
+    if mode not in TOOL_MODES:
+        raise ValueError(f"Unknown tool mode: {mode}")
+    return mode
+
+
+def get_tool(name: str, mode: Optional[str] = None) -> BaseTool:
+    """Return the process-wide instance of a tool, building it on first use.
+
+    Live tools are built once with their default configuration, so every
+    agent and crew shares the analyzer's driver pool and cache, the shared
+    MongoDB client and the shared OpenAI client.
+
+    Args:
+        name: Tool name: "tiktok_video_analyzer", "mongodb_client" or "script_generator"
+        mode: "live" or "mock" (default: tool_mode())
+
+    Returns:
+        The tool instance
+    """
+    mode = mode or tool_mode()
+    if mode not in TOOL_MODES:
+        raise ValueError(f"Unknown tool mode: {mode}")
+
+    with _tools_lock:
+        tool = _tools.get((name, mode))
+        if tool is None:
+            if mode == "mock":
+                tool = MockTool(name, MOCK_RESPONSES[name])
+            else:
+                tool = _tool_class(name)()
+            _tools[(name, mode)] = tool
+        return tool
+
+
+def get_tools(names: List[str], mode: Optional[str] = None) -> List[BaseTool]:
+    """Return the process-wide instances of several tools (see get_tool)."""
+    return [get_tool(name, mode) for name in names]
+
+
+def register_tool(name: str, tool: BaseTool, mode: str = "live") -> None:
+    """Use a pre-built tool instance for a name, e.g. one with custom options."""
+    with _tools_lock:
+        _tools[(name, mode)] = tool
+
+
+def close_tools() -> None:
+    """Close and forget every built tool, releasing browser sessions and caches."""
+    with _tools_lock:
+        tools = list(_tools.values())
+        _tools.clear()
+
+    for tool in tools:
+        close: Optional[Callable[[], None]] = getattr(tool, "close", None)
+        if close is not None:
+            close()
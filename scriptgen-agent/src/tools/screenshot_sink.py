@@ -0,0 +1,129 @@
+import atexit
+import hashlib
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+class ScreenshotSink:
+    """Asynchronous, content-addressed screenshot writer with a retention policy.
+
+    Screenshots are named after the SHA-256 of their bytes, so concurrent runs
+    never overwrite each other and identical frames are stored once. Writes
+    happen on a background thread; old files are pruned by age and count.
+    """
+
+    def __init__(self,
+                 directory: Path,
+                 max_age_seconds: Optional[float] = 24 * 3600,
+                 max_files: int = 1000,
+                 cleanup_interval: float = 300.0):
+        """Initialize the sink and start its writer thread.
+
+        Args:
+            directory: Directory the screenshots are written to
+            max_age_seconds: Delete screenshots older than this (None keeps them)
+            max_files: Keep at most this many screenshots, deleting the oldest (0 disables)
+            cleanup_interval: Minimum seconds between retention sweeps
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        self.max_files = max_files
+        self.cleanup_interval = cleanup_interval
+
+        self._queue: "queue.Queue[Optional[Tuple[Path, bytes]]]" = queue.Queue()
+        self._last_cleanup = 0.0
+        self._thread = threading.Thread(
+            target=self._worker, name="screenshot-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def path_for(self, image_bytes: bytes, suffix: str = ".png") -> Path:
+        """Return the content-addressed path a screenshot is stored under."""
+        return self.directory / f"{hashlib.sha256(image_bytes).hexdigest()[:32]}{suffix}"
+
+    def submit(self, image_bytes: bytes, suffix: str = ".png") -> str:
+        """Queue a screenshot for writing.
+
+        Args:
+            image_bytes: Encoded screenshot
+            suffix: File extension
+
+        Returns:
+            The path the screenshot will be written to
+        """
+        path = self.path_for(image_bytes, suffix)
+        self._queue.put((path, image_bytes))
+        return str(path)
+
+    def _write(self, path: Path, image_bytes: bytes) -> None:
+        """Atomically write a screenshot unless identical content already exists."""
+        if path.exists():
+            # Refresh the timestamp so retention treats it as recent
+            os.utime(path)
+            return
+
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(image_bytes)
+        os.replace(tmp_path, path)
+
+    def cleanup(self) -> int:
+        """Delete screenshots beyond the retention policy.
+
+        Returns:
+            Number of files deleted
+        """
+        files = []
+        for path in self.directory.iterdir():
+            if path.is_file() and not path.name.startswith("."):
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+        files.sort()
+
+        now = time.time()
+        expired = []
+        if self.max_age_seconds is not None:
+            # Files are sorted oldest first, so expired files form a prefix
+            expired = [path for mtime, path in files if now - mtime > self.max_age_seconds]
+
+        excess = len(files) - len(expired) - self.max_files
+        if self.max_files and excess > 0:
+            expired.extend(path for _, path in files[len(expired):len(expired) + excess])
+
+        for path in expired:
+            path.unlink(missing_ok=True)
+        return len(expired)
+
+    def _worker(self) -> None:
+        """Write queued screenshots and run periodic retention sweeps."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+
+                if time.monotonic() - self._last_cleanup >= self.cleanup_interval:
+                    self._last_cleanup = time.monotonic()
+                    self.cleanup()
+            except Exception as e:
+                print(f"Error persisting screenshot: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until all queued screenshots are written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
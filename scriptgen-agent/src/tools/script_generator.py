@@ -1,7 +1,215 @@
+import os
 import json
-from typing import Dict, Any, List, Optional
+import time
+import asyncio
+import threading
+from typing import Dict, Any, List, Optional, Callable, Iterator, AsyncIterator
 from langchain.tools import BaseTool
 
+from .cache import SQLiteCache, make_cache_key
+from .openai_clients import achat_completion, chat_completion
+from .prompt_templates import PromptTemplate, prompt_version
+from .tracing import current_span, traced
+
+# Heading that starts each concept in the generated script text
+CONCEPT_MARKER = "# Concept "
+
+OUTPUT_MODES = ("json_schema", "text")
+
+# Request parameters an API error must name before "json_schema" falls back to text
+STRUCTURED_OUTPUT_PARAMS = ("response_format", "json_schema")
+
+# Sections of a script concept and their types, in output order
+CONCEPT_FIELDS = {
+    "title": str,
+    "format": str,
+    "hook": str,
+    "shots": list,
+    "text_overlays": list,
+    "music": str,
+    "caption": str
+}
+
+# Structured-output schema for the "json_schema" output mode
+SCRIPT_CONCEPTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "concepts": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    field: {"type": "array", "items": {"type": "string"}} if kind is list
+                    else {"type": "string"}
+                    for field, kind in CONCEPT_FIELDS.items()
+                },
+                "required": list(CONCEPT_FIELDS),
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["concepts"],
+    "additionalProperties": False
+}
+
+# Static instructions come first, so provider-side prompt caching can reuse
+# them across creators; per-request data follows in the user message
+SCRIPT_TASK = """
+You are an expert TikTok content strategist and script developer for influencer marketing campaigns.
+
+# Video Script Concept Generation
+
+## Your Task
+Based on the creator's high-performing content, visual style analysis, and the product information, generate 3 detailed script concepts for TikTok videos.
+
+For each concept, provide:
+1. A title and format description
+2. A strong hook (first 3 seconds)
+3. A shot-by-shot breakdown with timing
+4. Suggested text overlays and their placement
+5. Music/audio recommendations
+6. A caption strategy with hashtags
+
+Make sure each concept:
+- Matches the creator's authentic style
+- Leverages their high-performing content patterns
+- Naturally integrates the product
+- Has a strong hook and narrative arc
+- Includes specific visual details based on the screenshot analysis
+"""
+
+SYSTEM_PROMPTS = {
+    "text": PromptTemplate("script_system_text", SCRIPT_TASK + """
+Format each concept as a structured outline with clear sections, starting each concept with a "# Concept <number>:" heading.
+"""),
+    "json_schema": PromptTemplate("script_system_json", SCRIPT_TASK + """
+Return the concepts as JSON matching the provided schema.
+""")
+}
+
+# Product information is shared by every lead of a campaign, so it precedes the creator data
+SCRIPT_USER_PROMPT = PromptTemplate("script_user", """
+## Product/Campaign Information
+- Product Name: {product_name}
+- Product Description: {product_description}
+- Campaign Goals: {campaign_goals}
+- Target Audience: {target_audience}
+- Key Messages: {key_messages}
+
+## Creator Information
+- Creator: {creator_name}
+- Bio: {bio}
+- Total Followers: {total_followers}
+- Engagement Rate: {engagement_rate}%
+
+## Performance Metrics
+- Average Views: {average_views}
+- Average Likes: {average_likes}
+- Average Comments: {average_comments}
+- Average Shares: {average_shares}
+- Tags/Categories: {tags}
+
+## High-Performing Videos
+{videos}
+
+## Video Style Analysis
+{analyses}
+""")
+
+VIDEO_TEMPLATE = PromptTemplate("script_video", """
+### Video {number}
+- Caption: {text}
+- Views: {views}
+- Likes: {likes}
+- Comments: {comments}
+- Shares: {shares}
+- URL: {url}
+""")
+
+ANALYSIS_TEMPLATE = PromptTemplate("script_analysis", """
+### Screenshot Analysis {number}
+{analysis}
+""")
+
+# Changes whenever any script prompt template changes
+SCRIPT_PROMPT_VERSION = prompt_version(
+    *SYSTEM_PROMPTS.values(), SCRIPT_USER_PROMPT, VIDEO_TEMPLATE, ANALYSIS_TEMPLATE)
+
+_parse_stats_lock = threading.Lock()
+
+
+def product_requirements_from_info(product_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a product brief in the inputs.yaml format to the generator's product requirements.
+
+    Args:
+        product_info: Product brief with name, description, goals, target_audience
+            and key_messages (as in src/config/inputs.yaml)
+
+    Returns:
+        Product requirements keyed as ScriptGenerator expects them
+    """
+    return {
+        "product_name": product_info.get("name", ""),
+        "product_description": product_info.get("description", ""),
+        "campaign_goals": product_info.get("goals", ""),
+        "target_audience": product_info.get("target_audience", ""),
+        "key_messages": product_info.get("key_messages", "")
+    }
+
+
+class ConceptStreamParser:
+    """Splits streamed script text into concepts as soon as each one is complete.
+
+    A concept is complete once the next concept's marker (or the end of the
+    stream) arrives. Splitting matches ScriptGenerator._parse_script_concepts:
+    text before the first marker is dropped, and text without any marker is
+    parsed as a single concept.
+    """
+
+    def __init__(self, parse_concept: Callable[[str], Dict[str, Any]]):
+        """Initialize the parser.
+
+        Args:
+            parse_concept: Function parsing one concept's text
+        """
+        self.parse_concept = parse_concept
+        self._buffer = ""
+        self._scan_from = 0
+        self._started = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Add streamed text and return the concepts it completed."""
+        self._buffer += text
+        concepts = []
+
+        while True:
+            index = self._buffer.find(CONCEPT_MARKER, self._scan_from)
+            if index < 0:
+                # A marker may be split across chunks, so rescan its possible start
+                self._scan_from = max(0, len(self._buffer) - len(CONCEPT_MARKER) + 1)
+                return concepts
+
+            if self._started:
+                concepts.append(self.parse_concept(self._buffer[:index]))
+            self._started = True
+
+            # Only the concept being streamed is kept in the buffer
+            self._buffer = self._buffer[index + len(CONCEPT_MARKER):]
+            self._scan_from = 0
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Parse the last concept once the stream has ended."""
+        concept = self.parse_concept(self._buffer)
+        self._buffer = ""
+        return [concept]
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Return the text delta of a streamed chat-completions chunk."""
+    if not chunk.choices:
+        return ""
+    return chunk.choices[0].delta.content or ""
+
 
 class ScriptGenerator(BaseTool):
     """Tool for generating video script concepts based on lead data and video analysis."""
@@ -14,23 +222,88 @@ class ScriptGenerator(BaseTool):
     - high_performing_videos: List of high-performing videos
     - video_analyses: List of video screenshot analyses
     - product_requirements: Information about the product/campaign
+    - bypass_cache: Optional; neither read nor write the response cache
+    - refresh_cache: Optional; regenerate and overwrite the cached response
     """
     llm_model: str = "gpt-4o"
-
-    def __init__(self, llm_model: str = "gpt-4o"):
+    output_mode: str = "json_schema"
+    parse_stats: Dict[str, Dict[str, float]] = {}
+    cache: Optional[SQLiteCache] = None
+
+    def __init__(self,
+                 llm_model: str = "gpt-4o",
+                 output_mode: str = "json_schema",
+                 cache_path: Optional[str] = None,
+                 cache_ttl: Optional[float] = 7 * 24 * 3600,
+                 cache_max_entries: int = 10000):
         """Initialize the script generator tool.
 
         Args:
             llm_model: The LLM model to use for script generation
+            output_mode: "json_schema" to request structured output validated against
+                SCRIPT_CONCEPTS_SCHEMA (falling back to text parsing), or "text" to
+                parse the model's free-form outline
+            cache_path: SQLite file caching generated concepts (default: the
+                SCRIPT_CACHE_PATH environment variable; caching is off if neither is set)
+            cache_ttl: Lifetime of cached concepts in seconds (None disables expiry)
+            cache_max_entries: Maximum number of cached responses before LRU eviction
         """
         super().__init__()
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode: {output_mode}")
         self.llm_model = llm_model
+        self.output_mode = output_mode
+        cache_path = cache_path or os.environ.get("SCRIPT_CACHE_PATH")
+        if cache_path:
+            self.cache = SQLiteCache(
+                cache_path, ttl_seconds=cache_ttl, max_entries=cache_max_entries)
+        self.parse_stats = {mode: {"parses": 0, "failures": 0, "fallbacks": 0, "parse_seconds": 0.0}
+                            for mode in OUTPUT_MODES}
+
+    def generate(self,
+                 lead_data: Dict[str, Any],
+                 high_performing_videos: List[Dict[str, Any]],
+                 video_analyses: List[str],
+                 product_requirements: Dict[str, Any],
+                 bypass_cache: bool = False,
+                 refresh_cache: bool = False) -> List[Dict[str, Any]]:
+        """Generate script concepts for a lead, for callers outside the agent framework.
+
+        Args:
+            lead_data: Lead data with performance metrics
+            high_performing_videos: List of high-performing videos
+            video_analyses: List of video screenshot analyses
+            product_requirements: Information about the product/campaign
+            bypass_cache: Neither read nor write the response cache
+            refresh_cache: Skip the cached response but store the new one
 
+        Returns:
+            List of script concepts, or a single concept with an "error" key on failure
+        """
+        return self._generate_script_concepts(
+            lead_data, high_performing_videos, video_analyses, product_requirements,
+            bypass_cache=bypass_cache, refresh_cache=refresh_cache)
+
+    async def agenerate(self,
+                        lead_data: Dict[str, Any],
+                        high_performing_videos: List[Dict[str, Any]],
+                        video_analyses: List[str],
+                        product_requirements: Dict[str, Any],
+                        bypass_cache: bool = False,
+                        refresh_cache: bool = False) -> List[Dict[str, Any]]:
+        """Async variant of generate using the shared AsyncOpenAI client."""
+        return await self._agenerate_script_concepts(
+            lead_data, high_performing_videos, video_analyses, product_requirements,
+            bypass_cache=bypass_cache, refresh_cache=refresh_cache)
+
+    @traced("script.generate")
     def _generate_script_concepts(self,
                                   lead_data: Dict[str, Any],
                                   high_performing_videos: List[Dict[str, Any]],
                                   video_analyses: List[str],
-                                  product_requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+                                  product_requirements: Dict[str, Any],
+                                  bypass_cache: bool = False,
+                                  refresh_cache: bool = False) -> List[Dict[str, Any]]:
         """Generate script concepts based on input data.
 
         Args:
@@ -38,85 +311,104 @@ class ScriptGenerator(BaseTool):
             high_performing_videos: List of high-performing videos
             video_analyses: List of video screenshot analyses
             product_requirements: Information about the product/campaign
+            bypass_cache: Neither read nor write the response cache
+            refresh_cache: Skip the cached response but store the new one
 
         Returns:
             List of script concepts
         """
+        cache_key = None
+        if self.cache and not bypass_cache:
+            cache_key = self._response_cache_key(
+                lead_data, high_performing_videos, video_analyses, product_requirements)
+            if not refresh_cache:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    current_span().set(cache_hit=True, concepts=len(cached))
+                    return cached
+
+        output_mode = self.output_mode
         try:
-            from openai import OpenAI
-            client = OpenAI()
-
-            # Extract relevant information
-            creator_name = lead_data.get("nickName", "")
-
-            # Prepare the prompt
-            prompt = f"""
-            # Video Script Concept Generation
-            
-            ## Creator Information
-            - Creator: {creator_name}
-            - Bio: {lead_data.get("bio", "")}
-            - Total Followers: {lead_data.get("totalFollowers", "")}
-            - Engagement Rate: {lead_data.get("totalEngagementRate", "")}%
-            
-            ## Performance Metrics
-            - Average Views: {lead_data.get("averageViews", 0)}
-            - Average Likes: {lead_data.get("averageLikes", 0)}
-            - Average Comments: {lead_data.get("averageComments", 0)}
-            - Average Shares: {lead_data.get("averageShares", 0)}
-            - Tags/Categories: {', '.join(lead_data.get("tags", []))}
-            
-            ## High-Performing Videos
-            {self._format_videos(high_performing_videos)}
-            
-            ## Video Style Analysis
-            {self._format_analyses(video_analyses)}
-            
-            ## Product/Campaign Information
-            - Product Name: {product_requirements.get("product_name", "")}
-            - Product Description: {product_requirements.get("product_description", "")}
-            - Campaign Goals: {product_requirements.get("campaign_goals", "")}
-            - Target Audience: {product_requirements.get("target_audience", "")}
-            - Key Messages: {product_requirements.get("key_messages", "")}
-            
-            ## Your Task
-            Based on the creator's high-performing content, visual style analysis, and the product information, generate 3 detailed script concepts for TikTok videos.
-            
-            For each concept, provide:
-            1. A title and format description
-            2. A strong hook (first 3 seconds)
-            3. A shot-by-shot breakdown with timing
-            4. Suggested text overlays and their placement
-            5. Music/audio recommendations
-            6. A caption strategy with hashtags
-            
-            Make sure each concept:
-            - Matches the creator's authentic style
-            - Leverages their high-performing content patterns
-            - Naturally integrates the product
-            - Has a strong hook and narrative arc
-            - Includes specific visual details based on the screenshot analysis
-            
-            Format each concept as a structured outline with clear sections.
-            """
+            try:
+                response = chat_completion(self._completion_request(
+                    lead_data, high_performing_videos, video_analyses, product_requirements,
+                    output_mode), stage="script.request")
+            except Exception as e:
+                if not self._structured_output_rejected(e, output_mode):
+                    raise
+                output_mode = "text"
+                response = chat_completion(self._completion_request(
+                    lead_data, high_performing_videos, video_analyses, product_requirements,
+                    output_mode), stage="script.request")
+
+            # Process the response into structured concepts
+            script_concepts = self._parse_response(response.choices[0].message.content, output_mode)
+            current_span().set(cache_hit=False, output_mode=output_mode,
+                               concepts=len(script_concepts)).record_usage(response)
+            if cache_key:
+                self.cache.set(cache_key, script_concepts)
+            return script_concepts
 
-            # Generate script concepts
-            response = client.chat.completions.create(
-                model=self.llm_model,
-                messages=[
-                    {"role": "system", "content": "You are an expert TikTok content strategist and script developer for influencer marketing campaigns."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2500
-            )
+        except Exception as e:
+            print(f"Error generating script concepts: {str(e)}")
+            return [{
+                "title": "Error generating script concepts",
+                "error": str(e)
+            }]
 
-            # Parse the response
-            script_text = response.choices[0].message.content
+    @traced("script.generate")
+    async def _agenerate_script_concepts(self,
+                                         lead_data: Dict[str, Any],
+                                         high_performing_videos: List[Dict[str, Any]],
+                                         video_analyses: List[str],
+                                         product_requirements: Dict[str, Any],
+                                         bypass_cache: bool = False,
+                                         refresh_cache: bool = False) -> List[Dict[str, Any]]:
+        """Generate script concepts without blocking the event loop.
 
-            # Process the script text into structured concepts
-            script_concepts = self._parse_script_concepts(script_text)
+        Uses the shared AsyncOpenAI client, so one event loop can keep many
+        generations in flight.
 
+        Args:
+            lead_data: Lead data with performance metrics
+            high_performing_videos: List of high-performing videos
+            video_analyses: List of video screenshot analyses
+            product_requirements: Information about the product/campaign
+            bypass_cache: Neither read nor write the response cache
+            refresh_cache: Skip the cached response but store the new one
+
+        Returns:
+            List of script concepts
+        """
+        cache_key = None
+        if self.cache and not bypass_cache:
+            cache_key = self._response_cache_key(
+                lead_data, high_performing_videos, video_analyses, product_requirements)
+            if not refresh_cache:
+                cached = await asyncio.to_thread(self.cache.get, cache_key)
+                if cached is not None:
+                    current_span().set(cache_hit=True, concepts=len(cached))
+                    return cached
+
+        output_mode = self.output_mode
+        try:
+            try:
+                response = await achat_completion(self._completion_request(
+                    lead_data, high_performing_videos, video_analyses, product_requirements,
+                    output_mode), stage="script.request")
+            except Exception as e:
+                if not self._structured_output_rejected(e, output_mode):
+                    raise
+                output_mode = "text"
+                response = await achat_completion(self._completion_request(
+                    lead_data, high_performing_videos, video_analyses, product_requirements,
+                    output_mode), stage="script.request")
+
+            script_concepts = self._parse_response(response.choices[0].message.content, output_mode)
+            current_span().set(cache_hit=False, output_mode=output_mode,
+                               concepts=len(script_concepts)).record_usage(response)
+            if cache_key:
+                await asyncio.to_thread(self.cache.set, cache_key, script_concepts)
             return script_concepts
 
         except Exception as e:
@@ -126,6 +418,205 @@ class ScriptGenerator(BaseTool):
                 "error": str(e)
             }]
 
+    def stream_script_concepts(self,
+                               lead_data: Dict[str, Any],
+                               high_performing_videos: List[Dict[str, Any]],
+                               video_analyses: List[str],
+                               product_requirements: Dict[str, Any],
+                               on_concept: Optional[Callable[[Dict[str, Any]], None]] = None
+                               ) -> Iterator[Dict[str, Any]]:
+        """Generate script concepts, yielding each one as soon as it is complete.
+
+        The completion is streamed and split on concept headings as it
+        arrives, so consumers can start on the first concept while the rest
+        are still being generated. Streaming always uses the "text" output mode.
+
+        Args:
+            lead_data: Lead data with performance metrics
+            high_performing_videos: List of high-performing videos
+            video_analyses: List of video screenshot analyses
+            product_requirements: Information about the product/campaign
+            on_concept: Optional callback invoked with each concept as it completes
+
+        Yields:
+            Script concepts, in order
+        """
+        parser = ConceptStreamParser(self._parse_concept)
+        stream = None
+        try:
+            stream = chat_completion({**self._completion_request(
+                lead_data, high_performing_videos, video_analyses, product_requirements, "text"),
+                "stream": True}, stage="script.stream")
+
+            for chunk in stream:
+                for concept in parser.feed(_chunk_text(chunk)):
+                    if on_concept:
+                        on_concept(concept)
+                    yield concept
+
+            for concept in parser.close():
+                if on_concept:
+                    on_concept(concept)
+                yield concept
+
+        except Exception as e:
+            print(f"Error generating script concepts: {str(e)}")
+            yield {
+                "title": "Error generating script concepts",
+                "error": str(e)
+            }
+
+        finally:
+            if stream is not None and hasattr(stream, "close"):
+                stream.close()
+
+    async def astream_script_concepts(self,
+                                      lead_data: Dict[str, Any],
+                                      high_performing_videos: List[Dict[str, Any]],
+                                      video_analyses: List[str],
+                                      product_requirements: Dict[str, Any],
+                                      on_concept: Optional[Callable[[Dict[str, Any]], None]] = None
+                                      ) -> AsyncIterator[Dict[str, Any]]:
+        """Async variant of stream_script_concepts using the shared AsyncOpenAI client."""
+        parser = ConceptStreamParser(self._parse_concept)
+        stream = None
+        try:
+            stream = await achat_completion({**self._completion_request(
+                lead_data, high_performing_videos, video_analyses, product_requirements, "text"),
+                "stream": True}, stage="script.stream")
+
+            async for chunk in stream:
+                for concept in parser.feed(_chunk_text(chunk)):
+                    if on_concept:
+                        on_concept(concept)
+                    yield concept
+
+            for concept in parser.close():
+                if on_concept:
+                    on_concept(concept)
+                yield concept
+
+        except Exception as e:
+            print(f"Error generating script concepts: {str(e)}")
+            yield {
+                "title": "Error generating script concepts",
+                "error": str(e)
+            }
+
+        finally:
+            if stream is not None and hasattr(stream, "close"):
+                await stream.close()
+
+    def _response_cache_key(self,
+                            lead_data: Dict[str, Any],
+                            high_performing_videos: List[Dict[str, Any]],
+                            video_analyses: List[str],
+                            product_requirements: Dict[str, Any]) -> str:
+        """Return the response cache key for a generation's inputs.
+
+        The inputs are normalized by rendering them into the prompt, so fields
+        the prompt does not use (database IDs, scrape metadata) and whitespace
+        differences do not cause misses. The key also covers the model, output
+        mode, schema and prompt template version.
+        """
+        return make_cache_key(
+            "script_concepts",
+            self._render_prompt(lead_data, high_performing_videos, video_analyses,
+                                product_requirements),
+            self.llm_model,
+            self.output_mode,
+            SCRIPT_CONCEPTS_SCHEMA if self.output_mode == "json_schema" else None,
+            SCRIPT_PROMPT_VERSION
+        )
+
+    def _completion_request(self,
+                            lead_data: Dict[str, Any],
+                            high_performing_videos: List[Dict[str, Any]],
+                            video_analyses: List[str],
+                            product_requirements: Dict[str, Any],
+                            output_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Build the chat-completions request for script generation.
+
+        Args:
+            lead_data: Lead data with performance metrics
+            high_performing_videos: List of high-performing videos
+            video_analyses: List of video screenshot analyses
+            product_requirements: Information about the product/campaign
+            output_mode: "json_schema" or "text" (default: the generator's output_mode)
+
+        Returns:
+            Keyword arguments for chat.completions.create
+        """
+        output_mode = output_mode or self.output_mode
+        request = {
+            "model": self.llm_model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPTS[output_mode].render()},
+                {"role": "user", "content": self._render_prompt(
+                    lead_data, high_performing_videos, video_analyses, product_requirements)}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 2500
+        }
+        if output_mode == "json_schema":
+            request["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "script_concepts", "strict": True,
+                                "schema": SCRIPT_CONCEPTS_SCHEMA}
+            }
+
+        return request
+
+    @staticmethod
+    def _structured_output_rejected(error: Exception, output_mode: str) -> bool:
+        """Return True if a structured-output request was rejected as unsupported.
+
+        Only a 400 whose error code or param names the structured-output
+        parameters counts; any other bad request is a real error.
+        """
+        if output_mode != "json_schema" or getattr(error, "status_code", None) != 400:
+            return False
+        fields = " ".join(str(getattr(error, name, None) or "") for name in ("code", "param"))
+        if not any(param in fields for param in STRUCTURED_OUTPUT_PARAMS):
+            return False
+        print(f"Structured output was rejected, retrying as text: {str(error)}")
+        return True
+
+    def _render_prompt(self,
+                       lead_data: Dict[str, Any],
+                       high_performing_videos: List[Dict[str, Any]],
+                       video_analyses: List[str],
+                       product_requirements: Dict[str, Any]) -> str:
+        """Render the per-request user prompt.
+
+        Args:
+            lead_data: Lead data with performance metrics
+            high_performing_videos: List of high-performing videos
+            video_analyses: List of video screenshot analyses
+            product_requirements: Information about the product/campaign
+
+        Returns:
+            The user prompt
+        """
+        return SCRIPT_USER_PROMPT.render(
+            product_name=product_requirements.get("product_name", ""),
+            product_description=product_requirements.get("product_description", ""),
+            campaign_goals=product_requirements.get("campaign_goals", ""),
+            target_audience=product_requirements.get("target_audience", ""),
+            key_messages=product_requirements.get("key_messages", ""),
+            creator_name=lead_data.get("nickName", ""),
+            bio=lead_data.get("bio", ""),
+            total_followers=lead_data.get("totalFollowers", ""),
+            engagement_rate=lead_data.get("totalEngagementRate", ""),
+            average_views=lead_data.get("averageViews", 0),
+            average_likes=lead_data.get("averageLikes", 0),
+            average_comments=lead_data.get("averageComments", 0),
+            average_shares=lead_data.get("averageShares", 0),
+            tags=", ".join(lead_data.get("tags", [])),
+            videos=self._format_videos(high_performing_videos),
+            analyses=self._format_analyses(video_analyses)
+        )
+
     def _format_videos(self, videos: List[Dict[str, Any]]) -> str:
         """Format video information for the prompt.
 
@@ -135,20 +626,18 @@ class ScriptGenerator(BaseTool):
         Returns:
             Formatted string with video information
         """
-        formatted = ""
-
-        for i, video in enumerate(videos):
-            formatted += f"""
-            ### Video {i+1}
-            - Caption: {video.get("text", "")}
-            - Views: {video.get("playCount", 0)}
-            - Likes: {video.get("diggCount", 0)}
-            - Comments: {video.get("commentCount", 0)}
-            - Shares: {video.get("shareCount", 0)}
-            - URL: {video.get("webVideoUrl", "")}
-            """
-
-        return formatted
+        return VIDEO_TEMPLATE.render_many(
+            {
+                "number": i + 1,
+                "text": video.get("text", ""),
+                "views": video.get("playCount", 0),
+                "likes": video.get("diggCount", 0),
+                "comments": video.get("commentCount", 0),
+                "shares": video.get("shareCount", 0),
+                "url": video.get("webVideoUrl", "")
+            }
+            for i, video in enumerate(videos)
+        )
 
     def _format_analyses(self, analyses: List[str]) -> str:
         """Format video analyses for the prompt.
@@ -159,17 +648,113 @@ class ScriptGenerator(BaseTool):
         Returns:
             Formatted string with analysis information
         """
-        formatted = ""
+        return ANALYSIS_TEMPLATE.render_many(
+            {"number": i + 1, "analysis": analysis} for i, analysis in enumerate(analyses))
+
+    @traced("script.parse")
+    def _parse_response(self, content: str, output_mode: str) -> List[Dict[str, Any]]:
+        """Parse a completion in the given output mode and record parse stats.
 
-        for i, analysis in enumerate(analyses):
-            formatted += f"""
-            ### Screenshot Analysis {i+1}
-            {analysis}
-            
-            """
+        Structured output that fails validation is parsed with the heuristic
+        text parser as a fallback.
 
-        return formatted
+        Args:
+            content: The model's response text
+            output_mode: "json_schema" or "text"
+
+        Returns:
+            List of script concepts
+        """
+        start = time.perf_counter()
+        fallback = False
+        if output_mode == "json_schema":
+            concepts = self._parse_structured_concepts(content)
+            failed = concepts is None
+            if failed:
+                fallback = True
+                concepts = self._parse_script_concepts(content)
+        else:
+            concepts = self._parse_script_concepts(content)
+            # Without concept headings the whole response collapses into one concept
+            failed = (CONCEPT_MARKER not in content or not concepts or
+                      any(self._is_empty_concept(concept) for concept in concepts))
+        elapsed = time.perf_counter() - start
+
+        with _parse_stats_lock:
+            stats = self.parse_stats[output_mode]
+            stats["parses"] += 1
+            stats["failures"] += failed
+            stats["fallbacks"] += fallback
+            stats["parse_seconds"] += elapsed
+
+        current_span().set(output_mode=output_mode, bytes=len((content or "").encode("utf-8")),
+                           failed=failed, fallback=fallback)
+        return concepts
+
+    def parse_report(self) -> Dict[str, Dict[str, float]]:
+        """Return the parse-failure rate and mean parse time for each output mode."""
+        with _parse_stats_lock:
+            stats = {mode: dict(mode_stats) for mode, mode_stats in self.parse_stats.items()}
+
+        return {
+            mode: {
+                "parses": mode_stats["parses"],
+                "failures": mode_stats["failures"],
+                "fallbacks": mode_stats["fallbacks"],
+                "failure_rate": round(mode_stats["failures"] / mode_stats["parses"], 4)
+                if mode_stats["parses"] else 0.0,
+                "mean_parse_ms": round(mode_stats["parse_seconds"] * 1000 / mode_stats["parses"], 4)
+                if mode_stats["parses"] else 0.0
+            }
+            for mode, mode_stats in stats.items()
+        }
+
+    @staticmethod
+    def _is_empty_concept(concept: Dict[str, Any]) -> bool:
+        """Return True if a concept has none of its identifying sections."""
+        return not (concept.get("title") or concept.get("hook") or concept.get("shots"))
+
+    def _parse_structured_concepts(self, content: str) -> Optional[List[Dict[str, Any]]]:
+        """Parse and validate a structured-output response in one pass.
+
+        Args:
+            content: JSON response matching SCRIPT_CONCEPTS_SCHEMA
 
+        Returns:
+            List of script concepts, or None if the response is malformed
+        """
+        try:
+            items = json.loads(content).get("concepts")
+        except (ValueError, AttributeError):
+            return None
+
+        if not isinstance(items, list) or not items:
+            return None
+
+        concepts = []
+        for item in items:
+            if not isinstance(item, dict):
+                return None
+
+            concept = {}
+            for field, kind in CONCEPT_FIELDS.items():
+                value = item.get(field, kind())
+                if kind is list:
+                    if not isinstance(value, list) or not all(isinstance(entry, str) for entry in value):
+                        return None
+                    concept[field] = [entry.strip() for entry in value]
+                else:
+                    if not isinstance(value, str):
+                        return None
+                    concept[field] = value.strip()
+
+            if self._is_empty_concept(concept):
+                return None
+            concepts.append(concept)
+
+        return concepts
+
+    @traced("script.parse_text")
     def _parse_script_concepts(self, script_text: str) -> List[Dict[str, Any]]:
         """Parse script concepts from generated text.
 
@@ -181,66 +766,75 @@ class ScriptGenerator(BaseTool):
         """
         # This is a simple implementation that could be enhanced
         # to better parse structured content from the response
-        concepts = []
 
         # Split by numerical headers (assuming each concept starts with a number)
-        parts = script_text.split("# Concept ")
+        parts = script_text.split(CONCEPT_MARKER)
 
         # Skip the first part if it doesn't contain a concept
-        for part in parts[1:] if len(parts) > 1 else parts:
-            concept = {
-                "title": "",
-                "format": "",
-                "hook": "",
-                "shots": [],
-                "text_overlays": [],
-                "music": "",
-                "caption": ""
-            }
+        return [self._parse_concept(part)
+                for part in (parts[1:] if len(parts) > 1 else parts)]
 
-            # Extract sections
-            lines = part.split("\n")
-            current_section = None
-
-            for line in lines:
-                line = line.strip()
-
-                if not line:
-                    continue
-
-                # Try to identify sections
-                if "title" in line.lower() or "format" in line.lower():
-                    current_section = "title"
-                    concept["title"] = line.split(
-                        ":", 1)[1].strip() if ":" in line else line
-                elif "hook" in line.lower():
-                    current_section = "hook"
-                    concept["hook"] = line.split(
-                        ":", 1)[1].strip() if ":" in line else ""
-                elif "shot" in line.lower() or "breakdown" in line.lower():
-                    current_section = "shots"
-                elif "text" in line.lower() and "overlay" in line.lower():
-                    current_section = "text_overlays"
-                elif "music" in line.lower() or "audio" in line.lower():
-                    current_section = "music"
-                    concept["music"] = line.split(
-                        ":", 1)[1].strip() if ":" in line else line
-                elif "caption" in line.lower():
-                    current_section = "caption"
-                    concept["caption"] = line.split(
-                        ":", 1)[1].strip() if ":" in line else ""
-                elif current_section == "shots" and (":" in line or line.startswith("-")):
-                    concept["shots"].append(line.lstrip("- "))
-                elif current_section == "text_overlays" and (":" in line or line.startswith("-")):
-                    concept["text_overlays"].append(line.lstrip("- "))
-                elif current_section == "hook" and not concept["hook"]:
-                    concept["hook"] = line
-                elif current_section == "caption" and not concept["caption"]:
-                    concept["caption"] = line
+    def _parse_concept(self, part: str) -> Dict[str, Any]:
+        """Parse one concept's text into its structured sections.
 
-            concepts.append(concept)
+        Args:
+            part: Text of a single concept, without its "# Concept " marker
 
-        return concepts
+        Returns:
+            Structured script concept
+        """
+        concept = {
+            "title": "",
+            "format": "",
+            "hook": "",
+            "shots": [],
+            "text_overlays": [],
+            "music": "",
+            "caption": ""
+        }
+
+        # Extract sections
+        lines = part.split("\n")
+        current_section = None
+
+        for line in lines:
+            line = line.strip()
+
+            if not line:
+                continue
+            lowered = line.lower()
+
+            # Try to identify sections
+            if "title" in lowered or "format" in lowered:
+                current_section = "title"
+                concept["title"] = line.split(
+                    ":", 1)[1].strip() if ":" in line else line
+            elif "hook" in lowered:
+                current_section = "hook"
+                concept["hook"] = line.split(
+                    ":", 1)[1].strip() if ":" in line else ""
+            elif "shot" in lowered or "breakdown" in lowered:
+                current_section = "shots"
+            elif "text" in lowered and "overlay" in lowered:
+                current_section = "text_overlays"
+            elif "music" in lowered or "audio" in lowered:
+                current_section = "music"
+                concept["music"] = line.split(
+                    ":", 1)[1].strip() if ":" in line else line
+            elif "caption" in lowered:
+                current_section = "caption"
+                concept["caption"] = line.split(
+                    ":", 1)[1].strip() if ":" in line else ""
+            elif current_section == "shots" and (":" in line or line.startswith("-")):
+                concept["shots"].append(line.lstrip("- "))
+            elif current_section == "text_overlays" and (":" in line or line.startswith("-")):
+                concept["text_overlays"].append(line.lstrip("- "))
+            elif current_section == "hook" and not concept["hook"]:
+                concept["hook"] = line
+            elif current_section == "caption" and not concept["caption"]:
+                concept["caption"] = line
+
+        return concept
 
     def _run(self, input_str: str) -> str:
         """Run the script generator tool.
@@ -265,7 +859,9 @@ class ScriptGenerator(BaseTool):
                 lead_data,
                 high_performing_videos,
                 video_analyses,
-                product_requirements
+                product_requirements,
+                bypass_cache=input_json.get("bypass_cache", False),
+                refresh_cache=input_json.get("refresh_cache", False)
             )
 
             # Return generated scripts
@@ -275,3 +871,36 @@ class ScriptGenerator(BaseTool):
 
         except Exception as e:
             return json.dumps({"error": str(e)})
+
+    async def _arun(self, input_str: str) -> str:
+        """Run the script generator tool on the event loop.
+
+        Args:
+            input_str: JSON string containing input data
+
+        Returns:
+            JSON string containing generated script concepts
+        """
+        try:
+            input_json = json.loads(input_str)
+
+            script_concepts = await self._agenerate_script_concepts(
+                input_json.get("lead_data", {}),
+                input_json.get("high_performing_videos", []),
+                input_json.get("video_analyses", []),
+                input_json.get("product_requirements", {}),
+                bypass_cache=input_json.get("bypass_cache", False),
+                refresh_cache=input_json.get("refresh_cache", False)
+            )
+
+            return json.dumps({
+                "script_concepts": script_concepts
+            })
+
+        except Exception as e:
+            return json.dumps({"error": str(e)})
+
+    def close(self) -> None:
+        """Close the response cache."""
+        if self.cache is not None:
+            self.cache.close()
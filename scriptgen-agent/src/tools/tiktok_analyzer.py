@@ -1,19 +1,118 @@
 import os
 import time
+import asyncio
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from PIL import Image
-import io
-import base64
-import requests
+from urllib.parse import urlparse
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Union
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from langchain.tools import BaseTool
 
+from .cache import SQLiteCache, make_cache_key
+from .chrome_profile import (BLOCKED_URL_PATTERNS, CHROME_PROFILES, block_urls, chrome_arguments,
+                             driver_rss, page_load_strategy)
+from .driver_pool import DriverPool
+from .frame_dedup import dedupe_frames
+from .frame_extractor import DirectCaptureError, DirectFrameExtractor
+from .image_preprocess import preprocess_image, to_data_url
+from .openai_clients import achat_completion, chat_completion
+from .screenshot_sink import ScreenshotSink
+from .tracing import current_span, in_current_context, traced
+
+# Selenium is imported when the first Chrome session is started
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+# Resolves once the video can play (or the timeout fires) and reports its duration
+WAIT_FOR_PLAYABLE_JS = """
+const video = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+let settled = false;
+const finish = (ready) => {
+    if (settled) return;
+    settled = true;
+    clearTimeout(timer);
+    video.pause();
+    done({ready: ready, duration: isFinite(video.duration) ? video.duration : 0});
+};
+const timer = setTimeout(() => finish(false), timeoutMs);
+video.muted = true;
+if (video.readyState >= 3) {
+    finish(true);
+} else {
+    video.addEventListener("canplay", () => finish(true), {once: true});
+    const playing = video.play();
+    if (playing && playing.catch) playing.catch(() => {});
+}
+"""
+
+# Seeks and resolves after the seeked frame has been painted (or the timeout fires)
+SEEK_FRAME_JS = """
+const video = arguments[0];
+const timestamp = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+let settled = false;
+const finish = (ready) => {
+    if (settled) return;
+    settled = true;
+    clearTimeout(timer);
+    video.removeEventListener("seeked", onSeeked);
+    done(ready);
+};
+const onSeeked = () => requestAnimationFrame(() => requestAnimationFrame(() => finish(true)));
+const timer = setTimeout(() => finish(false), timeoutMs);
+video.addEventListener("seeked", onSeeked);
+video.pause();
+video.currentTime = timestamp;
+"""
+
+VISION_SYSTEM_PROMPT = "You are an expert video content analyst specializing in TikTok creator content."
+
+# Prompt for analyzing a single screenshot
+FRAME_ANALYSIS_PROMPT = """
+Analyze this TikTok video screenshot and describe:
+1. What's happening in the video
+2. Visual style elements (colors, lighting, composition)
+3. Text overlays and their positioning
+4. Subject's positioning and body language
+5. Any props or focal objects visible
+Provide specific details that would be helpful for recreating a similar visual style.
+"""
+
+# Prompt for analyzing several screenshots of one video in a single request
+BATCH_ANALYSIS_PROMPT = """
+The {count} images are screenshots of the same TikTok video, in chronological order.
+Analyze each screenshot separately and describe:
+1. What's happening in the video
+2. Visual style elements (colors, lighting, composition)
+3. Text overlays and their positioning
+4. Subject's positioning and body language
+5. Any props or focal objects visible
+Provide specific details that would be helpful for recreating a similar visual style.
+Respond with a JSON object of the form {{"frames": [{{"frame": 1, "analysis": "..."}}]}}
+containing exactly one entry per screenshot, numbered from 1 in the order given.
+"""
+
+# Changes whenever a vision prompt changes, so cached analyses are not reused across prompts
+VISION_PROMPT_VERSION = hashlib.sha256(
+    (VISION_SYSTEM_PROMPT + FRAME_ANALYSIS_PROMPT + BATCH_ANALYSIS_PROMPT).encode("utf-8")
+).hexdigest()[:12]
+
+ANALYSIS_MODES = ("batched", "per_frame")
+CAPTURE_MODES = ("event", "sleep")
+BACKENDS = ("selenium", "direct")
+
+# Result fields describing one run (session, capture timings, vision spend), which
+# are not stored with a cached analysis and so are absent from cache hits
+PER_RUN_FIELDS = ("driver_session", "capture_metadata", "vision_usage", "frame_stats", "cache_hit")
+
+# Fixed waits used by the "sleep" capture mode
+PLAYBACK_START_SLEEP = 2
+FRAME_RENDER_SLEEP = 0.5
+
 
 class TikTokVideoAnalyzer(BaseTool):
     """Tool for analyzing TikTok videos and capturing screenshots."""
@@ -23,165 +122,1079 @@ class TikTokVideoAnalyzer(BaseTool):
     Analyzes TikTok videos by capturing screenshots and extracting visual information.
     Input should be a JSON string containing:
     - video_url: The URL of the TikTok video to analyze
+    - video_urls: Alternatively, a list of video URLs to analyze concurrently
     - num_screenshots: Number of screenshots to capture (default: 5)
+    - capture_mode: "sleep" for fixed waits (default) or "event" to wait on video seek events
+    - backend: "selenium" to capture in a browser or "direct" to download and decode the video
+    - analysis_mode: "per_frame" (default) or "batched" to analyze frames in one vision request
+    - max_workers: Maximum number of videos analyzed at once (default: pool size)
     """
     vision_model: str = "gpt-4o"
     screenshot_dir: Path = None
+    pool_size: int = 2
+    max_session_uses: int = 50
+    driver_pool: Optional[DriverPool] = None
+    capture_mode: str = "sleep"
+    frame_timeout: float = 5.0
+    backend: str = "selenium"
+    frame_extractor: Optional[DirectFrameExtractor] = None
+    analysis_mode: str = "per_frame"
+    vision_batch_size: int = 0
+    vision_concurrency: int = 8
+    cache: Optional[SQLiteCache] = None
+    dedup_max_distance: Optional[int] = 5
+    image_max_edge: int = 768
+    image_format: str = "jpeg"
+    image_quality: int = 80
+    image_detail: str = "auto"
+    screenshot_sink: Optional[ScreenshotSink] = None
+    chrome_profile: str = "full"
+    chrome_js_heap_mb: int = 512
+    blocked_url_patterns: List[str] = []
+    sample_session_rss: bool = False
 
-    def __init__(self, vision_model: str = "gpt-4o"):
+    def __init__(self,
+                 vision_model: str = "gpt-4o",
+                 pool_size: int = 2,
+                 max_session_uses: int = 50,
+                 lease_timeout: float = 120.0,
+                 capture_mode: str = "sleep",
+                 frame_timeout: float = 5.0,
+                 backend: str = "selenium",
+                 analysis_mode: str = "per_frame",
+                 vision_batch_size: int = 0,
+                 vision_concurrency: int = 8,
+                 cache_path: Optional[str] = None,
+                 cache_ttl: Optional[float] = 7 * 24 * 3600,
+                 cache_max_entries: int = 10000,
+                 dedup_max_distance: Optional[int] = 5,
+                 image_max_edge: int = 768,
+                 image_format: str = "jpeg",
+                 image_quality: int = 80,
+                 image_detail: str = "auto",
+                 persist_screenshots: bool = False,
+                 screenshot_max_age: Optional[float] = 24 * 3600,
+                 screenshot_max_files: int = 1000,
+                 chrome_profile: str = "full",
+                 chrome_js_heap_mb: int = 512,
+                 blocked_url_patterns: Optional[List[str]] = None,
+                 sample_session_rss: bool = False):
         """Initialize the TikTok video analyzer tool.
 
         Args:
             vision_model: The vision model to use for analyzing screenshots
+            pool_size: Maximum number of warm Chrome sessions kept by the driver pool
+            max_session_uses: Number of videos a Chrome session captures before it is recycled
+            lease_timeout: Seconds to wait for a free Chrome session
+            capture_mode: "sleep" for fixed waits and full-page shots, or "event" to
+                wait on the video's canplay/seeked events and crop to the video element
+            frame_timeout: Seconds to wait for each frame in "event" capture mode
+            backend: "selenium" to capture frames in headless Chrome, or "direct" to
+                download the video and decode frames with ffmpeg, falling back to Selenium
+            analysis_mode: "per_frame" for one vision request per screenshot, or
+                "batched" to pack frames into one multimodal request
+            vision_batch_size: Frames per batched request (0 sends all frames of a video at once)
+            vision_concurrency: Maximum concurrent vision requests per video on the async path
+            cache_path: SQLite file caching video and frame analyses (default: the
+                VIDEO_CACHE_PATH environment variable; caching is off if neither is set)
+            cache_ttl: Lifetime of cached analyses in seconds (None disables expiry)
+            cache_max_entries: Maximum number of cached analyses before LRU eviction
+            dedup_max_distance: Perceptual-hash distance (out of 64 bits) under which a
+                frame is skipped as a near-duplicate of an earlier one (None disables dedup)
+            image_max_edge: Longest edge in pixels screenshots are downscaled to before
+                upload (0 keeps the captured size)
+            image_format: Upload format for screenshots: "jpeg", "webp" or "png"
+            image_quality: Encoder quality for JPEG/WebP uploads (1-100)
+            image_detail: Vision API detail level: "low", "high" or "auto"
+            persist_screenshots: Also write captured frames to the screenshot directory in
+                the background, under content-hashed names (frames are analyzed in memory)
+            screenshot_max_age: Delete persisted screenshots older than this many seconds
+            screenshot_max_files: Maximum number of persisted screenshots kept
+            chrome_profile: "full" for a stock headless Chrome, or "lean" to block fonts
+                and trackers, trim caches and background work, return from page loads at
+                DOMContentLoaded and cap Chrome's memory
+            chrome_js_heap_mb: V8 heap cap per renderer in the lean profile, in megabytes
+                (0 disables)
+            blocked_url_patterns: URL patterns blocked in the lean profile (default:
+                chrome_profile.BLOCKED_URL_PATTERNS)
+            sample_session_rss: Report each capture's Chrome memory as session_rss_mb;
+                off by default, as it scans every process in /proc per capture
         """
+        if chrome_profile not in CHROME_PROFILES:
+            raise ValueError(f"Unknown Chrome profile: {chrome_profile}")
+
         super().__init__()
         self.vision_model = vision_model
         self.screenshot_dir = Path("data/screenshots")
-        self.screenshot_dir.mkdir(parents=True, exist_ok=True)
+        self.pool_size = pool_size
+        self.max_session_uses = max_session_uses
+        self.capture_mode = capture_mode
+        self.frame_timeout = frame_timeout
+        self.backend = backend
+        self.analysis_mode = analysis_mode
+        self.vision_batch_size = vision_batch_size
+        self.vision_concurrency = vision_concurrency
+        self.dedup_max_distance = dedup_max_distance
+        self.image_max_edge = image_max_edge
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self.image_detail = image_detail
+        self.chrome_profile = chrome_profile
+        self.chrome_js_heap_mb = chrome_js_heap_mb
+        self.blocked_url_patterns = list(
+            BLOCKED_URL_PATTERNS if blocked_url_patterns is None else blocked_url_patterns)
+        self.sample_session_rss = sample_session_rss
+        if persist_screenshots:
+            self.screenshot_sink = ScreenshotSink(
+                self.screenshot_dir,
+                max_age_seconds=screenshot_max_age,
+                max_files=screenshot_max_files
+            )
+        cache_path = cache_path or os.environ.get("VIDEO_CACHE_PATH")
+        if cache_path:
+            self.cache = SQLiteCache(
+                cache_path, ttl_seconds=cache_ttl, max_entries=cache_max_entries)
+        self.frame_extractor = DirectFrameExtractor(Path("data/media"))
+        self.driver_pool = DriverPool(
+            self._setup_driver,
+            max_size=pool_size,
+            max_uses=max_session_uses,
+            lease_timeout=lease_timeout
+        )
+
+    @traced("chrome.setup")
+    def _setup_driver(self) -> "webdriver.Chrome":
+        """Set up and return a Chrome webdriver configured by the analyzer's Chrome profile."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
 
-    def _setup_driver(self) -> webdriver.Chrome:
-        """Set up and return a Chrome webdriver with appropriate options."""
         chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--mute-audio")
-        chrome_options.add_argument(
-            "--window-size=393,852")  # Mobile size for TikTok
-        chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1")
+        for argument in chrome_arguments(self.chrome_profile, self.chrome_js_heap_mb):
+            chrome_options.add_argument(argument)
+        chrome_options.page_load_strategy = page_load_strategy(self.chrome_profile)
 
-        return webdriver.Chrome(options=chrome_options)
+        driver = webdriver.Chrome(options=chrome_options)
+        if self.chrome_profile == "lean" and self.blocked_url_patterns:
+            try:
+                block_urls(driver, self.blocked_url_patterns)
+            except Exception:
+                driver.quit()
+                raise
+
+        current_span().set(chrome_profile=self.chrome_profile)
+        return driver
+
+    @staticmethod
+    def _normalize_video_url(video_url: str) -> str:
+        """Normalize a video URL for cache keys by dropping query, fragment and case noise."""
+        parsed = urlparse(video_url.strip())
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
 
-    def _capture_screenshots(self, driver: webdriver.Chrome, video_url: str, num_screenshots: int = 5) -> List[str]:
-        """Capture screenshots of a TikTok video at different timestamps.
+    def _frame_cache_key(self, image_bytes: bytes) -> str:
+        """Return the cache key of a frame analysis, based on the image content."""
+        return make_cache_key("frame_analysis",
+                              hashlib.sha256(image_bytes).hexdigest(),
+                              self.vision_model,
+                              VISION_PROMPT_VERSION,
+                              self.image_max_edge,
+                              self.image_format,
+                              self.image_quality,
+                              self.image_detail)
+
+    @staticmethod
+    def _compute_timestamps(video_duration: float, num_screenshots: int) -> List[float]:
+        """Return evenly spaced screenshot timestamps, excluding the first and last frame.
+
+        Args:
+            video_duration: Video duration in seconds (15 is assumed if unknown)
+            num_screenshots: Number of screenshots to capture
+
+        Returns:
+            List of timestamps in seconds
+        """
+        if not video_duration or video_duration <= 0:
+            video_duration = 15  # Default to 15 seconds if can't determine
+
+        return [i * video_duration /
+                (num_screenshots + 1) for i in range(1, num_screenshots + 1)]
+
+    @staticmethod
+    def _load_screenshot(screenshot: Union[str, bytes]) -> bytes:
+        """Return the bytes of a screenshot given as a file path or in-memory buffer."""
+        if isinstance(screenshot, bytes):
+            return screenshot
+        with open(screenshot, "rb") as image_file:
+            return image_file.read()
+
+    @staticmethod
+    def _screenshot_ref(screenshot: Union[str, bytes]) -> str:
+        """Return a printable reference for a screenshot: its path or content hash."""
+        if isinstance(screenshot, bytes):
+            return f"sha256:{hashlib.sha256(screenshot).hexdigest()[:16]}"
+        return screenshot
+
+    def _wait_until_playable(self, driver: "webdriver.Chrome", video: Any) -> float:
+        """Start the video and wait for its canplay event.
+
+        Args:
+            driver: The Chrome webdriver
+            video: The video web element
+
+        Returns:
+            The video duration in seconds, or 0 if it could not be determined
+        """
+        state = driver.execute_async_script(
+            WAIT_FOR_PLAYABLE_JS, video, int(self.frame_timeout * 1000))
+        return (state or {}).get("duration") or 0
+
+    def _seek_frame(self, driver: "webdriver.Chrome", video: Any, timestamp: float) -> bool:
+        """Seek the video and wait until the new frame has been painted.
+
+        Args:
+            driver: The Chrome webdriver
+            video: The video web element
+            timestamp: Position to seek to, in seconds
+
+        Returns:
+            True if the frame is ready, False if the per-frame timeout fired
+        """
+        return bool(driver.execute_async_script(
+            SEEK_FRAME_JS, video, timestamp, int(self.frame_timeout * 1000)))
+
+    @traced("video.capture")
+    def _capture_frames(self,
+                        driver: "webdriver.Chrome",
+                        video_url: str,
+                        num_screenshots: int = 5,
+                        capture_mode: Optional[str] = None,
+                        stats: Optional[Dict[str, Any]] = None) -> List[bytes]:
+        """Capture in-memory PNG screenshots of a TikTok video at different timestamps.
 
         Args:
             driver: The Chrome webdriver
             video_url: The URL of the TikTok video
             num_screenshots: Number of screenshots to capture
+            capture_mode: "event" or "sleep" (default: the analyzer's capture_mode)
+            stats: Optional dictionary filled with capture timing metadata
 
         Returns:
-            List of screenshot file paths
+            List of PNG screenshots, empty if the page had no usable video
+
+        Raises:
+            Exception: Any other capture error, which may leave the session broken
         """
+        capture_mode = capture_mode or self.capture_mode
+        if capture_mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown capture mode: {capture_mode}")
+        event_mode = capture_mode == "event"
+        wait_seconds = 0.0
+        frame_timeouts = 0
+        page_load_seconds = None
+
+        from selenium.common.exceptions import (JavascriptException, NoSuchElementException,
+                                                StaleElementReferenceException)
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
+            start = time.monotonic()
             driver.get(video_url)
 
             # Wait for video to load
             WebDriverWait(driver, 20).until(
                 EC.presence_of_element_located((By.TAG_NAME, "video"))
             )
+            page_load_seconds = time.monotonic() - start
 
             # Get video element and video duration
             video = driver.find_element(By.TAG_NAME, "video")
 
-            # Click to start playing
-            video.click()
-            time.sleep(2)  # Wait for video to start
+            if event_mode:
+                driver.set_script_timeout(self.frame_timeout + 5)
+                start = time.monotonic()
+                video_duration = self._wait_until_playable(driver, video)
+                wait_seconds += time.monotonic() - start
+            else:
+                # Click to start playing
+                video.click()
+                time.sleep(PLAYBACK_START_SLEEP)  # Wait for video to start
+                wait_seconds += PLAYBACK_START_SLEEP
 
-            # Get video duration using JavaScript
-            video_duration = driver.execute_script(
-                "return arguments[0].duration", video)
-            if not video_duration or video_duration <= 0:
-                video_duration = 15  # Default to 15 seconds if can't determine
+                # Get video duration using JavaScript
+                video_duration = driver.execute_script(
+                    "return arguments[0].duration", video)
 
             # Calculate screenshot timestamps
-            timestamps = [i * video_duration /
-                          (num_screenshots + 1) for i in range(1, num_screenshots + 1)]
+            timestamps = self._compute_timestamps(video_duration, num_screenshots)
 
-            screenshot_paths = []
-            for i, timestamp in enumerate(timestamps):
-                # Set video time to timestamp
-                driver.execute_script(
-                    f"arguments[0].currentTime = {timestamp}", video)
-                time.sleep(0.5)  # Wait for frame to render
+            frames = []
+            for timestamp in timestamps:
+                if event_mode:
+                    # Seek and wait for the frame, then crop to the video element
+                    start = time.monotonic()
+                    if not self._seek_frame(driver, video, timestamp):
+                        frame_timeouts += 1
+                    wait_seconds += time.monotonic() - start
+                    screenshot = video.screenshot_as_png
+                else:
+                    # Set video time to timestamp
+                    driver.execute_script(
+                        f"arguments[0].currentTime = {timestamp}", video)
+                    time.sleep(FRAME_RENDER_SLEEP)  # Wait for frame to render
+                    wait_seconds += FRAME_RENDER_SLEEP
 
-                # Take screenshot
-                screenshot = driver.get_screenshot_as_png()
-                screenshot_path = self.screenshot_dir / \
-                    f"{Path(video_url).name.split('?')[0]}_{i}.png"
+                    # Take screenshot
+                    screenshot = driver.get_screenshot_as_png()
 
-                # Save screenshot
-                with open(screenshot_path, "wb") as f:
-                    f.write(screenshot)
+                frames.append(screenshot)
 
-                screenshot_paths.append(str(screenshot_path))
-
-            return screenshot_paths
+            current_span().set(frames=len(frames), bytes=sum(len(frame) for frame in frames))
+            return frames
 
         except Exception as e:
             print(f"Error capturing screenshots: {str(e)}")
+            current_span().set(capture_error=str(e))
+            # Errors about the page itself leave a working session; anything else
+            # (a crash, a lost connection, a timeout) may mean a dead or hung browser
+            if not isinstance(e, (JavascriptException, NoSuchElementException,
+                                  StaleElementReferenceException)):
+                raise
+            return []
+
+        finally:
+            session_rss = driver_rss(driver) if self.sample_session_rss else None
+            current_span().set(page_load_seconds=page_load_seconds, session_rss_bytes=session_rss)
+            if stats is not None:
+                # Compare against the fixed sleeps the "sleep" mode always pays
+                fixed_wait = PLAYBACK_START_SLEEP + FRAME_RENDER_SLEEP * num_screenshots
+                stats.update({
+                    "capture_mode": capture_mode,
+                    "chrome_profile": self.chrome_profile,
+                    "page_load_seconds": round(page_load_seconds, 3) if page_load_seconds is not None else None,
+                    "session_rss_mb": round(session_rss / 2 ** 20, 1) if session_rss is not None else None,
+                    "wait_seconds": round(wait_seconds, 3),
+                    "fixed_sleep_seconds": fixed_wait,
+                    "wall_clock_saved_seconds": round(fixed_wait - wait_seconds, 3) if event_mode else 0.0,
+                    "frame_timeouts": frame_timeouts
+                })
+
+    @traced("video.capture_direct")
+    def _capture_direct(self,
+                        video_url: str,
+                        num_screenshots: int = 5,
+                        media_url: Optional[str] = None,
+                        stats: Optional[Dict[str, Any]] = None) -> List[bytes]:
+        """Capture frames by downloading the video and decoding them locally.
+
+        Args:
+            video_url: The URL of the TikTok video
+            num_screenshots: Number of screenshots to capture
+            media_url: Media file URL, skipping page resolution when given
+            stats: Optional dictionary filled with capture metadata
+
+        Returns:
+            List of PNG frames, empty if the direct capture failed
+        """
+        try:
+            frames = self.frame_extractor.capture(
+                video_url,
+                lambda duration: self._compute_timestamps(duration, num_screenshots),
+                media_url=media_url,
+                stats=stats
+            )
+            current_span().set(frames=len(frames), bytes=sum(len(frame) for frame in frames))
+            return frames
+
+        except DirectCaptureError as e:
+            print(f"Error capturing frames directly: {str(e)}")
+            current_span().set(capture_error=str(e))
+            if stats is not None:
+                stats["direct_error"] = str(e)
             return []
 
-    def _analyze_screenshots(self, screenshot_paths: List[str]) -> Dict[str, Any]:
+    def _vision_request(self, prompt: str, images: List[Tuple[bytes, str]],
+                        max_tokens: int, json_output: bool = False) -> Dict[str, Any]:
+        """Build one chat-completions request with a text prompt and images.
+
+        Args:
+            prompt: The text prompt
+            images: Preprocessed image bytes and MIME types, in order
+            max_tokens: Maximum completion tokens
+            json_output: Request a JSON object response
+
+        Returns:
+            Keyword arguments for chat.completions.create
+        """
+        content = [{"type": "text", "text": prompt}]
+        for image_bytes, mime_type in images:
+            content.append({"type": "image_url", "image_url": {
+                "url": to_data_url(image_bytes, mime_type),
+                "detail": self.image_detail}})
+
+        request = {
+            "model": self.vision_model,
+            "messages": [
+                {"role": "system", "content": VISION_SYSTEM_PROMPT},
+                {"role": "user", "content": content}
+            ],
+            "max_tokens": max_tokens
+        }
+        if json_output:
+            request["response_format"] = {"type": "json_object"}
+
+        return request
+
+    @staticmethod
+    def _split_batch_analysis(content: str, count: int) -> Optional[List[str]]:
+        """Split a batched JSON response into per-frame analyses.
+
+        Args:
+            content: The model's JSON response
+            count: Number of frames sent in the request
+
+        Returns:
+            One analysis per frame in order, or None if the response is malformed
+        """
+        try:
+            frames = json.loads(content).get("frames")
+        except (ValueError, AttributeError):
+            return None
+
+        if not isinstance(frames, list) or len(frames) != count:
+            return None
+
+        frames = sorted(frames, key=lambda frame: frame.get("frame", 0)
+                        if isinstance(frame, dict) else 0)
+        return [str(frame.get("analysis", "")) if isinstance(frame, dict) else str(frame)
+                for frame in frames]
+
+    def _prepare_frames(self,
+                        screenshots: List[Union[str, bytes]],
+                        screenshot_refs: List[str]) -> Tuple[List[Optional[str]],
+                                                             List[Dict[str, Any]],
+                                                             List[Tuple[int, str]]]:
+        """Look up cached frame analyses.
+
+        Uncached frames are only hashed here; they are preprocessed right
+        before their own vision request (see _encode_group), so at most one
+        request's worth of encoded images is held at a time.
+
+        Args:
+            screenshots: Screenshot file paths or in-memory encoded screenshots
+            screenshot_refs: Names reported for the screenshots
+
+        Returns:
+            The analyses (None for uncached frames), per-frame stats, and the
+            uncached frames as (index, cache key) tuples
+        """
+        analyses = []
+        frame_stats = []
+        pending = []
+        for index, screenshot in enumerate(screenshots):
+            image_bytes = self._load_screenshot(screenshot)
+            cache_key = self._frame_cache_key(image_bytes)
+            cached = self.cache.get(cache_key) if self.cache else None
+            analyses.append(cached)
+            stats = {"screenshot": screenshot_refs[index], "original_bytes": len(image_bytes),
+                     "sent_bytes": 0, "cached": cached is not None}
+            frame_stats.append(stats)
+
+            if cached is None:
+                pending.append((index, cache_key))
+
+        return analyses, frame_stats, pending
+
+    def _encode_group(self,
+                      group: List[Tuple[int, str]],
+                      screenshots: List[Union[str, bytes]],
+                      frame_stats: List[Dict[str, Any]]) -> List[Tuple[bytes, str]]:
+        """Downscale and re-encode one request's frames, recording bytes and time per frame.
+
+        Each frame's entry in ``screenshots`` is cleared once it is encoded, so
+        the raw capture is released as soon as its request is built.
+
+        Args:
+            group: The request's frames as (index, cache key) tuples
+            screenshots: Screenshot file paths or in-memory encoded screenshots,
+                updated in place
+            frame_stats: Per-frame stats, updated in place
+
+        Returns:
+            Preprocessed image bytes and MIME types, in group order
+        """
+        images = []
+        for index, _ in group:
+            start = time.monotonic()
+            image = preprocess_image(self._load_screenshot(screenshots[index]), self.image_max_edge,
+                                     self.image_format, self.image_quality)
+            screenshots[index] = None
+            frame_stats[index]["sent_bytes"] = len(image[0])
+            frame_stats[index]["preprocess_seconds"] = round(time.monotonic() - start, 4)
+            images.append(image)
+        return images
+
+    def _vision_groups(self,
+                       pending: List[Tuple[int, str]],
+                       analysis_mode: str) -> List[List[Tuple[int, str]]]:
+        """Split uncached frames into the groups sent per vision request."""
+        if analysis_mode == "batched":
+            group_size = self.vision_batch_size or len(pending) or 1
+        else:
+            group_size = 1
+        return [pending[offset:offset + group_size]
+                for offset in range(0, len(pending), group_size)]
+
+    @staticmethod
+    def _group_request(group: List[Tuple[int, str]],
+                       analysis_mode: str) -> Tuple[str, int, bool]:
+        """Return the prompt, max tokens and JSON flag for one group's request."""
+        if analysis_mode == "batched":
+            # Pack the group's frames into one request sharing a single prompt
+            return BATCH_ANALYSIS_PROMPT.format(count=len(group)), 500 * len(group), True
+        return FRAME_ANALYSIS_PROMPT, 500, False
+
+    @staticmethod
+    def _record_response(response: Any,
+                         group: List[Tuple[int, str]],
+                         elapsed: float,
+                         usage: Dict[str, Any],
+                         frame_stats: List[Dict[str, Any]]) -> str:
+        """Add a vision response's token usage and timing to the stats and return its text."""
+        usage["vision_requests"] += 1
+        if getattr(response, "usage", None):
+            usage["prompt_tokens"] += response.usage.prompt_tokens
+            usage["completion_tokens"] += response.usage.completion_tokens
+        for index, _ in group:
+            frame_stats[index]["request_seconds"] = round(elapsed, 3)
+
+        return response.choices[0].message.content
+
+    def _finish_analysis(self,
+                         analyses: List[Optional[str]],
+                         frame_stats: List[Dict[str, Any]],
+                         pending: List[Tuple[int, str]],
+                         new_analyses: List[str],
+                         screenshot_refs: List[str],
+                         analysis_mode: str,
+                         usage: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill the uncached slots, cache the new analyses and build the result."""
+        for (index, cache_key), analysis in zip(pending, new_analyses):
+            analyses[index] = analysis
+            if self.cache:
+                self.cache.set(cache_key, analysis)
+
+        usage["original_bytes"] = sum(stats["original_bytes"] for stats in frame_stats)
+        usage["sent_bytes"] = sum(stats["sent_bytes"] for stats in frame_stats)
+        current_span().set(frames=len(analyses), cached_frames=len(analyses) - len(pending),
+                           bytes=usage["sent_bytes"], prompt_tokens=usage["prompt_tokens"],
+                           completion_tokens=usage["completion_tokens"])
+
+        return {
+            "screenshot_analyses": analyses,
+            "screenshots": screenshot_refs,
+            "analysis_mode": analysis_mode,
+            "vision_usage": usage,
+            "frame_stats": frame_stats,
+            "cached_frames": len(analyses) - len(pending)
+        }
+
+    @traced("vision.analyze")
+    def _analyze_screenshots(self,
+                             screenshots: List[Union[str, bytes]],
+                             analysis_mode: Optional[str] = None,
+                             screenshot_refs: Optional[List[str]] = None) -> Dict[str, Any]:
         """Analyze screenshots using a vision model to extract visual information.
 
         Args:
-            screenshot_paths: List of screenshot file paths
+            screenshots: Screenshot file paths or in-memory encoded screenshots;
+                entries are cleared as their frames are encoded
+            analysis_mode: "batched" to send groups of frames per request or
+                "per_frame" for one request per screenshot (default: the analyzer's mode)
+            screenshot_refs: Names reported for the screenshots (default: the file
+                paths, or content hashes for in-memory screenshots)
 
         Returns:
             Dictionary containing analysis results
         """
-        # This would normally use the OpenAI API to analyze the images
-        # For now, returning a placeholder implementation
+        analysis_mode = analysis_mode or self.analysis_mode
+        usage = {"vision_requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        if screenshot_refs is None:
+            screenshot_refs = [self._screenshot_ref(screenshot) for screenshot in screenshots]
 
         try:
-            from openai import OpenAI
-            client = OpenAI()
-
-            # Convert images to base64
-            image_contents = []
-            for path in screenshot_paths:
-                with open(path, "rb") as image_file:
-                    encoded_image = base64.b64encode(
-                        image_file.read()).decode('utf-8')
-                    image_contents.append(encoded_image)
-
-            # Prepare the prompt for visual analysis
-            prompt = """
-            Analyze this TikTok video screenshot and describe:
-            1. What's happening in the video
-            2. Visual style elements (colors, lighting, composition)
-            3. Text overlays and their positioning
-            4. Subject's positioning and body language
-            5. Any props or focal objects visible
-            Provide specific details that would be helpful for recreating a similar visual style.
-            """
-
-            # Analyze each screenshot
-            analyses = []
-            for encoded_image in image_contents:
-                response = client.chat.completions.create(
-                    model=self.vision_model,
-                    messages=[
-                        {"role": "system", "content": "You are an expert video content analyst specializing in TikTok creator content."},
-                        {"role": "user", "content": [
-                            {"type": "text", "text": prompt},
-                            {"type": "image_url", "image_url": {
-                                "url": f"data:image/png;base64,{encoded_image}"}}
-                        ]}
-                    ],
-                    max_tokens=500
-                )
-                analyses.append(response.choices[0].message.content)
+            # Reuse cached analyses of identical frames
+            analyses, frame_stats, pending = self._prepare_frames(screenshots, screenshot_refs)
+
+            def request(group: List[Tuple[int, str]], mode: str,
+                        images: List[Tuple[bytes, str]]) -> str:
+                prompt, max_tokens, json_output = self._group_request(group, mode)
+                vision_request = self._vision_request(prompt, images, max_tokens, json_output)
+                start = time.monotonic()
+                response = chat_completion(vision_request, stage="vision.request")
+                return self._record_response(
+                    response, group, time.monotonic() - start, usage, frame_stats)
+
+            new_analyses = []
+            for group in self._vision_groups(pending, analysis_mode):
+                # Encode each group right before its request; its images are
+                # dropped once the group is analyzed
+                images = self._encode_group(group, screenshots, frame_stats)
+                if analysis_mode != "batched":
+                    new_analyses.append(request(group, analysis_mode, images))
+                    continue
+
+                group_analyses = self._split_batch_analysis(
+                    request(group, analysis_mode, images), len(group))
+                if group_analyses is None:
+                    # Malformed batch response; analyze this group frame by frame
+                    print("Batched vision response was malformed, retrying per frame")
+                    group_analyses = [request([frame], "per_frame", [image])
+                                      for frame, image in zip(group, images)]
+                new_analyses.extend(group_analyses)
 
+            return self._finish_analysis(analyses, frame_stats, pending, new_analyses,
+                                         screenshot_refs, analysis_mode, usage)
+
+        except Exception as e:
+            print(f"Error analyzing screenshots with vision model: {str(e)}")
             return {
-                "screenshot_analyses": analyses,
-                "screenshots": screenshot_paths
+                "screenshot_analyses": ["Error analyzing screenshots"],
+                "screenshots": screenshot_refs,
+                "analysis_error": str(e)
             }
 
+    @traced("vision.analyze")
+    async def _aanalyze_screenshots(self,
+                                    screenshots: List[Union[str, bytes]],
+                                    analysis_mode: Optional[str] = None,
+                                    screenshot_refs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Analyze screenshots with concurrent vision requests on the event loop.
+
+        All vision requests for the screenshots are fanned out with
+        asyncio.gather, at most ``vision_concurrency`` at a time, over the
+        shared AsyncOpenAI client. Results match _analyze_screenshots.
+
+        Args:
+            screenshots: Screenshot file paths or in-memory encoded screenshots
+            analysis_mode: "batched" or "per_frame" (default: the analyzer's mode)
+            screenshot_refs: Names reported for the screenshots
+
+        Returns:
+            Dictionary containing analysis results
+        """
+        analysis_mode = analysis_mode or self.analysis_mode
+        usage = {"vision_requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        if screenshot_refs is None:
+            screenshot_refs = [self._screenshot_ref(screenshot) for screenshot in screenshots]
+
+        try:
+            # Cache lookups block, so keep them off the loop
+            analyses, frame_stats, pending = await asyncio.to_thread(
+                self._prepare_frames, screenshots, screenshot_refs)
+            semaphore = asyncio.Semaphore(max(1, self.vision_concurrency))
+
+            async def request(group: List[Tuple[int, str]], mode: str,
+                              images: List[Tuple[bytes, str]]) -> str:
+                prompt, max_tokens, json_output = self._group_request(group, mode)
+                vision_request = self._vision_request(prompt, images, max_tokens, json_output)
+                start = time.monotonic()
+                response = await achat_completion(vision_request, stage="vision.request")
+                return self._record_response(
+                    response, group, time.monotonic() - start, usage, frame_stats)
+
+            async def analyze_group(group: List[Tuple[int, str]]) -> List[str]:
+                async with semaphore:
+                    # Encode inside the semaphore so only in-flight groups hold images;
+                    # preprocessing blocks, so it runs off the loop
+                    images = await asyncio.to_thread(
+                        self._encode_group, group, screenshots, frame_stats)
+                    if analysis_mode != "batched":
+                        return [await request(group, analysis_mode, images)]
+                    content = await request(group, analysis_mode, images)
+
+                group_analyses = self._split_batch_analysis(content, len(group))
+                if group_analyses is None:
+                    print("Batched vision response was malformed, retrying per frame")
+
+                    async def retry(frame: Tuple[int, str], image: Tuple[bytes, str]) -> str:
+                        async with semaphore:
+                            return await request([frame], "per_frame", [image])
+
+                    group_analyses = await asyncio.gather(
+                        *(retry(frame, image) for frame, image in zip(group, images)))
+                return list(group_analyses)
+
+            results = await asyncio.gather(
+                *(analyze_group(group) for group in self._vision_groups(pending, analysis_mode)))
+            new_analyses = [analysis for group_analyses in results for analysis in group_analyses]
+
+            return await asyncio.to_thread(
+                self._finish_analysis, analyses, frame_stats, pending, new_analyses,
+                screenshot_refs, analysis_mode, usage)
+
         except Exception as e:
             print(f"Error analyzing screenshots with vision model: {str(e)}")
             return {
                 "screenshot_analyses": ["Error analyzing screenshots"],
-                "screenshots": screenshot_paths
+                "screenshots": screenshot_refs,
+                "analysis_error": str(e)
             }
 
+    def _vision_calls(self, num_frames: int, analysis_mode: str) -> int:
+        """Return the number of vision requests needed for a number of frames."""
+        if analysis_mode == "per_frame" or not num_frames:
+            return num_frames
+        group_size = self.vision_batch_size or num_frames
+        return -(-num_frames // group_size)
+
+    def _dedupe_frames(self,
+                       frames: List[bytes],
+                       analysis_mode: str) -> Tuple[List[int], Dict[str, Any]]:
+        """Find near-duplicate frames to drop before they reach the vision model.
+
+        Args:
+            frames: Encoded frames, in capture order
+            analysis_mode: "batched" or "per_frame", used to count vision calls saved
+
+        Returns:
+            Indices of the distinct frames, and dedup metadata recording which
+            frames were skipped
+        """
+        kept, skipped = dedupe_frames(frames, self.dedup_max_distance)
+
+        return kept, {
+            "frames_captured": len(frames),
+            "frames_analyzed": len(kept),
+            "skipped_frames": skipped,
+            "vision_calls_saved": self._vision_calls(len(frames), analysis_mode) -
+            self._vision_calls(len(kept), analysis_mode)
+        }
+
+    def _video_cache_key(self,
+                         video_url: str,
+                         num_screenshots: int,
+                         backend: str,
+                         capture_mode: Optional[str],
+                         analysis_mode: str) -> str:
+        """Return the cache key of a video analysis for the analyzer's current settings."""
+        return make_cache_key(
+            "video_analysis",
+            self._normalize_video_url(video_url),
+            num_screenshots,
+            backend,
+            capture_mode or self.capture_mode,
+            analysis_mode,
+            self.dedup_max_distance,
+            self.vision_model,
+            VISION_PROMPT_VERSION,
+            self.image_max_edge,
+            self.image_format,
+            self.image_quality,
+            self.image_detail
+        )
+
+    def _capture_video(self,
+                       video_url: str,
+                       num_screenshots: int,
+                       capture_mode: Optional[str],
+                       backend: str,
+                       media_url: Optional[str],
+                       analysis_mode: str) -> Optional[Dict[str, Any]]:
+        """Capture, deduplicate and optionally persist the frames of one video.
+
+        Args:
+            video_url: The URL of the TikTok video
+            num_screenshots: Number of screenshots to capture
+            capture_mode: "event" or "sleep" (default: the analyzer's capture_mode)
+            backend: "selenium" or "direct"
+            media_url: Media file URL for the direct backend, skipping page resolution
+            analysis_mode: "batched" or "per_frame", used for dedup stats
+
+        Returns:
+            Dictionary with the frames, their refs and the capture metadata, or
+            None if no frames could be captured
+        """
+        capture_stats: Dict[str, Any] = {"backend": backend}
+        frames = []
+        lease = None
+
+        if backend == "direct":
+            frames = self._capture_direct(
+                video_url, num_screenshots, media_url, capture_stats)
+            if not frames:
+                capture_stats["backend"] = "selenium"
+                capture_stats["fallback_from"] = "direct"
+
+        if not frames:
+            # Lease a warm webdriver session for the capture only, so the
+            # browser is free for other videos while the vision model runs
+            with self.driver_pool.lease() as lease:
+                try:
+                    frames = self._capture_frames(
+                        lease.driver, video_url, num_screenshots, capture_mode, capture_stats)
+                except Exception:
+                    # Have the pool replace the session now rather than at its next health check
+                    lease.mark_broken()
+                    capture_stats["session_discarded"] = True
+
+        if not frames:
+            return None
+
+        # Skip near-duplicate frames (e.g. talking-head videos) before paying for vision calls
+        dedup_stats = None
+        if self.dedup_max_distance is not None and len(frames) > 1:
+            kept, dedup_stats = self._dedupe_frames(frames, analysis_mode)
+            frames = [frames[i] for i in kept]
+
+        # Frames stay in memory; persisting them is optional and happens off the hot path
+        if self.screenshot_sink is not None:
+            screenshot_refs = [self.screenshot_sink.submit(frame) for frame in frames]
+        else:
+            screenshot_refs = [self._screenshot_ref(frame) for frame in frames]
+
+        return {
+            "frames": frames,
+            "screenshot_refs": screenshot_refs,
+            "capture_metadata": capture_stats,
+            "dedup": dedup_stats,
+            "driver_session": lease.to_dict() if lease is not None else None
+        }
+
+    def _finish_video(self,
+                      cache_key: str,
+                      captured: Dict[str, Any],
+                      analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach capture metadata to a video's analysis and cache it."""
+        if captured["dedup"] is not None:
+            analysis_results["dedup"] = captured["dedup"]
+        if captured["driver_session"] is not None:
+            analysis_results["driver_session"] = captured["driver_session"]
+        analysis_results["capture_metadata"] = captured["capture_metadata"]
+
+        if self.cache and "analysis_error" not in analysis_results:
+            self.cache.set(cache_key, {key: value for key, value in analysis_results.items()
+                                       if key not in PER_RUN_FIELDS})
+        analysis_results["cache_hit"] = False
+
+        return analysis_results
+
+    @staticmethod
+    def _from_cache(cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a cached video analysis as a hit, without another run's per-run fields."""
+        result = {key: value for key, value in cached.items() if key not in PER_RUN_FIELDS}
+        result["cache_hit"] = True
+        return result
+
+    def _check_modes(self,
+                     backend: Optional[str],
+                     analysis_mode: Optional[str]) -> Tuple[str, str]:
+        """Resolve and validate the capture backend and analysis mode."""
+        backend = backend or self.backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown capture backend: {backend}")
+        analysis_mode = analysis_mode or self.analysis_mode
+        if analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode: {analysis_mode}")
+        return backend, analysis_mode
+
+    def _analyze_video(self,
+                       video_url: str,
+                       num_screenshots: int = 5,
+                       capture_mode: Optional[str] = None,
+                       backend: Optional[str] = None,
+                       media_url: Optional[str] = None,
+                       analysis_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Capture and analyze a single video.
+
+        Args:
+            video_url: The URL of the TikTok video
+            num_screenshots: Number of screenshots to capture
+            capture_mode: "event" or "sleep" (default: the analyzer's capture_mode)
+            backend: "selenium" or "direct" (default: the analyzer's backend)
+            media_url: Media file URL for the direct backend, skipping page resolution
+            analysis_mode: "batched" or "per_frame" (default: the analyzer's analysis_mode)
+
+        Returns:
+            Dictionary containing analysis results, or an "error" key on failure
+        """
+        backend, analysis_mode = self._check_modes(backend, analysis_mode)
+
+        cache_key = self._video_cache_key(
+            video_url, num_screenshots, backend, capture_mode, analysis_mode)
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            return self._from_cache(cached)
+
+        captured = self._capture_video(
+            video_url, num_screenshots, capture_mode, backend, media_url, analysis_mode)
+        if captured is None:
+            return {"error": "Failed to capture screenshots"}
+
+        # Analyze screenshots
+        analysis_results = self._analyze_screenshots(
+            captured["frames"], analysis_mode, captured["screenshot_refs"])
+
+        return self._finish_video(cache_key, captured, analysis_results)
+
+    async def _aanalyze_video(self,
+                              video_url: str,
+                              num_screenshots: int = 5,
+                              capture_mode: Optional[str] = None,
+                              backend: Optional[str] = None,
+                              media_url: Optional[str] = None,
+                              analysis_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Capture and analyze a single video without blocking the event loop.
+
+        Capture (Selenium or ffmpeg) runs in a worker thread; the vision
+        requests for its frames run concurrently on the event loop.
+
+        Args:
+            video_url: The URL of the TikTok video
+            num_screenshots: Number of screenshots to capture
+            capture_mode: "event" or "sleep" (default: the analyzer's capture_mode)
+            backend: "selenium" or "direct" (default: the analyzer's backend)
+            media_url: Media file URL for the direct backend, skipping page resolution
+            analysis_mode: "batched" or "per_frame" (default: the analyzer's analysis_mode)
+
+        Returns:
+            Dictionary containing analysis results, or an "error" key on failure
+        """
+        backend, analysis_mode = self._check_modes(backend, analysis_mode)
+
+        cache_key = self._video_cache_key(
+            video_url, num_screenshots, backend, capture_mode, analysis_mode)
+        cached = await asyncio.to_thread(self.cache.get, cache_key) if self.cache else None
+        if cached is not None:
+            return self._from_cache(cached)
+
+        captured = await asyncio.to_thread(
+            self._capture_video,
+            video_url, num_screenshots, capture_mode, backend, media_url, analysis_mode)
+        if captured is None:
+            return {"error": "Failed to capture screenshots"}
+
+        analysis_results = await self._aanalyze_screenshots(
+            captured["frames"], analysis_mode, captured["screenshot_refs"])
+
+        return await asyncio.to_thread(self._finish_video, cache_key, captured, analysis_results)
+
+    def analyze_videos(self,
+                       video_urls: List[str],
+                       num_screenshots: int = 5,
+                       max_workers: Optional[int] = None,
+                       capture_mode: Optional[str] = None,
+                       backend: Optional[str] = None,
+                       analysis_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze several videos concurrently.
+
+        Captures are bounded by the driver pool and analyses by ``max_workers``,
+        so vision calls for one video overlap with captures for the next. A
+        failing video is reported in its own result and does not affect the others.
+
+        Args:
+            video_urls: URLs of the TikTok videos to analyze
+            num_screenshots: Number of screenshots to capture per video
+            max_workers: Maximum number of videos in flight (default: pool size)
+            capture_mode: "event" or "sleep" (default: the analyzer's capture_mode)
+            backend: "selenium" or "direct" (default: the analyzer's backend)
+            analysis_mode: "batched" or "per_frame" (default: the analyzer's analysis_mode)
+
+        Returns:
+            Dictionary with per-URL results in input order, success/failure counts
+            and the analyzer's stats()
+        """
+        max_workers = max(1, min(max_workers or self.pool_size, len(video_urls) or 1))
+
+        def analyze(video_url: str) -> Dict[str, Any]:
+            try:
+                result = self._analyze_video(
+                    video_url,
+                    num_screenshots,
+                    capture_mode=capture_mode,
+                    backend=backend,
+                    analysis_mode=analysis_mode
+                )
+            except Exception as e:
+                result = {"error": str(e)}
+            return {"video_url": video_url, **result}
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers,
+                                thread_name_prefix="tiktok-analyzer") as executor:
+            # Each video runs in the caller's context so its spans nest under the caller's
+            futures = [executor.submit(in_current_context(analyze), video_url)
+                       for video_url in video_urls]
+            results = [future.result() for future in futures]
+
+        return self._summarize(results, max_workers, start)
+
+    async def aanalyze_videos(self,
+                              video_urls: List[str],
+                              num_screenshots: int = 5,
+                              max_workers: Optional[int] = None,
+                              capture_mode: Optional[str] = None,
+                              backend: Optional[str] = None,
+                              analysis_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze several videos concurrently on the event loop.
+
+        Same arguments and result as analyze_videos; at most ``max_workers``
+        videos are in flight at once.
+        """
+        max_workers = max(1, min(max_workers or self.pool_size, len(video_urls) or 1))
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def analyze(video_url: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    result = await self._aanalyze_video(
+                        video_url,
+                        num_screenshots,
+                        capture_mode=capture_mode,
+                        backend=backend,
+                        analysis_mode=analysis_mode
+                    )
+                except Exception as e:
+                    result = {"error": str(e)}
+            return {"video_url": video_url, **result}
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(analyze(video_url) for video_url in video_urls))
+
+        return self._summarize(list(results), max_workers, start)
+
+    def _summarize(self, results: List[Dict[str, Any]], max_workers: int, start: float) -> Dict[str, Any]:
+        """Build the analyze_videos result from per-URL results."""
+        failed = sum(1 for result in results if "error" in result)
+        return {
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "max_workers": max_workers,
+            "elapsed_seconds": round(time.monotonic() - start, 3),
+            "stats": self.stats()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the driver pool's counters and the analysis cache's hit rate.
+
+        Returns:
+            Dictionary with "driver_pool" (leases, waits, and sessions created,
+            recycled or discarded) and "cache" (hits, misses and hit rate over
+            video and frame lookups, or None if caching is off)
+        """
+        return {
+            "driver_pool": self.driver_pool.stats(),
+            "cache": self.cache.stats() if self.cache else None
+        }
+
     def _run(self, input_str: str) -> str:
         """Run the TikTok video analyzer tool.
 
         Args:
-            input_str: JSON string containing video_url and optionally num_screenshots
+            input_str: JSON string containing video_url (or video_urls) and
+                optionally num_screenshots, capture_mode, backend, media_url,
+                analysis_mode and max_workers
 
         Returns:
             JSON string containing analysis results
@@ -190,30 +1203,85 @@ class TikTokVideoAnalyzer(BaseTool):
             # Parse input
             input_json = json.loads(input_str)
             video_url = input_json.get("video_url")
+            video_urls = input_json.get("video_urls")
             num_screenshots = input_json.get("num_screenshots", 5)
+            capture_mode = input_json.get("capture_mode")
+            backend = input_json.get("backend")
+            analysis_mode = input_json.get("analysis_mode")
+
+            if video_urls:
+                return json.dumps(self.analyze_videos(
+                    video_urls,
+                    num_screenshots,
+                    input_json.get("max_workers"),
+                    capture_mode=capture_mode,
+                    backend=backend,
+                    analysis_mode=analysis_mode
+                ))
 
             if not video_url:
                 return json.dumps({"error": "Video URL is required"})
 
-            # Set up webdriver
-            driver = self._setup_driver()
+            return json.dumps(self._analyze_video(
+                video_url,
+                num_screenshots,
+                capture_mode=capture_mode,
+                backend=backend,
+                media_url=input_json.get("media_url"),
+                analysis_mode=analysis_mode
+            ))
 
-            try:
-                # Capture screenshots
-                screenshot_paths = self._capture_screenshots(
-                    driver, video_url, num_screenshots)
+        except Exception as e:
+            return json.dumps({"error": str(e)})
 
-                if not screenshot_paths:
-                    return json.dumps({"error": "Failed to capture screenshots"})
+    async def _arun(self, input_str: str) -> str:
+        """Run the TikTok video analyzer tool on the event loop.
 
-                # Analyze screenshots
-                analysis_results = self._analyze_screenshots(screenshot_paths)
+        Args:
+            input_str: JSON string with the same fields as for _run
 
-                return json.dumps(analysis_results)
+        Returns:
+            JSON string containing analysis results
+        """
+        try:
+            input_json = json.loads(input_str)
+            video_url = input_json.get("video_url")
+            video_urls = input_json.get("video_urls")
+            num_screenshots = input_json.get("num_screenshots", 5)
+            capture_mode = input_json.get("capture_mode")
+            backend = input_json.get("backend")
+            analysis_mode = input_json.get("analysis_mode")
 
-            finally:
-                # Clean up
-                driver.quit()
+            if video_urls:
+                return json.dumps(await self.aanalyze_videos(
+                    video_urls,
+                    num_screenshots,
+                    input_json.get("max_workers"),
+                    capture_mode=capture_mode,
+                    backend=backend,
+                    analysis_mode=analysis_mode
+                ))
+
+            if not video_url:
+                return json.dumps({"error": "Video URL is required"})
+
+            return json.dumps(await self._aanalyze_video(
+                video_url,
+                num_screenshots,
+                capture_mode=capture_mode,
+                backend=backend,
+                media_url=input_json.get("media_url"),
+                analysis_mode=analysis_mode
+            ))
 
         except Exception as e:
             return json.dumps({"error": str(e)})
+
+    def close(self) -> None:
+        """Shut down pooled Chrome sessions, flush persisted screenshots and close the cache."""
+        if self.driver_pool is not None:
+            self.driver_pool.close()
+        if self.screenshot_sink is not None:
+            self.screenshot_sink.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,448 @@
+import os
+import json
+import time
+import uuid
+import atexit
+import inspect
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Upper bounds (seconds) of the exported span duration histograms
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Span attributes summed into counters by the Prometheus sink and the report
+SPAN_COUNTERS = ("bytes", "prompt_tokens", "completion_tokens")
+
+# Minimum seconds between two rewrites of the Prometheus text file
+PROMETHEUS_WRITE_INTERVAL = 5.0
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    "scriptgen_current_span", default=None)
+
+
+class Span:
+    """One timed stage: wall time, byte and token counts, and free-form attributes."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_time",
+                 "duration", "error", "attributes", "_start")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_time = time.time()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self._start = time.perf_counter()
+
+    def set(self, **attributes: Any) -> "Span":
+        """Set attributes on the span."""
+        self.attributes.update(attributes)
+        return self
+
+    def add(self, key: str, amount: float) -> "Span":
+        """Add to a numeric attribute, e.g. bytes or tokens."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+        return self
+
+    def record_usage(self, response: Any) -> "Span":
+        """Add the prompt and completion tokens of a chat-completions response."""
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.add("prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0)
+            self.add("completion_tokens", getattr(usage, "completion_tokens", 0) or 0)
+        return self
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": round(self.start_time, 6),
+            "duration_seconds": round(self.duration or 0.0, 6),
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+
+class JSONLSink:
+    """Appends every finished span to a JSON Lines file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def export(self, span: Dict[str, Any]) -> None:
+        line = json.dumps(span, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusSink:
+    """Aggregates spans into per-stage metrics written in Prometheus text format.
+
+    The file is meant for node_exporter's textfile collector (or any scraper
+    reading a static file): it is rewritten atomically at most every
+    ``write_interval`` seconds and when the sink is closed.
+    """
+
+    def __init__(self, path: str, write_interval: float = PROMETHEUS_WRITE_INTERVAL):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.write_interval = write_interval
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._written = 0.0
+
+    def export(self, span: Dict[str, Any]) -> None:
+        duration = span["duration_seconds"]
+        with self._lock:
+            stage = self._stages.setdefault(span["name"], {
+                "buckets": [0] * len(DURATION_BUCKETS), "count": 0, "sum": 0.0, "errors": 0,
+                **{counter: 0 for counter in SPAN_COUNTERS}})
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    stage["buckets"][index] += 1
+            stage["count"] += 1
+            stage["sum"] += duration
+            stage["errors"] += 1 if span["error"] else 0
+            for counter in SPAN_COUNTERS:
+                stage[counter] += span["attributes"].get(counter) or 0
+
+            if time.monotonic() - self._written >= self.write_interval:
+                self._write()
+
+    def render(self) -> str:
+        """Return the current metrics in Prometheus text exposition format."""
+        lines = [
+            "# HELP scriptgen_stage_duration_seconds Wall time of traced pipeline stages.",
+            "# TYPE scriptgen_stage_duration_seconds histogram"
+        ]
+        for name, stage in sorted(self._stages.items()):
+            for bound, count in zip(DURATION_BUCKETS, stage["buckets"]):
+                lines.append(f'scriptgen_stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'scriptgen_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {stage["count"]}')
+            lines.append(f'scriptgen_stage_duration_seconds_sum{{stage="{name}"}} {stage["sum"]:.6f}')
+            lines.append(f'scriptgen_stage_duration_seconds_count{{stage="{name}"}} {stage["count"]}')
+
+        lines.extend([
+            "# HELP scriptgen_stage_errors_total Traced stages that raised.",
+            "# TYPE scriptgen_stage_errors_total counter"
+        ])
+        lines.extend(f'scriptgen_stage_errors_total{{stage="{name}"}} {stage["errors"]}'
+                     for name, stage in sorted(self._stages.items()))
+
+        lines.extend([
+            "# HELP scriptgen_stage_bytes_total Payload bytes handled by traced stages.",
+            "# TYPE scriptgen_stage_bytes_total counter"
+        ])
+        lines.extend(f'scriptgen_stage_bytes_total{{stage="{name}"}} {stage["bytes"]}'
+                     for name, stage in sorted(self._stages.items()))
+
+        lines.extend([
+            "# HELP scriptgen_stage_tokens_total OpenAI tokens reported by traced stages.",
+            "# TYPE scriptgen_stage_tokens_total counter"
+        ])
+        for name, stage in sorted(self._stages.items()):
+            lines.append(f'scriptgen_stage_tokens_total{{stage="{name}",kind="prompt"}} {stage["prompt_tokens"]}')
+            lines.append(f'scriptgen_stage_tokens_total{{stage="{name}",kind="completion"}} {stage["completion_tokens"]}')
+
+        return "\n".join(lines) + "\n"
+
+    def _write(self) -> None:
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(temp_path, self.path)
+        self._written = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._write()
+
+
+class MemorySink:
+    """Keeps the most recent spans in memory, e.g. for an in-process summary."""
+
+    def __init__(self, max_spans: int = 100000):
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self.spans: List[Dict[str, Any]] = []
+
+    def export(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self.spans.append(span)
+            if len(self.spans) > self.max_spans:
+                del self.spans[:len(self.spans) - self.max_spans]
+
+    def close(self) -> None:
+        pass
+
+
+class Tracer:
+    """Times spans and hands finished ones to its sinks.
+
+    With no sinks, spans are still timed (callers may read them) but nothing
+    is recorded, so instrumented code costs a few clock reads.
+    """
+
+    def __init__(self, sinks: Optional[List[Any]] = None):
+        self.sinks = list(sinks or [])
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def add_sink(self, sink: Any) -> None:
+        with self._lock:
+            self.sinks.append(sink)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time the enclosed block as a span nested under the current one.
+
+        Args:
+            name: Stage name, e.g. "vision.request"
+            **attributes: Initial span attributes
+
+        Yields:
+            The span, for adding bytes, tokens or attributes
+        """
+        current = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.finish()
+            _current_span.reset(token)
+            if self.sinks:
+                self.export(current)
+
+    def start_span(self, name: str, **attributes: Any) -> Span:
+        """Start a span nested under the current one, without making it current.
+
+        For work that outlives the block starting it, such as a streamed
+        response the caller consumes later; finish it with end_span.
+
+        Args:
+            name: Stage name, e.g. "script.stream"
+            **attributes: Initial span attributes
+
+        Returns:
+            The started span
+        """
+        return Span(name, _current_span.get(), attributes)
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """Finish and export a span started with start_span."""
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        span.finish()
+        if self.sinks:
+            self.export(span)
+
+    def export(self, span: Span) -> None:
+        record = span.to_dict()
+        for sink in self.sinks:
+            try:
+                sink.export(record)
+            except Exception as e:
+                print(f"Error exporting span {span.name}: {str(e)}")
+
+    def close(self) -> None:
+        """Flush and close the sinks."""
+        with self._lock:
+            sinks, self.sinks = self.sinks, []
+        for sink in sinks:
+            sink.close()
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def configure_tracing(jsonl_path: Optional[str] = None,
+                      prometheus_path: Optional[str] = None,
+                      memory: bool = False) -> Tracer:
+    """Replace the process-wide tracer with one exporting to the given sinks.
+
+    Args:
+        jsonl_path: File every span is appended to as one JSON line
+        prometheus_path: File rewritten with per-stage metrics in Prometheus text format
+        memory: Also keep spans in a MemorySink
+
+    Returns:
+        The new tracer
+    """
+    global _tracer
+
+    sinks: List[Any] = []
+    if jsonl_path:
+        sinks.append(JSONLSink(jsonl_path))
+    if prometheus_path:
+        sinks.append(PrometheusSink(prometheus_path))
+    if memory:
+        sinks.append(MemorySink())
+
+    with _tracer_lock:
+        previous, _tracer = _tracer, Tracer(sinks)
+    if previous is not None:
+        previous.close()
+    return _tracer
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer.
+
+    On first use it is configured from SCRIPTGEN_TRACE_PATH (JSONL spans) and
+    SCRIPTGEN_METRICS_PATH (Prometheus text); with neither set, tracing is off.
+    """
+    global _tracer
+
+    with _tracer_lock:
+        if _tracer is None:
+            sinks: List[Any] = []
+            if os.getenv("SCRIPTGEN_TRACE_PATH"):
+                sinks.append(JSONLSink(os.environ["SCRIPTGEN_TRACE_PATH"]))
+            if os.getenv("SCRIPTGEN_METRICS_PATH"):
+                sinks.append(PrometheusSink(os.environ["SCRIPTGEN_METRICS_PATH"]))
+            _tracer = Tracer(sinks)
+        return _tracer
+
+
+@atexit.register
+def close_tracing() -> None:
+    """Flush and close the process-wide tracer's sinks."""
+    with _tracer_lock:
+        tracer = _tracer
+    if tracer is not None:
+        tracer.close()
+
+
+def span(name: str, **attributes: Any):
+    """Time a block as a span of the process-wide tracer (see Tracer.span)."""
+    return get_tracer().span(name, **attributes)
+
+
+def start_span(name: str, **attributes: Any) -> Span:
+    """Start a span of the process-wide tracer (see Tracer.start_span)."""
+    return get_tracer().start_span(name, **attributes)
+
+
+def end_span(span: Span, error: Optional[BaseException] = None) -> None:
+    """Finish a span started with start_span (see Tracer.end_span)."""
+    get_tracer().end_span(span, error)
+
+
+def current_span() -> Span:
+    """Return the innermost active span, or a detached one if none is active.
+
+    Attributes set on a detached span are discarded, so instrumented code
+    does not need to check whether it runs inside a span.
+    """
+    return _current_span.get() or Span("detached")
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorate a function or coroutine function so each call is timed as a span."""
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def in_current_context(function: Callable) -> Callable:
+    """Bind a callable to a copy of the caller's context, so spans it opens in
+    a worker thread nest under the caller's current span."""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, function)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the linearly interpolated percentile of values, e.g. 0.95 for p95."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Read spans written by a JSONLSink, skipping malformed lines."""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def summarize(spans: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Summarize spans per stage.
+
+    Args:
+        spans: Span dictionaries as exported by the tracer
+
+    Returns:
+        Mapping of stage name to its count, errors, p50/p95/max/total wall time
+        in milliseconds, and totals and p50/p95 of bytes and tokens
+    """
+    stages: Dict[str, List[Dict[str, Any]]] = {}
+    for record in spans:
+        stages.setdefault(record["name"], []).append(record)
+
+    summary = {}
+    for name, records in sorted(stages.items()):
+        durations = [record["duration_seconds"] * 1000 for record in records]
+        stage = {
+            "count": len(records),
+            "errors": sum(1 for record in records if record.get("error")),
+            "p50_ms": round(percentile(durations, 0.5), 2),
+            "p95_ms": round(percentile(durations, 0.95), 2),
+            "max_ms": round(max(durations), 2),
+            "total_ms": round(sum(durations), 2)
+        }
+        for counter in SPAN_COUNTERS:
+            values = [record.get("attributes", {}).get(counter) for record in records]
+            values = [value for value in values if value is not None]
+            if values:
+                stage[f"{counter}_total"] = sum(values)
+                stage[f"{counter}_p50"] = round(percentile(values, 0.5), 1)
+                stage[f"{counter}_p95"] = round(percentile(values, 0.95), 1)
+        summary[name] = stage
+    return summary
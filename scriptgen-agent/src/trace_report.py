@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+from tools.tracing import load_spans, summarize
+
+# Load environment variables
+load_dotenv()
+
+
+def build_report(spans: List[Dict[str, Any]],
+                 stages: Optional[List[str]] = None,
+                 since: Optional[float] = None) -> Dict[str, Any]:
+    """Summarize traced spans per stage.
+
+    Args:
+        spans: Span dictionaries as written by the JSONL trace sink
+        stages: Stage names or name prefixes to keep (default: all)
+        since: Only keep spans started in the last this many seconds
+
+    Returns:
+        Dictionary with the span and trace counts and the per-stage summary
+    """
+    if stages:
+        spans = [span for span in spans
+                 if any(span["name"] == stage or span["name"].startswith(stage + ".")
+                        for stage in stages)]
+    if since is not None:
+        cutoff = time.time() - since
+        spans = [span for span in spans if span["start_time"] >= cutoff]
+
+    return {
+        "spans": len(spans),
+        "traces": len({span["trace_id"] for span in spans}),
+        "stages": summarize(spans)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Print the p50/p95 latency, bytes and tokens of each traced stage."""
+    parser = argparse.ArgumentParser(
+        description="Summarize per-stage latency, bytes and tokens from a trace file.")
+    parser.add_argument("path", nargs="?", default=os.getenv("SCRIPTGEN_TRACE_PATH"),
+                        help="JSONL trace file (default: SCRIPTGEN_TRACE_PATH)")
+    parser.add_argument("--stage", action="append", dest="stages",
+                        help="Stage name or prefix to report, e.g. vision (repeatable)")
+    parser.add_argument("--since", type=float,
+                        help="Only report spans started in the last this many seconds")
+    args = parser.parse_args(argv)
+
+    if not args.path:
+        parser.error("no trace file given and SCRIPTGEN_TRACE_PATH is not set")
+
+    report = build_report(load_spans(args.path), args.stages, args.since)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
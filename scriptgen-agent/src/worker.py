@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import threading
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+from job_queue import SQLiteJobQueue
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_QUEUE_PATH = "data/queue/jobs.sqlite"
+WORKER_MODES = ("pipeline", "crew")
+
+# Seconds a job's queue lease outlives its timeout; only jobs of a worker that
+# died without settling them stay leased past that
+LEASE_GRACE = 60.0
+
+
+class Worker:
+    """Resident process that runs queued script-generation jobs.
+
+    The tools (analyzer driver pool, MongoDB client, OpenAI client) are built
+    once and stay warm across jobs. Up to ``concurrency`` jobs run at once,
+    each in its own thread with a deadline: a job past its deadline is marked
+    failed, and browser sessions leased for longer than ``session_timeout``
+    are shut down so a hung page cannot hold a thread forever. A timed-out
+    job keeps its slot until its thread exits, so no more than
+    ``concurrency`` jobs ever run. stop() drains: no new jobs are claimed and
+    running jobs finish.
+    """
+
+    def __init__(self,
+                 queue: SQLiteJobQueue,
+                 concurrency: int = 4,
+                 job_timeout: float = 600.0,
+                 session_timeout: Optional[float] = None,
+                 poll_interval: float = 1.0,
+                 mode: str = "pipeline",
+                 product_info: Optional[Dict[str, Any]] = None,
+                 videos_per_lead: int = 3,
+                 num_screenshots: int = 5,
+                 pipeline: Optional[Any] = None):
+        """Initialize the worker.
+
+        Args:
+            queue: Queue to take jobs from and write results to
+            concurrency: Maximum number of jobs running at once
+            job_timeout: Seconds a job may run before it is marked failed
+            session_timeout: Seconds a browser session may stay leased before it is
+                shut down (default: job_timeout)
+            poll_interval: Seconds between queue polls while idle
+            mode: "pipeline" to run ScriptPipeline, or "crew" to kick off the
+                hierarchical crew for each job
+            product_info: Product brief for jobs that do not carry one
+            videos_per_lead: Number of top videos analyzed per lead (pipeline mode)
+            num_screenshots: Number of screenshots captured per video (pipeline mode)
+            pipeline: Ready ScriptPipeline to use (default: one built on the shared tools)
+        """
+        if mode not in WORKER_MODES:
+            raise ValueError(f"Unknown worker mode: {mode}")
+
+        self.queue = queue
+        self.concurrency = concurrency
+        self.job_timeout = job_timeout
+        self.session_timeout = session_timeout or job_timeout
+        self.poll_interval = poll_interval
+        self.mode = mode
+        self.product_info = product_info
+        self.videos_per_lead = videos_per_lead
+        self.num_screenshots = num_screenshots
+        self.pipeline = pipeline
+        self.analyzer: Optional[Any] = getattr(pipeline, "video_analyzer", None)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._active: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._draining = threading.Event()
+        self._aborted = threading.Event()
+        self._stats = {"claimed": 0, "succeeded": 0, "failed": 0, "timed_out": 0,
+                       "requeued": 0, "sessions_killed": 0}
+
+    def _build_analyzer(self) -> Any:
+        """Build the video analyzer with a driver pool sized for the worker and register it."""
+        from tools import TikTokVideoAnalyzer
+        from tools.registry import register_tool
+
+        analyzer = TikTokVideoAnalyzer(pool_size=self.concurrency)
+        # Crew jobs get the same analyzer, so the worker can shut down their stuck sessions too
+        register_tool("tiktok_video_analyzer", analyzer)
+        return analyzer
+
+    def _build_pipeline(self) -> Any:
+        """Build the pipeline on the process-wide tools."""
+        from pipeline import ScriptPipeline
+        from tools.registry import get_tool
+
+        return ScriptPipeline(
+            self.product_info or {},
+            videos_per_lead=self.videos_per_lead,
+            num_screenshots=self.num_screenshots,
+            mongodb_client=get_tool("mongodb_client", "live"),
+            video_analyzer=self.analyzer,
+            script_generator=get_tool("script_generator", "live")
+        )
+
+    def process_job(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate script concepts for one job.
+
+        Args:
+            payload: Job input with lead_id and optionally product_info and query
+
+        Returns:
+            The job result
+
+        Raises:
+            RuntimeError: If the lead is missing or every video analysis or the
+                script generation failed, so the queue retries the job
+        """
+        lead_id = payload.get("lead_id")
+        if not lead_id:
+            raise ValueError("Job has no lead_id")
+        product_info = payload.get("product_info") or self.product_info
+        if not product_info:
+            raise ValueError("Job has no product_info and the worker has no default")
+
+        if self.mode == "crew":
+            from crew import TestCrew
+            from tools.tracing import span
+            # Tools come from the registry, so building a crew per job is cheap and
+            # keeps concurrent kickoffs from sharing agent state
+            with span("crew.kickoff", lead_id=lead_id):
+                output = TestCrew().crew().kickoff(inputs={
+                    "query": payload.get("query") or (
+                        f"Generate video script concepts for creator with lead ID {lead_id} "
+                        f"and product '{product_info.get('name', '')}'"),
+                    "lead_data": {"id": lead_id},
+                    "product_info": product_info
+                })
+            return {"lead_id": lead_id, "output": str(output)}
+
+        from tools.script_generator import product_requirements_from_info
+        result = self.pipeline.run(
+            lead_id, product_requirements=product_requirements_from_info(product_info))
+        # A failed analysis or generation is reported in the result, not raised;
+        # it must still fail the job so the queue retries it
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        return result
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        """Run a claimed job and write its result or error back to the queue."""
+        from tools.tracing import span
+        try:
+            with span("worker.job", job_id=job["id"], attempt=job["attempts"], mode=self.mode):
+                result = self.process_job(job["payload"])
+            # The queue drops the result of an attempt _reap already timed out
+            stored = self.queue.complete(job["id"], job["attempts"], result)
+            outcome = "succeeded" if stored else None
+        except Exception as e:
+            print(f"Error processing job {job['id']}: {str(e)}")
+            status = self.queue.fail(job["id"], job["attempts"], str(e))
+            outcome = {"failed": "failed", "queued": "requeued"}.get(status)
+
+        with self._lock:
+            entry = self._active.pop(job["id"], None)
+            # A job that timed out was already settled and counted by _reap
+            if entry is not None and not entry["timed_out"] and outcome:
+                self._stats[outcome] += 1
+        self._wake.set()
+
+    def _start(self, job: Dict[str, Any]) -> None:
+        thread = threading.Thread(target=self._execute, args=(job,),
+                                  name=f"job-{job['id']}", daemon=True)
+        with self._lock:
+            self._active[job["id"]] = {
+                "job": job,
+                "thread": thread,
+                "deadline": time.monotonic() + self.job_timeout,
+                "timed_out": False
+            }
+            self._stats["claimed"] += 1
+        thread.start()
+
+    def _reap(self) -> None:
+        """Fail jobs past their deadline and shut down stuck browser sessions.
+
+        A timed-out job stays in the active set until its thread exits: Python
+        threads cannot be killed, and the thread may still hold a browser
+        session or be making LLM calls.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = []
+            for entry in self._active.values():
+                if not entry["timed_out"] and now > entry["deadline"]:
+                    entry["timed_out"] = True
+                    expired.append(entry["job"])
+
+        for job in expired:
+            print(f"Job {job['id']} timed out after {self.job_timeout}s")
+            status = self.queue.fail(job["id"], job["attempts"],
+                                     f"Timed out after {self.job_timeout}s")
+            with self._lock:
+                self._stats["timed_out"] += 1
+                if status == "queued":
+                    self._stats["requeued"] += 1
+
+        driver_pool = getattr(self.analyzer, "driver_pool", None)
+        if driver_pool is not None:
+            killed = driver_pool.quit_stuck_sessions(self.session_timeout)
+            if killed:
+                with self._lock:
+                    self._stats["sessions_killed"] += killed
+
+    def stop(self, force: bool = False) -> None:
+        """Stop claiming jobs and let running jobs finish (force: requeue them and return now)."""
+        self._draining.set()
+        if force:
+            self._aborted.set()
+        self._wake.set()
+
+    def install_signal_handlers(self) -> None:
+        """Drain on the first SIGTERM/SIGINT and abort on the second. Main thread only."""
+        def handle(signum: int, frame: Any) -> None:
+            force = self._draining.is_set()
+            print(f"Received signal {signum}, {'aborting' if force else 'draining'}", file=sys.stderr)
+            self.stop(force=force)
+
+        signal.signal(signal.SIGTERM, handle)
+        signal.signal(signal.SIGINT, handle)
+
+    def run(self, max_jobs: Optional[int] = None, exit_when_empty: bool = False) -> Dict[str, Any]:
+        """Process jobs until stopped.
+
+        Args:
+            max_jobs: Stop claiming after this many jobs (None: no limit)
+            exit_when_empty: Return once the queue is empty and all jobs have finished
+
+        Returns:
+            Worker summary with job counts
+        """
+        start = time.monotonic()
+        if self.analyzer is None and self.pipeline is None:
+            from tools.registry import tool_mode
+            if self.mode == "pipeline" or tool_mode() == "live":
+                self.analyzer = self._build_analyzer()
+        if self.mode == "pipeline" and self.pipeline is None:
+            self.pipeline = self._build_pipeline()
+        if self.mode == "crew":
+            from tools.rate_limiter import set_agent_crews
+            # Every running job has its own crew, so they split the agents' quota
+            set_agent_crews(self.concurrency)
+
+        requeued = self.queue.requeue_expired()
+        if requeued:
+            print(f"Requeued {requeued} jobs with expired leases")
+
+        while not self._aborted.is_set():
+            self._reap()
+            with self._lock:
+                # Timed-out jobs still running hold their slots, but are not waited for
+                active = len(self._active)
+                running = sum(1 for entry in self._active.values() if not entry["timed_out"])
+                claimed = self._stats["claimed"]
+
+            if max_jobs is not None and claimed >= max_jobs:
+                self._draining.set()
+            if self._draining.is_set():
+                if not running:
+                    break
+            elif active < self.concurrency:
+                job = self.queue.claim(self.worker_id, self.job_timeout + LEASE_GRACE)
+                if job is not None:
+                    self._start(job)
+                    continue
+                if exit_when_empty and not running:
+                    break
+
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+        if self._aborted.is_set():
+            # The abandoned jobs' daemon threads are left running; their released
+            # attempts can no longer settle the jobs, and the queue ignores them once closed
+            with self._lock:
+                abandoned = [entry["job"] for entry in self._active.values()
+                             if not entry["timed_out"]]
+                self._active.clear()
+            released = sum(self.queue.release(job["id"], job["attempts"]) for job in abandoned)
+            with self._lock:
+                self._stats["requeued"] += released
+
+        with self._lock:
+            summary = dict(self._stats)
+        summary["worker_id"] = self.worker_id
+        summary["elapsed_seconds"] = round(time.monotonic() - start, 2)
+        return summary
+
+    def close(self) -> None:
+        """Release the pipeline's and the shared tools' resources."""
+        if self.pipeline is not None:
+            self.pipeline.close()
+        from tools.registry import close_tools
+        close_tools()
+
+
+def _product_info(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Load a product brief from a JSON file, if given."""
+    if not path:
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> Any:
+    """Run the worker, or enqueue and inspect jobs, from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Resident script-generation worker backed by a SQLite job queue.")
+    parser.add_argument("--queue", default=os.environ.get("SCRIPTGEN_QUEUE_PATH", DEFAULT_QUEUE_PATH),
+                        help="SQLite queue file (default: SCRIPTGEN_QUEUE_PATH or %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Process queued jobs until SIGTERM")
+    serve.add_argument("--concurrency", type=int, default=4)
+    serve.add_argument("--job-timeout", type=float, default=600.0)
+    serve.add_argument("--session-timeout", type=float,
+                       help="Seconds a Chrome session may stay leased (default: job timeout)")
+    serve.add_argument("--poll-interval", type=float, default=1.0)
+    serve.add_argument("--mode", choices=WORKER_MODES, default="pipeline")
+    serve.add_argument("--product-file", help="JSON product brief for jobs without one")
+    serve.add_argument("--videos-per-lead", type=int, default=3)
+    serve.add_argument("--exit-when-empty", action="store_true",
+                       help="Exit once the queue is empty instead of waiting for jobs")
+
+    enqueue = commands.add_parser("enqueue", help="Queue one job per lead")
+    enqueue.add_argument("lead_ids", nargs="+")
+    enqueue.add_argument("--product-file", help="JSON product brief (default: the worker's)")
+    enqueue.add_argument("--max-attempts", type=int, default=1)
+
+    status = commands.add_parser("status", help="Print queue counts, or one job")
+    status.add_argument("job_id", type=int, nargs="?")
+
+    args = parser.parse_args(argv)
+    queue = SQLiteJobQueue(args.queue)
+    try:
+        if args.command == "enqueue":
+            product_info = _product_info(args.product_file)
+            output: Any = [queue.enqueue({"lead_id": lead_id, "product_info": product_info},
+                                         max_attempts=args.max_attempts)
+                           for lead_id in args.lead_ids]
+        elif args.command == "status":
+            output = queue.get(args.job_id) if args.job_id else queue.counts()
+        else:
+            worker = Worker(
+                queue,
+                concurrency=args.concurrency,
+                job_timeout=args.job_timeout,
+                session_timeout=args.session_timeout,
+                poll_interval=args.poll_interval,
+                mode=args.mode,
+                product_info=_product_info(args.product_file),
+                videos_per_lead=args.videos_per_lead
+            )
+            worker.install_signal_handlers()
+            try:
+                output = worker.run(exit_when_empty=args.exit_when_empty)
+            finally:
+                worker.close()
+    finally:
+        queue.close()
+
+    print(json.dumps(output, indent=2, default=str))
+    return output
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
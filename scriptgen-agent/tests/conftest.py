@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# The application modules live in src/ and import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Run the fake OpenAI endpoint and point fresh shared clients and limiters at it."""
+    from benchmarks.fake_openai_server import run_server
+    from tools import openai_clients, rate_limiter
+
+    server = run_server(rpm=0)
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    monkeypatch.setattr(openai_clients, "_client", None)
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(rate_limiter, "_agent_crews", 1)
+    yield server
+    server.shutdown()
+    server.server_close()
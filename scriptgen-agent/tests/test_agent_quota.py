@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.openai_clients import chat_completion, get_openai_client
+from tools.rate_limiter import agent_max_rpm, configure_rate_limit, set_agent_crews
+
+MODEL = "gpt-4o-mini"
+REQUESTS_PER_MINUTE = 40
+CREWS = 4
+
+
+def crew_requests(max_rpm):
+    """Send a crew's whole minute of agent requests, as CrewAI allows under max_rpm."""
+    client = get_openai_client()
+    for _ in range(max_rpm):
+        client.chat.completions.create(model=MODEL, messages=[{"role": "user", "content": "turn"}])
+
+
+def test_concurrent_crews_and_tools_stay_under_the_model_quota(fake_openai):
+    fake_openai.fake.rpm = REQUESTS_PER_MINUTE
+    limiter = configure_rate_limit(MODEL, REQUESTS_PER_MINUTE, 1000000)
+    set_agent_crews(CREWS)
+
+    # Each crew is built the way crew.py builds it, one per job in flight
+    max_rpms = [agent_max_rpm(MODEL) for _ in range(CREWS)]
+    tool_requests = int(limiter.requests.capacity)
+    assert sum(max_rpms) + tool_requests <= REQUESTS_PER_MINUTE
+
+    with ThreadPoolExecutor(CREWS + 1) as executor:
+        crews = [executor.submit(crew_requests, max_rpm) for max_rpm in max_rpms]
+        tools = executor.submit(lambda: [
+            chat_completion({"model": MODEL, "messages": [{"role": "user", "content": "tool"}]})
+            for _ in range(tool_requests)])
+        for future in crews + [tools]:
+            future.result()
+
+    assert fake_openai.fake.stats["rate_limited"] == 0
+    assert fake_openai.fake.stats["completed"] == sum(max_rpms) + tool_requests
+    assert fake_openai.fake.stats["requests"] <= REQUESTS_PER_MINUTE
+
+
+def test_one_crew_gets_the_whole_agent_share(fake_openai):
+    configure_rate_limit(MODEL, REQUESTS_PER_MINUTE, 1000000)
+    assert agent_max_rpm(MODEL) == REQUESTS_PER_MINUTE // 2
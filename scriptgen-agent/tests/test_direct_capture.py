@@ -0,0 +1,104 @@
+import io
+import shutil
+
+import pytest
+from PIL import Image
+
+from benchmarks.fixture_server import generate_sample_video, run_fixture_server
+from tools import TikTokVideoAnalyzer
+from tools.driver_pool import DriverPool
+from tools.frame_extractor import DirectFrameExtractor
+
+VIDEO_PATH = "/@creator/video/123"
+
+
+class FakeDriver:
+    def execute_script(self, script, *args):
+        return 1
+
+    def quit(self):
+        pass
+
+
+def png_frame():
+    buffer = io.BytesIO()
+    Image.new("RGB", (36, 64), (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def serve(media_path):
+    server = run_fixture_server(str(media_path))
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    analyzer = TikTokVideoAnalyzer(backend="direct")
+    analyzer.driver_pool = DriverPool(FakeDriver, max_size=1)
+    yield analyzer
+    analyzer.close()
+
+
+def test_direct_extractor_resolves_and_downloads_the_page_media(tmp_path):
+    media = tmp_path / "sample.mp4"
+    media.write_bytes(b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 4096)
+    server, base_url = serve(media)
+    try:
+        extractor = DirectFrameExtractor(tmp_path / "work")
+        media_url = extractor.resolve_media_url(base_url + VIDEO_PATH)
+        assert media_url == f"{base_url}/media/sample.mp4"
+
+        downloaded = extractor.download(media_url, referer=base_url + VIDEO_PATH)
+        assert downloaded.read_bytes() == media.read_bytes()
+        downloaded.unlink()
+    finally:
+        server.shutdown()
+
+
+def test_failed_direct_capture_falls_back_to_selenium(analyzer, tmp_path, monkeypatch):
+    media = tmp_path / "sample.mp4"
+    media.write_bytes(b"not a decodable video")
+    server, base_url = serve(media)
+    # The media downloads, but decoding fails
+    analyzer.frame_extractor = DirectFrameExtractor(
+        tmp_path / "work", ffmpeg_path=str(tmp_path / "missing-ffmpeg"),
+        ffprobe_path=str(tmp_path / "missing-ffprobe"))
+    selenium_urls = []
+
+    def capture_frames(driver, video_url, num_screenshots, capture_mode, stats):
+        selenium_urls.append(video_url)
+        return [png_frame()]
+
+    monkeypatch.setattr(analyzer, "_capture_frames", capture_frames)
+    try:
+        captured = analyzer._capture_video(
+            base_url + VIDEO_PATH, 1, None, "direct", None, "per_frame")
+    finally:
+        server.shutdown()
+
+    assert selenium_urls == [base_url + VIDEO_PATH]
+    assert len(captured["frames"]) == 1
+    metadata = captured["capture_metadata"]
+    assert metadata["backend"] == "selenium"
+    assert metadata["fallback_from"] == "direct"
+    assert "decode frame" in metadata["direct_error"]
+
+
+@pytest.mark.skipif(not (shutil.which("ffmpeg") and shutil.which("ffprobe")),
+                    reason="ffmpeg and ffprobe are required to decode the sample video")
+def test_direct_capture_decodes_the_sample_video(analyzer, tmp_path, monkeypatch):
+    media = generate_sample_video(str(tmp_path), duration=3.0)
+    assert media is not None
+    server, base_url = serve(media)
+    analyzer.frame_extractor = DirectFrameExtractor(tmp_path / "work")
+    monkeypatch.setattr(analyzer, "_capture_frames", None)
+    try:
+        stats = {}
+        frames = analyzer._capture_direct(base_url + VIDEO_PATH, 3, stats=stats)
+    finally:
+        server.shutdown()
+
+    assert len(frames) == 3
+    assert all(frame.startswith(b"\x89PNG") for frame in frames)
+    assert stats["video_duration"] > 0
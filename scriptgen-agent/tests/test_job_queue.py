@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+
+from job_queue import SQLiteJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite"))
+    yield queue
+    queue.close()
+
+
+def test_released_attempt_cannot_settle_the_reclaimed_job(queue):
+    job_id = queue.enqueue({"lead_id": "a"})
+    first = queue.claim("worker-1", 60)
+    assert queue.release(job_id, first["attempts"])
+
+    second = queue.claim("worker-2", 60)
+    assert second["attempts"] == first["attempts"] + 1
+    assert not queue.complete(job_id, first["attempts"], {"stale": True})
+    assert queue.fail(job_id, first["attempts"], "stale") is None
+
+    assert queue.complete(job_id, second["attempts"], {"ok": True})
+    assert queue.get(job_id)["result"] == {"ok": True}
+
+
+def test_released_attempt_is_not_charged(queue):
+    job_id = queue.enqueue({"lead_id": "a"}, max_attempts=1)
+    queue.release(job_id, queue.claim("worker-1", 60)["attempts"])
+
+    job = queue.claim("worker-1", 60)
+    assert job["charged_attempts"] == 1
+    assert queue.fail(job_id, job["attempts"], "boom") == "failed"
+
+
+def test_settling_after_close_is_a_no_op(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite"))
+    job_id = queue.enqueue({"lead_id": "a"})
+    job = queue.claim("worker-1", 60)
+    queue.close()
+
+    assert not queue.complete(job_id, job["attempts"], {"ok": True})
+    assert queue.fail(job_id, job["attempts"], "boom") is None
+    assert not queue.release(job_id, job["attempts"])
+
+
+def test_old_queue_gets_charged_attempts(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, "
+        "status TEXT NOT NULL DEFAULT 'queued', result TEXT, error TEXT, "
+        "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL DEFAULT 1, "
+        "worker_id TEXT, created_at REAL NOT NULL, started_at REAL, "
+        "finished_at REAL, lease_expires_at REAL)")
+    conn.execute("INSERT INTO jobs (payload, status, attempts, max_attempts, created_at) "
+                 "VALUES ('{}', 'queued', 1, 2, 0)")
+    conn.commit()
+    conn.close()
+
+    queue = SQLiteJobQueue(path)
+    job = queue.claim("worker-1", 60)
+    assert (job["attempts"], job["charged_attempts"]) == (2, 2)
+    assert queue.fail(job["id"], job["attempts"], "boom") == "failed"
+    queue.close()
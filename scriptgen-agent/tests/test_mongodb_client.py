@@ -0,0 +1,61 @@
+import mongomock
+import pytest
+from bson import ObjectId
+
+from tools.mongodb_client import MongoDBClient
+
+
+@pytest.fixture
+def client():
+    return MongoDBClient(client=mongomock.MongoClient(), database_name="scriptgen", top_k=3)
+
+
+@pytest.fixture
+def lead_id(client):
+    db = client.get_database()
+    lead_id = ObjectId()
+    db.leads.insert_one({"_id": lead_id, "nickName": "creator", "averageViews": 500,
+                         "averageLikes": 50, "averageComments": 5, "averageShares": 2})
+    db.videos.insert_many([
+        {"leadId": lead_id, "text": f"video {i}", "playCount": i * 1000, "diggCount": 10 * (10 - i),
+         "commentCount": i, "shareCount": 1, "webVideoUrl": f"https://example.com/{i}", "raw": "x"}
+        for i in range(1, 10)])
+    # Another lead's videos never leak into the results
+    db.videos.insert_one({"leadId": ObjectId(), "playCount": 10 ** 9, "webVideoUrl": "other"})
+    return str(lead_id)
+
+
+def test_fetch_top_videos_returns_most_viewed_with_projection(client, lead_id):
+    videos = client.fetch_top_videos(lead_id)
+
+    assert [video["playCount"] for video in videos] == [9000, 8000, 7000]
+    assert all("raw" not in video and "_id" not in video for video in videos)
+    assert len(client.fetch_top_videos(lead_id, top_k=5)) == 5
+
+
+def test_aggregate_video_stats_ranks_and_averages_in_one_pipeline(client, lead_id):
+    stats = client.aggregate_video_stats(lead_id)
+
+    assert [video["playCount"] for video in stats["high_performing_videos"]] == [9000, 8000, 7000]
+    assert stats["performance_metrics"] == {
+        "avg_views": 5000, "avg_likes": 50, "avg_comments": 5, "avg_shares": 1, "video_count": 9}
+
+    by_likes = client.aggregate_video_stats(lead_id, top_k=1, rank_by="diggCount")
+    assert by_likes["high_performing_videos"][0]["diggCount"] == 90
+
+
+def test_aggregate_video_stats_of_a_lead_without_videos(client):
+    stats = client.aggregate_video_stats(str(ObjectId()))
+
+    assert stats["high_performing_videos"] == []
+    assert stats["performance_metrics"]["video_count"] == 0
+
+
+def test_find_and_aggregate_modes_report_the_same_metrics(client, lead_id):
+    lead = client.fetch_lead(lead_id)
+    aggregate = client.fetch_video_stats(lead, query_mode="aggregate")["performance_metrics"]
+    find = client.fetch_video_stats(lead, query_mode="find")["performance_metrics"]
+
+    assert find.keys() == aggregate.keys()
+    assert find["avg_views"] == 500
+    assert find["video_count"] is None
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+import pytest
+
+from tools import rate_limiter
+from tools.openai_clients import achat_completion, chat_completion
+from tools.rate_limiter import get_rate_limiter
+
+MODEL = "gpt-4o-mini"
+REQUEST = {"model": MODEL, "messages": [{"role": "user", "content": "Write concepts"}]}
+RETRY_AFTER = 0.3
+
+
+def fail_first(fake, statuses):
+    """Make the fake endpoint answer the next requests with the given error statuses."""
+    statuses = list(statuses)
+    admit = fake.admit
+
+    def admit_or_fail():
+        if statuses:
+            status = statuses.pop(0)
+            with fake.lock:
+                fake.stats["requests"] += 1
+                fake.stats["rate_limited" if status == 429 else "server_errors"] += 1
+            return status
+        return admit()
+
+    fake.admit = admit_or_fail
+
+
+@pytest.fixture(autouse=True)
+def short_jitter(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "BASE_DELAY", 0.01)
+
+
+def test_429_waits_for_retry_after_then_succeeds(fake_openai):
+    fake_openai.fake.retry_after = RETRY_AFTER
+    fail_first(fake_openai.fake, [429, 429])
+
+    start = time.monotonic()
+    response = chat_completion(REQUEST)
+    elapsed = time.monotonic() - start
+
+    assert response.choices[0].message.content
+    assert elapsed >= 2 * RETRY_AFTER
+    stats = get_rate_limiter(MODEL).stats()
+    assert (stats["rate_limited"], stats["retries"], stats["failures"]) == (2, 2, 0)
+    assert fake_openai.fake.stats["completed"] == 1
+
+
+def test_429_pauses_every_caller_of_the_model(fake_openai):
+    fake_openai.fake.retry_after = RETRY_AFTER
+    fail_first(fake_openai.fake, [429])
+    limiter = get_rate_limiter(MODEL)
+
+    with ThreadPoolExecutor(1) as executor:
+        first = executor.submit(chat_completion, REQUEST)
+        while not limiter.stats()["rate_limited"]:
+            time.sleep(0.01)
+        # A caller that never saw the 429 still waits out the Retry-After
+        assert limiter.acquire() >= RETRY_AFTER / 2
+        assert first.result().choices
+
+
+def test_async_429_waits_for_retry_after_then_succeeds(fake_openai):
+    fake_openai.fake.retry_after = RETRY_AFTER
+    fail_first(fake_openai.fake, [429])
+
+    start = time.monotonic()
+    response = asyncio.run(achat_completion(REQUEST))
+
+    assert response.choices[0].message.content
+    assert time.monotonic() - start >= RETRY_AFTER
+    assert get_rate_limiter(MODEL).stats()["rate_limited"] == 1
+
+
+def test_server_errors_are_retried_and_client_errors_are_not(fake_openai):
+    fail_first(fake_openai.fake, [503])
+    assert chat_completion(REQUEST).choices
+
+    fail_first(fake_openai.fake, [400])
+    with pytest.raises(openai.BadRequestError):
+        chat_completion(REQUEST)
+
+    stats = get_rate_limiter(MODEL).stats()
+    assert (stats["retries"], stats["failures"]) == (1, 1)
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from tools import tracing
+from tools.openai_clients import achat_completion, chat_completion
+from tools.rate_limiter import get_rate_limiter
+
+MODEL = "gpt-4o-mini"
+REQUEST = {"model": MODEL, "messages": [{"role": "user", "content": "Write concepts"}],
+           "max_tokens": 500, "stream": True}
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def export(self, record):
+        self.records.append(record)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    sink = ListSink()
+    monkeypatch.setattr(tracing, "_tracer", tracing.Tracer([sink]))
+    return sink
+
+
+def assert_reconciled(fake_openai, sink):
+    usage = fake_openai.fake.stats
+    (record,) = [record for record in sink.records if record["name"] == "script.stream"]
+    assert record["attributes"]["prompt_tokens"] == usage["prompt_tokens"]
+    assert record["attributes"]["completion_tokens"] == usage["completion_tokens"]
+    # The estimate reserved before the request is replaced by the reported usage
+    assert get_rate_limiter(MODEL).stats()["tokens"] == usage["prompt_tokens"] + usage["completion_tokens"]
+
+
+def test_stream_keeps_span_open_and_reconciles_usage(fake_openai, sink):
+    stream = chat_completion(REQUEST, stage="script.stream")
+    assert sink.records == []
+
+    text = "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+    assert text
+    assert_reconciled(fake_openai, sink)
+
+
+def test_async_stream_keeps_span_open_and_reconciles_usage(fake_openai, sink):
+    async def consume():
+        stream = await achat_completion(REQUEST, stage="script.stream")
+        assert sink.records == []
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(consume())
+    assert_reconciled(fake_openai, sink)
+
+
+def test_closing_a_stream_early_ends_its_span(fake_openai, sink):
+    stream = chat_completion(REQUEST, stage="script.stream")
+    next(stream)
+    stream.close()
+    stream.close()
+
+    assert [record["name"] for record in sink.records] == ["script.stream"]